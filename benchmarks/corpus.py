@@ -0,0 +1,248 @@
+# Copyright (C) - 2025 - Cosmo Tech
+# This document and all information contained herein is the exclusive property -
+# including all intellectual property rights pertaining thereto - of Cosmo Tech.
+# Any use, reproduction, translation, broadcasting, transmission, distribution,
+# etc., to any person is prohibited unless it has been previously and
+# specifically authorized by written means by Cosmo Tech.
+
+"""
+Synthetic Cosmo Tech API corpus for the benchmarks: Organization, Workspace and Runner documents
+shaped like the ones stored by the API, and a pair of OpenAPI definitions describing them before and
+after a migration.
+
+Usage:
+    python -m benchmarks.corpus --scale 10 --output corpus
+"""
+
+import argparse
+import json
+import pathlib
+import random
+import string
+from typing import Any
+
+INDEXES = ("organization", "workspace", "runner")
+
+# Number of documents of each index per unit of scale
+DOCUMENTS_PER_SCALE = {"organization": 1, "workspace": 5, "runner": 20}
+
+ROLES = ("viewer", "user", "editor", "admin")
+
+
+def make_id(prefix: str, rng: random.Random) -> str:
+    return f"{prefix}-{''.join(rng.choices(string.ascii_lowercase + string.digits, k=10))}"
+
+
+def make_security(rng: random.Random) -> dict[str, Any]:
+    return {
+        "default": rng.choice(("none", "viewer")),
+        "accessControlList": [
+            {"id": f"user{rng.randrange(1000)}@cosmotech.com", "role": rng.choice(ROLES)}
+            for _ in range(rng.randint(1, 8))
+        ],
+    }
+
+
+def make_organization(rng: random.Random) -> dict[str, Any]:
+    return {
+        "id": make_id("o", rng),
+        "name": f"Organization {rng.randrange(10**6)}",
+        "ownerId": make_id("u", rng),
+        "security": make_security(rng),
+    }
+
+
+def make_workspace(rng: random.Random, organization_id: str) -> dict[str, Any]:
+    return {
+        "id": make_id("w", rng),
+        "organizationId": organization_id,
+        "key": f"workspace{rng.randrange(10**6)}",
+        "name": f"Workspace {rng.randrange(10**6)}",
+        "description": " ".join(rng.choices(("supply", "chain", "network", "demand", "plan", "asset"), k=20)),
+        "version": "1.0.0",
+        "tags": rng.sample(("prod", "dev", "europe", "asia", "demo", "pilot"), k=rng.randint(0, 4)),
+        "ownerId": make_id("u", rng),
+        "solution": {
+            "solutionId": make_id("sol", rng),
+            "runTemplateFilter": [f"rt{i}" for i in range(rng.randint(0, 5))],
+            "defaultRunTemplateDataset": {f"rt{i}": make_id("d", rng) for i in range(rng.randint(0, 3))},
+        },
+        "webApp": {"url": "https://example.com", "iframes": {"dashboard": {"reportId": make_id("r", rng)}}},
+        "sendInputToDataWarehouse": rng.random() < 0.5,
+        "security": make_security(rng),
+    }
+
+
+def make_runner(rng: random.Random, organization_id: str, workspace_id: str) -> dict[str, Any]:
+    return {
+        "id": make_id("r", rng),
+        "name": f"Runner {rng.randrange(10**6)}",
+        "organizationId": organization_id,
+        "workspaceId": workspace_id,
+        "solutionId": make_id("sol", rng),
+        "runTemplateId": f"rt{rng.randrange(5)}",
+        "ownerId": make_id("u", rng),
+        "creationDate": rng.randrange(1_600_000_000_000, 1_700_000_000_000),
+        "lastUpdate": rng.randrange(1_700_000_000_000, 1_750_000_000_000),
+        "datasetList": [make_id("d", rng) for _ in range(rng.randint(0, 4))],
+        "parametersValues": [
+            {"parameterId": f"param{i}", "varType": rng.choice(("int", "string", "date")), "value": str(rng.random())}
+            for i in range(rng.randint(2, 30))
+        ],
+        "lastRunId": make_id("run", rng),
+        "state": rng.choice(("Created", "Running", "Successful", "Failed")),
+        "security": make_security(rng),
+    }
+
+
+def generate_corpus(scale: int, seed: int = 0) -> dict[str, list[dict[str, Any]]]:
+    """
+    Generate the documents of each index.
+
+    Args:
+        scale (int): The number of organizations, with 5 workspaces and 20 runners per organization.
+        seed (int): The seed of the generator, the same seed always gives the same corpus.
+
+    Returns:
+        dict[str, list[dict[str, Any]]]: The documents of each index.
+    """
+    rng = random.Random(seed)
+    corpus = {index: [] for index in INDEXES}
+    for _ in range(scale):
+        organization = make_organization(rng)
+        corpus["organization"].append(organization)
+        for _ in range(DOCUMENTS_PER_SCALE["workspace"]):
+            workspace = make_workspace(rng, organization["id"])
+            corpus["workspace"].append(workspace)
+            for _ in range(DOCUMENTS_PER_SCALE["runner"] // DOCUMENTS_PER_SCALE["workspace"]):
+                corpus["runner"].append(make_runner(rng, organization["id"], workspace["id"]))
+    return corpus
+
+
+def write_corpus(path: pathlib.Path, corpus: dict[str, list[dict[str, Any]]]):
+    """Write a corpus in the directory layout of redis-dump, one `<index>/<id>.json` file per document"""
+    for index, documents in corpus.items():
+        (path / index).mkdir(parents=True, exist_ok=True)
+        for document in documents:
+            with open(path / index / f"{document['id']}.json", "w") as file:
+                json.dump(document, file, indent=2)
+
+
+def make_openapi_pair(extra_schemas: int = 0) -> tuple[dict[str, Any], dict[str, Any]]:
+    """
+    Build a source and a target OpenAPI definition of the corpus models.
+
+    The target version removes `sendInputToDataWarehouse` and `webApp.iframes` from Workspace, adds `additionalData`
+    to every model, and changes the type of the Runner dates. `extra_schemas` unrelated schemas are added
+    to both definitions to grow them to the size of a real API definition.
+    """
+
+    def ref(name):
+        return {"$ref": f"#/components/schemas/{name}"}
+
+    def make_schemas(target: bool) -> dict[str, Any]:
+        text = {"type": "string"}
+        date = {"type": "string", "format": "date-time"} if target else {"type": "integer", "format": "int64"}
+        security = {
+            "type": "object",
+            "properties": {
+                "default": text,
+                "accessControlList": {"type": "array", "items": ref("AccessControl")},
+            },
+        }
+        workspace_properties = {
+            "id": text,
+            "organizationId": text,
+            "key": text,
+            "name": text,
+            "description": text,
+            "version": text,
+            "tags": {"type": "array", "items": text},
+            "ownerId": text,
+            "solution": ref("WorkspaceSolution"),
+            "webApp": ref("WorkspaceWebApp"),
+            "security": ref("WorkspaceSecurity"),
+        }
+        if not target:
+            workspace_properties["sendInputToDataWarehouse"] = {"type": "boolean"}
+        web_app = {"type": "object", "properties": {"url": text}}
+        if not target:
+            web_app["properties"]["iframes"] = {"type": "object", "properties": {"dashboard": {"type": "object"}}}
+        schemas = {
+            "AccessControl": {"type": "object", "properties": {"id": text, "role": text}},
+            "OrganizationSecurity": security,
+            "WorkspaceSecurity": security,
+            "RunnerSecurity": security,
+            "Organization": {
+                "type": "object",
+                "properties": {"id": text, "name": text, "ownerId": text, "security": ref("OrganizationSecurity")},
+            },
+            "WorkspaceSolution": {
+                "type": "object",
+                "properties": {
+                    "solutionId": text,
+                    "runTemplateFilter": {"type": "array", "items": text},
+                    "defaultRunTemplateDataset": {"type": "object"},
+                },
+            },
+            "WorkspaceWebApp": web_app,
+            "Workspace": {"type": "object", "properties": workspace_properties},
+            "RunnerParameterValue": {
+                "type": "object",
+                "properties": {"parameterId": text, "varType": text, "value": text},
+            },
+            "Runner": {
+                "type": "object",
+                "properties": {
+                    "id": text,
+                    "name": text,
+                    "organizationId": text,
+                    "workspaceId": text,
+                    "solutionId": text,
+                    "runTemplateId": text,
+                    "ownerId": text,
+                    "creationDate": date,
+                    "lastUpdate": date,
+                    "datasetList": {"type": "array", "items": text},
+                    "parametersValues": {"type": "array", "items": ref("RunnerParameterValue")},
+                    "lastRunId": text,
+                    "state": text,
+                    "security": ref("RunnerSecurity"),
+                },
+            },
+        }
+        if target:
+            for model in ("Organization", "Workspace", "Runner"):
+                schemas[model]["properties"]["additionalData"] = {"type": "object", "default": {}}
+        for i in range(extra_schemas):
+            schemas[f"Extra{i}"] = {
+                "type": "object",
+                "description": f"Unrelated schema {i}",
+                "properties": {"id": text, "security": ref("OrganizationSecurity"), "value": {"type": "number"}},
+            }
+        return schemas
+
+    def make_openapi(version: str, target: bool) -> dict[str, Any]:
+        return {
+            "openapi": "3.0.1",
+            "info": {"title": "Cosmo Tech API", "version": version},
+            "components": {"schemas": make_schemas(target)},
+        }
+
+    return make_openapi("3.1", False), make_openapi("3.2", True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=pathlib.Path, default=pathlib.Path("corpus"))
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.scale, args.seed)
+    write_corpus(args.output, corpus)
+    print(", ".join(f"{len(documents)} {index}" for index, documents in corpus.items()) + f" written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# Copyright (C) - 2025 - Cosmo Tech
+# This document and all information contained herein is the exclusive property -
+# including all intellectual property rights pertaining thereto - of Cosmo Tech.
+# Any use, reproduction, translation, broadcasting, transmission, distribution,
+# etc., to any person is prohibited unless it has been previously and
+# specifically authorized by written means by Cosmo Tech.
+
+"""
+Compare a fused migration chain with running each migration step as its own pass.
+
+Usage:
+    python -m benchmarks.migration_chain --documents 5000 --steps 3
+"""
+
+import argparse
+import json
+import time
+
+from cosmotech.data_update_quest.core.migration.apply_template import apply_template
+from cosmotech.data_update_quest.core.migration.apply_template import compose_templates
+
+
+def make_documents(count: int) -> list[str]:
+    return [
+        json.dumps(
+            {
+                "id": f"w-{i}",
+                "key": f"workspace-{i}",
+                "name": f"Workspace {i}",
+                "organizationId": "o-1",
+                "solution": {"solutionId": "sol-1", "runTemplateFilter": ["rt-1", "rt-2"]},
+                "security": {
+                    "default": "none",
+                    "accessControlList": [{"id": f"user-{j}", "role": "viewer"} for j in range(5)],
+                },
+                "legacy_0": True,
+            },
+            indent=2,
+        )
+        for i in range(count)
+    ]
+
+
+def make_steps(count: int) -> list[str]:
+    return [
+        f'# Migration step {step}\ndel(.legacy_{step})\n| .legacy_{step + 1} = true\n| .version = "3.{step + 1}"'
+        for step in range(count)
+    ]
+
+
+def run_sequential(steps: list[str], documents: list[str]) -> list[str]:
+    for step in steps:
+        documents = [apply_template(step, document) for document in documents]
+    return documents
+
+
+def run_chained(steps: list[str], documents: list[str]) -> list[str]:
+    chain = compose_templates(steps)
+    return [apply_template(chain, document) for document in documents]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=5000)
+    parser.add_argument("--steps", type=int, default=3)
+    args = parser.parse_args()
+
+    documents = make_documents(args.documents)
+    steps = make_steps(args.steps)
+
+    start = time.perf_counter()
+    sequential = run_sequential(steps, documents)
+    sequential_duration = time.perf_counter() - start
+
+    start = time.perf_counter()
+    chained = run_chained(steps, documents)
+    chained_duration = time.perf_counter() - start
+
+    assert sequential == chained, "The chained migration does not give the same result as the sequential one"
+
+    print(f"{args.documents} documents, {args.steps} steps")
+    print(f"sequential : {sequential_duration:.3f}s ({args.documents / sequential_duration:.0f} documents/s)")
+    print(f"chained    : {chained_duration:.3f}s ({args.documents / chained_duration:.0f} documents/s)")
+    print(f"speedup    : {sequential_duration / chained_duration:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# Copyright (C) - 2025 - Cosmo Tech
+# This document and all information contained herein is the exclusive property -
+# including all intellectual property rights pertaining thereto - of Cosmo Tech.
+# Any use, reproduction, translation, broadcasting, transmission, distribution,
+# etc., to any person is prohibited unless it has been previously and
+# specifically authorized by written means by Cosmo Tech.
+
+"""
+In-process stand-in for a Redis Stack server, implementing the RedisJSON and RediSearch commands used by
+csm-duq: FT._LIST, FT.SEARCH with LIMIT and NOCONTENT, FT.INFO, JSON.MGET and pipelined JSON.SET.
+StandInAsyncRedis exposes the same store to the asyncio engine.
+
+Documents are stored serialized and every call goes through a JSON encoding and decoding, as it would over
+the wire, so the measured times include the serialization work of a real server round trip but no network.
+"""
+
+import json
+import threading
+from bisect import bisect_left
+from types import SimpleNamespace
+from typing import Any
+
+
+class StandInPipeline:
+    def __init__(self, server: "StandInRedis"):
+        self.server = server
+        self.commands = []
+
+    def set(self, key: str, path: str, data: Any):
+        self.commands.append((key, json.dumps(data)))
+
+    def execute_command(self, command: str, key: str, path: str, content):
+        self.commands.append((key, bytes(content).decode() if not isinstance(content, str) else content))
+
+    def execute(self, raise_on_error: bool = True) -> list:
+        with self.server.lock:
+            for key, content in self.commands:
+                self.server.set_document(key, content)
+        results = [True] * len(self.commands)
+        self.commands = []
+        return results
+
+
+class StandInJSON:
+    def __init__(self, server: "StandInRedis"):
+        self.server = server
+
+    def mget(self, keys: list[str], path: str) -> list:
+        with self.server.lock:
+            contents = [self.server.documents.get(key) for key in keys]
+        return [json.loads(content) if content is not None else None for content in contents]
+
+    def set(self, key: str, path: str, data: Any):
+        with self.server.lock:
+            self.server.set_document(key, json.dumps(data))
+
+    def pipeline(self, transaction: bool = True) -> StandInPipeline:
+        return StandInPipeline(self.server)
+
+
+class StandInSearch:
+    """RediSearch index over the documents whose key starts with `<index>:`"""
+
+    def __init__(self, server: "StandInRedis", index: str):
+        self.server = server
+        self.prefix = index + ":"
+
+    def _keys(self) -> list[str]:
+        keys = self.server.sorted_keys
+        start = bisect_left(keys, self.prefix)
+        end = bisect_left(keys, self.prefix[:-1] + chr(ord(":") + 1))
+        return keys[start:end]
+
+    def search(self, query) -> SimpleNamespace:
+        with self.server.lock:
+            keys = self._keys()
+            page = keys[query._offset : query._offset + query._num]
+            if query._no_content:
+                docs = [SimpleNamespace(id=key) for key in page]
+            else:
+                # FT.SEARCH on a JSON index returns the document re-encoded as a JSON string
+                docs = [SimpleNamespace(id=key, json=self.server.documents[key]) for key in page]
+                fields = query._return_fields
+                if "$.id" in fields:
+                    # The server extracts the returned fields from its own representation of the documents
+                    for doc in docs:
+                        setattr(doc, fields[fields.index("$.id") + 2], json.loads(doc.json)["id"])
+        return SimpleNamespace(docs=docs, total=len(keys))
+
+    def info(self) -> dict[str, Any]:
+        with self.server.lock:
+            return {"index_name": self.prefix[:-1], "num_docs": str(len(self._keys()))}
+
+
+class StandInRedis:
+    """Redis client bound to an in-process store, usable from several threads like a real client"""
+
+    def __init__(self):
+        self.documents: dict[str, str] = {}
+        self._sorted_keys = None
+        self.lock = threading.RLock()
+
+    @property
+    def sorted_keys(self) -> list[str]:
+        if self._sorted_keys is None:
+            self._sorted_keys = sorted(self.documents)
+        return self._sorted_keys
+
+    def set_document(self, key: str, content: str):
+        if key not in self.documents:
+            self._sorted_keys = None
+        self.documents[key] = content
+
+    def add_documents(self, index: str, documents: list[dict[str, Any]]):
+        with self.lock:
+            for document in documents:
+                self.set_document(f"{index}:{document['id']}", json.dumps(document))
+
+    def flushall(self):
+        with self.lock:
+            self.documents.clear()
+            self._sorted_keys = None
+
+    def execute_command(self, *args):
+        if args[0].upper() == "FT._LIST":
+            with self.lock:
+                return sorted({key.split(":", 1)[0] for key in self.documents})
+        raise NotImplementedError(f"The Redis stand-in does not implement {args[0]}")
+
+    def ft(self, index: str) -> StandInSearch:
+        return StandInSearch(self, index)
+
+    def json(self) -> StandInJSON:
+        return StandInJSON(self)
+
+
+class StandInAsyncPipeline(StandInPipeline):
+    async def execute(self, raise_on_error: bool = True) -> list:
+        return super().execute(raise_on_error)
+
+
+class StandInAsyncSearch(StandInSearch):
+    async def search(self, query) -> SimpleNamespace:
+        return super().search(query)
+
+
+class StandInAsyncRedis:
+    """Asyncio client of the store of a StandInRedis"""
+
+    def __init__(self, server: StandInRedis):
+        self.server = server
+
+    async def execute_command(self, *args):
+        return self.server.execute_command(*args)
+
+    def ft(self, index: str) -> StandInAsyncSearch:
+        return StandInAsyncSearch(self.server, index)
+
+    def pipeline(self, transaction: bool = True) -> StandInAsyncPipeline:
+        return StandInAsyncPipeline(self.server)
+
+    async def close(self, close_connection_pool: bool = None):
+        pass
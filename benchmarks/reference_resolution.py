@@ -0,0 +1,95 @@
+# Copyright (C) - 2025 - Cosmo Tech
+# This document and all information contained herein is the exclusive property -
+# including all intellectual property rights pertaining thereto - of Cosmo Tech.
+# Any use, reproduction, translation, broadcasting, transmission, distribution,
+# etc., to any person is prohibited unless it has been previously and
+# specifically authorized by written means by Cosmo Tech.
+
+"""
+Compare memoized reference resolution with resolving every reference where it appears,
+on a large synthetic OpenAPI document where sub-schemas are shared by many schemas.
+
+Usage:
+    python -m benchmarks.reference_resolution --models 50 --layers 5 --width 20 --fan-out 3
+"""
+
+import argparse
+import random
+import time
+
+from cosmotech.data_update_quest.core.migration.template_generator import MigrationTemplateGenerator
+from cosmotech.data_update_quest.core.migration.template_generator import ReferenceResolver
+
+
+class UncachedResolver(ReferenceResolver):
+    """Resolve every reference where it appears, as a baseline"""
+
+    def resolve_ref(self, ref, resolved_refs):
+        self.misses += 1
+        ref_schema = MigrationTemplateGenerator._extract_ref_schema(ref, self.openapi)
+        return MigrationTemplateGenerator._resolve_references(ref_schema, self.openapi, resolved_refs | {ref}, self)
+
+
+def make_openapi(models: int, layers: int, width: int, fan_out: int, seed: int = 0) -> dict:
+    """
+    Build a spec of `layers` layers of `width` schemas, each referencing `fan_out` schemas of the layer below,
+    and `models` models referencing schemas of the top layer. One schema per layer references itself.
+    """
+    rng = random.Random(seed)
+    schemas = {}
+    for layer in range(layers):
+        for i in range(width):
+            properties = {f"field{j}": {"type": "string", "description": f"Field {j}"} for j in range(5)}
+            if layer:
+                for j, child in enumerate(rng.sample(range(width), fan_out)):
+                    properties[f"child{j}"] = {"$ref": f"#/components/schemas/Layer{layer - 1}Schema{child}"}
+            if i == 0:
+                properties["parent"] = {"$ref": f"#/components/schemas/Layer{layer}Schema0"}
+            schemas[f"Layer{layer}Schema{i}"] = {"type": "object", "properties": properties}
+    for i in range(models):
+        properties = {
+            f"part{j}": {"$ref": f"#/components/schemas/Layer{layers - 1}Schema{child}"}
+            for j, child in enumerate(rng.sample(range(width), fan_out))
+        }
+        schemas[f"Model{i}"] = {
+            "allOf": [{"$ref": "#/components/schemas/Layer0Schema1"}],
+            "type": "object",
+            "properties": properties,
+        }
+    return {"openapi": "3.0.0", "components": {"schemas": schemas}}
+
+
+def resolve_models(openapi: dict, models: int, resolver: ReferenceResolver) -> list:
+    return [MigrationTemplateGenerator._extract_schema(openapi, f"Model{i}", resolver) for i in range(models)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--models", type=int, default=50)
+    parser.add_argument("--layers", type=int, default=5)
+    parser.add_argument("--width", type=int, default=20)
+    parser.add_argument("--fan-out", type=int, default=3)
+    args = parser.parse_args()
+
+    openapi = make_openapi(args.models, args.layers, args.width, args.fan_out)
+
+    uncached_resolver = UncachedResolver(openapi)
+    start = time.perf_counter()
+    uncached = resolve_models(openapi, args.models, uncached_resolver)
+    uncached_duration = time.perf_counter() - start
+
+    resolver = ReferenceResolver(openapi)
+    start = time.perf_counter()
+    memoized = resolve_models(openapi, args.models, resolver)
+    memoized_duration = time.perf_counter() - start
+
+    assert uncached == memoized, "The memoized resolution does not give the same schemas as the uncached one"
+
+    print(f"{len(openapi['components']['schemas'])} schemas, {args.models} models resolved")
+    print(f"uncached : {uncached_duration:.3f}s ({uncached_resolver.misses} references resolved)")
+    print(f"memoized : {memoized_duration:.3f}s ({resolver.misses} references resolved, {resolver.hits} reused)")
+    print(f"speedup  : {uncached_duration / memoized_duration:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
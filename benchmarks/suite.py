@@ -0,0 +1,303 @@
+# Copyright (C) - 2025 - Cosmo Tech
+# This document and all information contained herein is the exclusive property -
+# including all intellectual property rights pertaining thereto - of Cosmo Tech.
+# Any use, reproduction, translation, broadcasting, transmission, distribution,
+# etc., to any person is prohibited unless it has been previously and
+# specifically authorized by written means by Cosmo Tech.
+
+"""
+Time the hot paths of csm-duq end to end on a synthetic corpus: apply_template, redis_dump, file_upload
+and MigrationTemplateGenerator. Redis commands are served by an in-process stand-in unless --redis-url
+points to a Redis Stack server, whose csm-duq indexes are then overwritten.
+
+Results are written as JSON so runs can be compared with --compare.
+
+Usage:
+    python -m benchmarks.suite --scale 10 --output results.json
+    python -m benchmarks.suite --scale 10 --output after.json --compare results.json
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import pathlib
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from datetime import timezone
+from typing import Any
+from typing import Callable
+from unittest import mock
+from urllib.parse import urlparse
+
+from benchmarks.corpus import generate_corpus
+from benchmarks.corpus import make_openapi_pair
+from benchmarks.corpus import write_corpus
+from benchmarks.redis_stand_in import StandInAsyncRedis
+from benchmarks.redis_stand_in import StandInRedis
+from cosmotech.data_update_quest.core.database.redis import async_client
+from cosmotech.data_update_quest.core.database.redis import client
+from cosmotech.data_update_quest.core.database.redis import verify
+from cosmotech.data_update_quest.core.database.redis.client import get_index_key
+from cosmotech.data_update_quest.core.migration.apply_template import apply_template
+from cosmotech.data_update_quest.core.migration.template_generator import MigrationTemplateGenerator
+from cosmotech.data_update_quest_cli.utils.logger import LOGGER
+
+MODELS = {"organization": "Organization", "workspace": "Workspace", "runner": "Runner"}
+
+
+class RedisTarget:
+    """The Redis server of the benchmarks, either the in-process stand-in or a Redis Stack server"""
+
+    def __init__(self, redis_url: str = None):
+        if redis_url is None:
+            self.client = StandInRedis()
+            self.connection = {"host": "stand-in", "port": 0, "password": None}
+        else:
+            url = urlparse(redis_url)
+            self.connection = {"host": url.hostname, "port": url.port or 6379, "password": url.password}
+            self.client = client.get_redis_client(**self.connection)
+
+    def patch(self):
+        """Route the redis connections of the client module to the stand-in, no-op for a real server"""
+        if isinstance(self.client, StandInRedis):
+            stack = contextlib.ExitStack()
+            stack.enter_context(mock.patch.object(client, "get_redis_client", lambda *args, **kwargs: self.client))
+            stack.enter_context(mock.patch.object(verify, "get_redis_client", lambda *args, **kwargs: self.client))
+            stack.enter_context(
+                mock.patch.object(
+                    async_client, "get_async_redis_client", lambda *args, **kwargs: StandInAsyncRedis(self.client)
+                )
+            )
+            return stack
+        return contextlib.nullcontext()
+
+    def reset(self):
+        """Remove the documents of the corpus indexes, creating the indexes on a real server"""
+        if isinstance(self.client, StandInRedis):
+            self.client.flushall()
+            return
+        for index_name in MODELS:
+            index = get_index_key(index_name)
+            keys = client.list_index_keys(self.client, index) if index in self.indexes() else []
+            if keys:
+                self.client.delete(*keys)
+            if index not in self.indexes():
+                self.client.execute_command(
+                    "FT.CREATE", index, "ON", "JSON", "PREFIX", "1", f"{index}:", "SCHEMA", "$.id", "AS", "id", "TEXT"
+                )
+
+    def indexes(self) -> list[str]:
+        return self.client.execute_command("FT._LIST")
+
+    def load(self, corpus: dict[str, list[dict[str, Any]]]):
+        self.reset()
+        for index_name, documents in corpus.items():
+            client.upload_batch(
+                self.client, {f"{get_index_key(index_name)}:{document['id']}": document for document in documents}
+            )
+
+
+def measure(function: Callable[[], Any], repeats: int, setup: Callable[[], Any] = None) -> list[float]:
+    """Run a function `repeats` times, calling `setup` untimed before each run, and return the durations"""
+    durations = []
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def summarize(durations: list[float], documents: int) -> dict[str, Any]:
+    best = min(durations)
+    return {
+        "documents": documents,
+        "best": best,
+        "median": statistics.median(durations),
+        "runs": durations,
+        "rate": documents / best if best else None,
+    }
+
+
+def make_templates(extra_schemas: int = 0) -> dict[str, str]:
+    source, target = make_openapi_pair(extra_schemas)
+    return {
+        index_name: MigrationTemplateGenerator(source, target, model, model).generate_jq_script()
+        for index_name, model in MODELS.items()
+    }
+
+
+def bench_apply_template(corpus: dict[str, list[dict[str, Any]]], repeats: int) -> dict[str, Any]:
+    templates = make_templates()
+    documents = [(templates[index_name], json.dumps(document)) for index_name, document in iter_documents(corpus)]
+
+    def run():
+        for template, data in documents:
+            apply_template(template, data)
+
+    return summarize(measure(run, repeats), len(documents))
+
+
+def bench_template_generator(extra_schemas: int, repeats: int) -> dict[str, Any]:
+    source, target = make_openapi_pair(extra_schemas)
+
+    def run():
+        for model in MODELS.values():
+            generator = MigrationTemplateGenerator(source, target, model, model)
+            generator.generate_jq_script()
+            generator._generate_readme()
+            generator.generate_json_plan()
+
+    return summarize(measure(run, repeats), len(MODELS))
+
+
+def bench_redis_dump(target: RedisTarget, corpus, work_dir: pathlib.Path, args) -> dict[str, Any]:
+    target.load(corpus)
+    runs = iter(range(args.repeats))
+
+    def run():
+        client.redis_dump(
+            work_dir / f"dump-{next(runs)}",
+            index_list=None,
+            page_size=args.page_size,
+            workers=args.workers,
+            engine=args.engine,
+            **target.connection,
+        )
+
+    return summarize(measure(run, args.repeats), count_documents(corpus))
+
+
+def bench_file_upload(target: RedisTarget, corpus, work_dir: pathlib.Path, args) -> dict[str, Any]:
+    dump_dir = work_dir / "upload"
+    write_corpus(dump_dir, corpus)
+
+    def run():
+        failed = client.file_upload(
+            dump_dir,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            engine=args.engine,
+            validate=args.validate,
+            **target.connection,
+        )
+        assert not failed, f"{len(failed)} documents could not be uploaded"
+
+    return summarize(measure(run, args.repeats, setup=target.reset), count_documents(corpus))
+
+
+def bench_redis_verify(target: RedisTarget, corpus, work_dir: pathlib.Path, args) -> dict[str, Any]:
+    dump_dir = work_dir / "verify"
+    write_corpus(dump_dir, corpus)
+    target.load(corpus)
+
+    def run():
+        report = verify.redis_verify(dump_dir, batch_size=args.batch_size, workers=args.workers, **target.connection)
+        assert not report["mismatches"], f"{report['mismatches']} documents do not match"
+
+    return summarize(measure(run, args.repeats), count_documents(corpus))
+
+
+def iter_documents(corpus: dict[str, list[dict[str, Any]]]):
+    for index_name, documents in corpus.items():
+        for document in documents:
+            yield index_name, document
+
+
+def count_documents(corpus: dict[str, list[dict[str, Any]]]) -> int:
+    return sum(len(documents) for documents in corpus.values())
+
+
+def get_git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict[str, Any], previous: dict[str, Any]):
+    print(f"\n{'benchmark':<20} {'previous':>10} {'current':>10} {'speedup':>8}")
+    for name, result in results["results"].items():
+        before = previous["results"].get(name)
+        if before is None:
+            continue
+        print(f"{name:<20} {before['best']:>9.3f}s {result['best']:>9.3f}s {before['best'] / result['best']:>7.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=10, help="Number of organizations of the corpus")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--extra-schemas", type=int, default=200, help="Unrelated schemas added to the specs")
+    parser.add_argument("--page-size", type=int, default=client.DEFAULT_PAGE_SIZE)
+    parser.add_argument("--batch-size", type=int, default=client.DEFAULT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=client.DEFAULT_WORKERS)
+    parser.add_argument("--engine", choices=client.ENGINES, default=client.SYNC_ENGINE)
+    parser.add_argument(
+        "--validate", action="store_true", help="Parse the uploaded documents instead of sending them raw"
+    )
+    parser.add_argument("--redis-url", help="Redis Stack server to use instead of the in-process stand-in")
+    parser.add_argument("--only", nargs="+", help="Benchmarks to run, all of them by default")
+    parser.add_argument("--output", type=pathlib.Path, default=pathlib.Path("benchmark-results.json"))
+    parser.add_argument("--compare", type=pathlib.Path, help="Results of a previous run to compare with")
+    args = parser.parse_args()
+
+    # Per-document logs would dominate the timings
+    LOGGER.setLevel(logging.WARNING)
+
+    corpus = generate_corpus(args.scale, args.seed)
+    target = RedisTarget(args.redis_url)
+    benchmarks = {
+        "apply_template": lambda work_dir: bench_apply_template(corpus, args.repeats),
+        "redis_dump": lambda work_dir: bench_redis_dump(target, corpus, work_dir, args),
+        "file_upload": lambda work_dir: bench_file_upload(target, corpus, work_dir, args),
+        "redis_verify": lambda work_dir: bench_redis_verify(target, corpus, work_dir, args),
+        "template_generator": lambda work_dir: bench_template_generator(args.extra_schemas, args.repeats),
+    }
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": get_git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "redis": "stand-in" if args.redis_url is None else "server",
+            "scale": args.scale,
+            "seed": args.seed,
+            "documents": count_documents(corpus),
+            "repeats": args.repeats,
+            "extra_schemas": args.extra_schemas,
+            "page_size": args.page_size,
+            "batch_size": args.batch_size,
+            "workers": args.workers,
+            "engine": args.engine,
+            "validate": args.validate,
+        },
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory() as work_dir, target.patch():
+        for name, benchmark in benchmarks.items():
+            if args.only and name not in args.only:
+                continue
+            result = benchmark(pathlib.Path(work_dir))
+            results["results"][name] = result
+            print(f"{name:<20} {result['best']:.3f}s ({result['rate']:.0f} items/s)")
+
+    args.output.write_text(json.dumps(results, indent=2))
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        compare(results, json.loads(args.compare.read_text()))
+
+
+if __name__ == "__main__":
+    main()
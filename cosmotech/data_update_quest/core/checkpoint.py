@@ -0,0 +1,133 @@
+# Copyright (C) - 2025 - Cosmo Tech
+# This document and all information contained herein is the exclusive property -
+# including all intellectual property rights pertaining thereto - of Cosmo Tech.
+# Any use, reproduction, translation, broadcasting, transmission, distribution,
+# etc., to any person is prohibited unless it has been previously and
+# specifically authorized by written means by Cosmo Tech.
+
+import json
+import os
+import pathlib
+import threading
+from typing import Any
+from typing import Optional
+
+from cosmotech.orchestrator.utils.translate import T
+
+from cosmotech.data_update_quest_cli.utils.logger import LOGGER
+
+
+class CheckpointJournal:
+    """
+    Append-only journal of the units of work (pages, batches, chunks) completed by a command.
+
+    The first line of the journal holds the command and the settings that define the units of work,
+    each following line records a completed unit of an index, with the last key it processed and its counts.
+    Records are flushed to disk as soon as a unit completes, so a run that dies partway can be resumed
+    by skipping the units already recorded.
+    """
+
+    def __init__(self, path: pathlib.Path, command: str, settings: dict[str, Any], resume: bool = False):
+        """
+        Open a journal, starting a new one unless resuming.
+
+        Args:
+            path (pathlib.Path): The journal file.
+            command (str): The command the journal belongs to.
+            settings (dict[str, Any]): The settings defining the units of work, a journal can only be resumed
+                with the same settings.
+            resume (bool): If True and the journal exists, its completed units are loaded and kept.
+        """
+        self.path = pathlib.Path(path)
+        self.header = {"command": command, "settings": settings}
+        self.completed: dict[str, set] = {}
+        self.counts: dict[str, dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+        if resume and self.path.is_file():
+            self._load()
+            self._file = open(self.path, "a")
+            for index, counts in self.counts.items():
+                LOGGER.info(
+                    T("data_update_quest.core.checkpoint.resume").format(
+                        index=index, units=len(self.completed[index]), count=counts["count"]
+                    )
+                )
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "w")
+            self._write(self.header)
+
+    def _load(self):
+        with open(self.path, "r") as file:
+            lines = file.readlines()
+
+        try:
+            header = json.loads(lines[0])
+        except (IndexError, ValueError):
+            header = None
+        if header != self.header:
+            raise ValueError(
+                f"The checkpoint journal '{self.path}' was written by another command or with other settings "
+                f"({header}), it can not be resumed with {self.header}."
+            )
+
+        for line in lines[1:]:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A record interrupted while being written is ignored, its unit will be processed again
+                continue
+            self._add(record)
+
+    def _add(self, record: dict[str, Any]):
+        index = record["index"]
+        self.completed.setdefault(index, set()).add(record["unit"])
+        counts = self.counts.setdefault(index, {"count": 0, "failed": 0})
+        counts["count"] += record["count"]
+        counts["failed"] += record["failed"]
+
+    def _write(self, record: dict[str, Any]):
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def is_done(self, index: str, unit) -> bool:
+        """
+        Check if a unit of work of an index was already completed.
+
+        Args:
+            index (str): The name of the index.
+            unit: The identifier of the unit of work, as recorded.
+
+        Returns:
+            bool: True if the unit was completed by a previous run.
+        """
+        with self._lock:
+            return unit in self.completed.get(index, ())
+
+    def record(self, index: str, unit, count: int, failed: int = 0, last: Optional[str] = None):
+        """
+        Record a completed unit of work and flush it to disk.
+
+        Args:
+            index (str): The name of the index.
+            unit: The identifier of the unit of work.
+            count (int): The number of documents processed by the unit.
+            failed (int): The number of documents of the unit that failed.
+            last (Optional[str]): The last key or file processed by the unit.
+        """
+        record = {"index": index, "unit": unit, "last": last, "count": count, "failed": failed}
+        with self._lock:
+            self._write(record)
+            self._add(record)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
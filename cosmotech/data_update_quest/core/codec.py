@@ -0,0 +1,155 @@
+# Copyright (C) - 2025 - Cosmo Tech
+# This document and all information contained herein is the exclusive property -
+# including all intellectual property rights pertaining thereto - of Cosmo Tech.
+# Any use, reproduction, translation, broadcasting, transmission, distribution,
+# etc., to any person is prohibited unless it has been previously and
+# specifically authorized by written means by Cosmo Tech.
+
+"""
+JSON codec of the documents moved by csm-duq, using orjson when it is installed and the standard library otherwise.
+
+Both codecs produce the same documents: compact without whitespace, or pretty indented by two spaces,
+non-ASCII characters being written as UTF-8 rather than escaped. Only the exponent of floats is written
+differently, `1e100` by orjson and `1e+100` by the standard library.
+The codec is picked once per process from the CSM_DUQ_JSON_CODEC environment variable, so worker processes
+use the same one as their parent.
+"""
+
+import json
+import math
+import os
+import re
+from typing import Any
+from typing import Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+AUTO_CODEC = "auto"
+ORJSON_CODEC = "orjson"
+STDLIB_CODEC = "stdlib"
+CODECS = (AUTO_CODEC, ORJSON_CODEC, STDLIB_CODEC)
+
+CODEC_ENVVAR = "CSM_DUQ_JSON_CODEC"
+
+Content = Union[str, bytes, bytearray, memoryview]
+
+# Integers of 20 digits or more may not fit in 64 bits, orjson would read them as floats
+LONG_INTEGER = re.compile(r"\d{20}")
+LONG_INTEGER_BYTES = re.compile(rb"\d{20}")
+
+
+def has_non_finite(data: Any) -> bool:
+    """Check if a document holds NaN or an infinite float, written as null by orjson"""
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+        elif isinstance(value, float) and not math.isfinite(value):
+            return True
+    return False
+
+
+class StdlibCodec:
+    """JSON codec of the standard library"""
+
+    name = STDLIB_CODEC
+
+    def loads(self, content: Content) -> Any:
+        if isinstance(content, memoryview):
+            content = bytes(content)
+        return json.loads(content)
+
+    def dumps(self, data: Any, pretty: bool = False, sort_keys: bool = False) -> str:
+        if pretty:
+            return json.dumps(data, indent=2, ensure_ascii=False, sort_keys=sort_keys)
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False, sort_keys=sort_keys)
+
+    def dumps_bytes(self, data: Any, pretty: bool = False, sort_keys: bool = False) -> bytes:
+        return self.dumps(data, pretty, sort_keys).encode("utf-8")
+
+
+class OrjsonCodec(StdlibCodec):
+    """
+    JSON codec of orjson, several times faster than the standard library.
+
+    orjson can not keep every value the standard library does, the documents holding such values are handed
+    to the standard library instead: documents holding NaN, infinite floats or integers that do not fit
+    in 64 bits are written by it, and documents holding a run of 20 digits or more are read by it.
+    """
+
+    name = ORJSON_CODEC
+
+    def loads(self, content: Content) -> Any:
+        pattern = LONG_INTEGER if isinstance(content, str) else LONG_INTEGER_BYTES
+        if pattern.search(content):
+            return super().loads(content)
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return super().loads(content)
+
+    def dumps(self, data: Any, pretty: bool = False, sort_keys: bool = False) -> str:
+        return self.dumps_bytes(data, pretty, sort_keys).decode("utf-8")
+
+    def dumps_bytes(self, data: Any, pretty: bool = False, sort_keys: bool = False) -> bytes:
+        option = (orjson.OPT_INDENT_2 if pretty else 0) | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        try:
+            content = orjson.dumps(data, option=option)
+        except TypeError:
+            # Raised as JSONEncodeError, or as a bare TypeError for large integers by older orjson releases
+            return super().dumps(data, pretty, sort_keys).encode("utf-8")
+        # orjson writes non-finite floats as null, the document is only scanned when it holds one
+        if b"null" in content and has_non_finite(data):
+            return super().dumps(data, pretty, sort_keys).encode("utf-8")
+        return content
+
+
+def get_codec(name: str = AUTO_CODEC) -> StdlibCodec:
+    """
+    Get a JSON codec by name.
+
+    Args:
+        name (str): One of CODECS, "auto" picking orjson when it is installed.
+
+    Returns:
+        StdlibCodec: The codec.
+    """
+    if name not in CODECS:
+        raise ValueError(f"Unsupported JSON codec '{name}', expected one of {', '.join(CODECS)}.")
+    if name == STDLIB_CODEC or (name == AUTO_CODEC and orjson is None):
+        return StdlibCodec()
+    if orjson is None:
+        raise ValueError("The orjson JSON codec requires the orjson package to be installed.")
+    return OrjsonCodec()
+
+
+def set_codec(name: str):
+    """Set the codec of the process and of the worker processes it starts afterwards"""
+    global CODEC
+    CODEC = get_codec(name)
+    os.environ[CODEC_ENVVAR] = name
+
+
+def loads(content: Content) -> Any:
+    """Parse a JSON document, from text or UTF-8 bytes"""
+    return CODEC.loads(content)
+
+
+def dumps(data: Any, pretty: bool = False, sort_keys: bool = False) -> str:
+    """Serialize a JSON document, compact unless pretty"""
+    return CODEC.dumps(data, pretty, sort_keys)
+
+
+def dumps_bytes(data: Any, pretty: bool = False, sort_keys: bool = False) -> bytes:
+    """Serialize a JSON document as UTF-8 bytes, to be sent to redis or written to a binary file"""
+    return CODEC.dumps_bytes(data, pretty, sort_keys)
+
+
+# Codec of the current process
+CODEC = get_codec(os.environ.get(CODEC_ENVVAR, AUTO_CODEC))
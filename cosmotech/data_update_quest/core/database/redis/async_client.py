@@ -0,0 +1,312 @@
+# Copyright (C) - 2025 - Cosmo Tech
+# This document and all information contained herein is the exclusive property -
+# including all intellectual property rights pertaining thereto - of Cosmo Tech.
+# Any use, reproduction, translation, broadcasting, transmission, distribution,
+# etc., to any person is prohibited unless it has been previously and
+# specifically authorized by written means by Cosmo Tech.
+
+import asyncio
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any
+from typing import Awaitable
+from typing import Iterable
+from typing import Optional
+
+import redis.asyncio
+from redis.commands.search.query import Query
+
+from cosmotech.orchestrator.utils.translate import T
+
+from cosmotech.data_update_quest.core import codec
+from cosmotech.data_update_quest.core.checkpoint import CheckpointJournal
+from cosmotech.data_update_quest.core.database.redis.client import DEFAULT_BATCH_SIZE
+from cosmotech.data_update_quest.core.database.redis.client import DEFAULT_PAGE_SIZE
+from cosmotech.data_update_quest.core.database.redis.client import DEFAULT_WORKERS
+from cosmotech.data_update_quest.core.database.redis.client import DUMP_JOURNAL
+from cosmotech.data_update_quest.core.database.redis.client import UPLOAD_JOURNAL
+from cosmotech.data_update_quest.core.database.redis.client import batched
+from cosmotech.data_update_quest.core.database.redis.client import close_dump
+from cosmotech.data_update_quest.core.database.redis.client import decode_page
+from cosmotech.data_update_quest.core.database.redis.client import get_index_key
+from cosmotech.data_update_quest.core.database.redis.client import iter_index_files
+from cosmotech.data_update_quest.core.database.redis.client import name_redis_indexes
+from cosmotech.data_update_quest.core.database.redis.client import open_dump
+from cosmotech.data_update_quest.core.database.redis.client import open_raw_files
+from cosmotech.data_update_quest.core.database.redis.client import page_query
+from cosmotech.data_update_quest.core.database.redis.client import parse_lines
+from cosmotech.data_update_quest.core.database.redis.client import read_files
+from cosmotech.data_update_quest.core.database.redis.client import report_delete
+from cosmotech.data_update_quest.core.database.redis.client import report_dump
+from cosmotech.data_update_quest.core.database.redis.client import report_upload
+from cosmotech.data_update_quest.core.database.redis.client import upload_settings
+from cosmotech.data_update_quest.core.database.redis.connection import get_async_connection_pool
+from cosmotech.data_update_quest.core.database.redis.storage import DIRECTORY_FORMAT
+from cosmotech.data_update_quest.core.database.redis.storage import iter_bundle
+from cosmotech.data_update_quest.core.database.redis.storage import read_manifest
+from cosmotech.data_update_quest.core.metrics import ENCODE
+from cosmotech.data_update_quest.core.metrics import FETCH
+from cosmotech.data_update_quest.core.metrics import METRICS
+from cosmotech.data_update_quest.core.metrics import WRITE
+from cosmotech.data_update_quest_cli.utils.logger import LOGGER
+
+
+def get_async_redis_client(host, port, password, max_connections: Optional[int] = None) -> redis.asyncio.Redis:
+    """
+    Create an asyncio redis client with the configured connection settings.
+
+    The connection pool of an asyncio client is bound to its event loop, so each run gets its own.
+
+    Args:
+        host: The redis host.
+        port: The redis port.
+        password: The redis password.
+        max_connections (Optional[int]): The connections needed by the caller, unless a maximum was configured.
+
+    Returns:
+        redis.asyncio.Redis: The redis client, to be closed with `close(close_connection_pool=True)`.
+    """
+    LOGGER.info(T("data_update_quest.core.redis_dump.redis_connection"))
+    return redis.asyncio.Redis(connection_pool=get_async_connection_pool(host, port, password, max_connections))
+
+
+async def get_async_redis_indexes(redis_client, index_list: Optional[list[str]]) -> dict[str, str]:
+    """Get the indexes to process, as get_redis_indexes does with a synchronous client"""
+    LOGGER.info(T("data_update_quest.core.redis_dump.redis_index"))
+
+    if index_list:
+        return name_redis_indexes([get_index_key(index_name.lower()) for index_name in index_list])
+    return name_redis_indexes(await redis_client.execute_command("FT._LIST"))
+
+
+async def bounded_gather(coroutines: Iterable[Awaitable], limit: int) -> list:
+    """
+    Run coroutines with at most `limit` of them in flight, and return their results in completion order.
+
+    Coroutines are only taken from the iterable once a slot is free, so a lazy iterable is consumed
+    at the pace of the work and its elements are never all held in memory. The first error stops
+    the scheduling of new coroutines and is raised once the running ones are done.
+    """
+    semaphore = asyncio.Semaphore(limit)
+    results = []
+    errors = []
+    tasks = set()
+
+    async def run(coroutine: Awaitable):
+        try:
+            results.append(await coroutine)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            semaphore.release()
+
+    iterator = iter(coroutines)
+    while not errors:
+        await semaphore.acquire()
+        coroutine = next(iterator, None)
+        if coroutine is None or errors:
+            semaphore.release()
+            if coroutine is not None:
+                coroutine.close()
+            break
+        task = asyncio.create_task(run(coroutine))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    await asyncio.gather(*tasks)
+    if errors:
+        raise errors[0]
+    return results
+
+
+async def dump_page_async(
+    journal: CheckpointJournal, redis_client, index_name: str, index: str, writer, offset: int, page_size: int
+) -> list[str]:
+    """Dump a page of an index like dump_journaled_page, the page being written to disk in a worker thread"""
+    with METRICS.measure(FETCH, index_name) as sample:
+        docs = (await redis_client.ft(index).search(page_query(offset, page_size))).docs
+        sample.items = len(docs)
+        sample.bytes = sum(len(doc.json) for doc in docs)
+    documents = decode_page(index_name, docs)
+    with METRICS.measure(WRITE, index_name, items=len(documents), nbytes=sample.bytes):
+        await asyncio.to_thread(writer.write, documents)
+
+    ids = report_dump(index_name, documents)
+    journal.record(index_name, offset, count=len(ids), last=ids[-1] if ids else None)
+    return ids
+
+
+async def redis_dump_async(
+    file_path,
+    host,
+    port,
+    password,
+    index_list,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    workers: int = DEFAULT_WORKERS,
+    dump_format: str = DIRECTORY_FORMAT,
+    compression: str = "none",
+    resume: bool = False,
+    journal_path: Optional[Path] = None,
+    incremental: bool = False,
+):
+    """
+    Dump indexes like redis_dump, on a single event loop with `workers` pages in flight.
+
+    The arguments are those of redis_dump, which validates them before calling this function.
+    """
+    redis_client = get_async_redis_client(host=host, port=port, password=password, max_connections=workers)
+    try:
+        indexes = await get_async_redis_indexes(redis_client, index_list)
+
+        path = Path(file_path)
+        journal = CheckpointJournal(
+            journal_path or path / DUMP_JOURNAL,
+            "redis-dump",
+            {"page_size": page_size, "format": dump_format},
+            resume=resume,
+        )
+        writers, content_manifest = open_dump(path, indexes, dump_format, compression, resume, incremental)
+        pages = []
+        for index in indexes:
+            total = (await redis_client.ft(indexes[index]).search(Query("*").paging(0, 0))).total
+            pages.extend((index, offset) for offset in range(0, total, page_size) if not journal.is_done(index, offset))
+
+        try:
+            with journal:
+                await bounded_gather(
+                    (
+                        dump_page_async(journal, redis_client, index, indexes[index], writers[index], offset, page_size)
+                        for index, offset in pages
+                    ),
+                    workers,
+                )
+        except BaseException:
+            for writer in writers.values():
+                writer.close()
+            raise
+    finally:
+        await redis_client.close(close_connection_pool=True)
+
+    close_dump(path, writers, dump_format, compression, content_manifest)
+
+
+async def upload_batch_async(
+    redis_client, documents: dict[str, Any], index_name: str, raw: bool = False
+) -> dict[str, Exception]:
+    """
+    Write a batch of JSON documents like upload_batch, with a pipeline of an asyncio client.
+
+    Documents are serialized here, unless they are raw, and sent with JSON.SET, as the JSON pipelines
+    of redis-py are not available on asyncio clients.
+    """
+    with METRICS.measure(ENCODE, index_name, items=len(documents)) as sample:
+        pipeline = redis_client.pipeline(transaction=False)
+        for key, data in documents.items():
+            content = data if raw else codec.dumps_bytes(data)
+            sample.bytes += len(content)
+            pipeline.execute_command("JSON.SET", key, ".", content)
+    with METRICS.measure(WRITE, index_name, items=len(documents)) as sample:
+        results = await pipeline.execute(raise_on_error=False)
+        errors = {key: result for key, result in zip(documents, results) if isinstance(result, Exception)}
+        sample.errors = len(errors)
+
+    return errors
+
+
+async def upload_batch_journaled_async(
+    journal: CheckpointJournal, unit: int, redis_client, index_name: str, batch: list, validate: bool = False
+) -> list[str]:
+    """
+    Upload a batch of files or NDJSON lines like upload_journaled_batch.
+
+    Files are read, and parsed when validated, in a worker thread, so the event loop keeps sending
+    the other batches meanwhile.
+    """
+    with ExitStack() as stack:
+        if not isinstance(batch[0], Path):
+            documents, errors = parse_lines(index_name, batch, raw=not validate)
+        elif validate:
+            documents, errors = await asyncio.to_thread(read_files, index_name, batch)
+        else:
+            # Memory-mapped files stay mapped until their batch is sent
+            documents, errors = await asyncio.to_thread(stack.enter_context, open_raw_files(index_name, batch))
+        if documents:
+            errors.update(await upload_batch_async(redis_client, documents, index_name, raw=not validate))
+
+    failed_keys = report_upload(index_name, documents, errors)
+    if not failed_keys:
+        last = batch[-1].name if isinstance(batch[-1], Path) else None
+        journal.record(index_name, unit, count=len(batch), last=last)
+    return failed_keys
+
+
+async def delete_documents_async(redis_client, index_name: str, ids: list[str], batch_size: int) -> list[str]:
+    """Delete documents of an index like delete_documents, with a pipeline of an asyncio client"""
+    failed_keys = []
+    for keys in batched([f"{get_index_key(index_name)}:{json_id}" for json_id in ids], batch_size):
+        with METRICS.measure(WRITE, index_name, items=len(keys)) as sample:
+            pipeline = redis_client.pipeline(transaction=False)
+            for key in keys:
+                pipeline.delete(key)
+            results = await pipeline.execute(raise_on_error=False)
+            errors = {key: result for key, result in zip(keys, results) if isinstance(result, Exception)}
+            sample.errors = len(errors)
+        failed_keys.extend(report_delete(index_name, keys, errors))
+    return failed_keys
+
+
+async def file_upload_async(
+    file_path,
+    host,
+    port,
+    password,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int = DEFAULT_WORKERS,
+    resume: bool = False,
+    journal_path: Optional[Path] = None,
+    delta: Optional[dict[str, dict[str, list[str]]]] = None,
+    validate: bool = False,
+) -> list[str]:
+    """
+    Upload a dump like file_upload, on a single event loop with `workers` batches in flight.
+
+    The arguments are those of file_upload, which validates them before calling this function,
+    and reads the `delta` of the dump for an incremental upload.
+    """
+    path = Path(file_path)
+    manifest = None if delta is not None else read_manifest(path)
+    journal = CheckpointJournal(
+        journal_path or path / UPLOAD_JOURNAL, "redis-file-upload", upload_settings(batch_size, delta), resume=resume
+    )
+
+    if manifest is None:
+        batches = (
+            (index_name, unit, batch)
+            for index_name, files in iter_index_files(path, delta)
+            for unit, batch in enumerate(batched(files, batch_size))
+        )
+    else:
+        batches = (
+            (index, unit, lines)
+            for index in manifest["indexes"]
+            for unit, lines in enumerate(batched(iter_bundle(path, index, manifest), batch_size))
+        )
+
+    redis_client = get_async_redis_client(host=host, port=port, password=password, max_connections=workers)
+    try:
+        with journal:
+            results = await bounded_gather(
+                (
+                    upload_batch_journaled_async(journal, unit, redis_client, index_name, batch, validate)
+                    for index_name, unit, batch in batches
+                    if not journal.is_done(index_name, unit)
+                ),
+                workers,
+            )
+        for index_name, index_delta in sorted((delta or {}).items()):
+            results.append(await delete_documents_async(redis_client, index_name, index_delta["deleted"], batch_size))
+    finally:
+        await redis_client.close(close_connection_pool=True)
+
+    return [key for failed_keys in results for key in failed_keys]
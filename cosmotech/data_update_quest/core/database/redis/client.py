@@ -5,33 +5,78 @@
 # etc., to any person is prohibited unless it has been previously and
 # specifically authorized by written means by Cosmo Tech.
 
+import asyncio
+import mmap
+import os
 import redis
-import json
+from collections import deque
+from contextlib import ExitStack
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from itertools import islice
+from typing import Any
+from typing import Iterable
+from typing import Iterator
 from typing import Optional
+from typing import Union
+
+from redis.commands.search.query import Query
 
 from cosmotech.orchestrator.utils.translate import T
 
+from cosmotech.data_update_quest.core import codec
+from cosmotech.data_update_quest.core.checkpoint import CheckpointJournal
+from cosmotech.data_update_quest.core.database.redis.connection import get_connection_pool
+from cosmotech.data_update_quest.core.database.redis.storage import BundleWriter
+from cosmotech.data_update_quest.core.database.redis.storage import CONTENT_MANIFEST_FILE
+from cosmotech.data_update_quest.core.database.redis.storage import ContentManifest
+from cosmotech.data_update_quest.core.database.redis.storage import DIRECTORY_FORMAT
+from cosmotech.data_update_quest.core.database.redis.storage import DUMP_FORMATS
+from cosmotech.data_update_quest.core.database.redis.storage import DirectoryWriter
+from cosmotech.data_update_quest.core.database.redis.storage import NDJSON_FORMAT
+from cosmotech.data_update_quest.core.database.redis.storage import iter_bundle
+from cosmotech.data_update_quest.core.database.redis.storage import read_content_manifest
+from cosmotech.data_update_quest.core.database.redis.storage import read_manifest
+from cosmotech.data_update_quest.core.database.redis.storage import write_manifest
+from cosmotech.data_update_quest.core.metrics import DECODE
+from cosmotech.data_update_quest.core.metrics import ENCODE
+from cosmotech.data_update_quest.core.metrics import FETCH
+from cosmotech.data_update_quest.core.metrics import METRICS
+from cosmotech.data_update_quest.core.metrics import WRITE
 from cosmotech.data_update_quest_cli.utils.logger import LOGGER
 
 
-def get_redis_client(host, port, password):
+def get_redis_client(host, port, password, max_connections: Optional[int] = None):
+    """
+    Create a redis client on the shared connection pool of the server, with the configured connection settings.
+
+    Args:
+        host: The redis host.
+        port: The redis port.
+        password: The redis password.
+        max_connections (Optional[int]): The connections needed by the caller, usually its number of workers,
+            unless a maximum was configured.
+
+    Returns:
+        redis.Redis: The redis client.
+    """
     LOGGER.info(T("data_update_quest.core.redis_dump.redis_connection"))
-    return redis.Redis(host=host, port=port, password=password, decode_responses=True)
+    return redis.Redis(connection_pool=get_connection_pool(host, port, password, max_connections))
 
 
 def get_redis_indexes(r, index_list: Optional[list[str]]):
 
     LOGGER.info(T("data_update_quest.core.redis_dump.redis_index"))
 
-    indexes = {}
     if index_list:
-        full_index_list = [
-            f"com.cosmotech.{index_name.lower()}.domain.{index_name.capitalize()}Idx" for index_name in index_list
-        ]
-    else:
-        full_index_list = r.execute_command("FT._LIST")
+        return name_redis_indexes([get_index_key(index_name.lower()) for index_name in index_list])
+    return name_redis_indexes(r.execute_command("FT._LIST"))
+
 
+def name_redis_indexes(full_index_list: list[str]) -> dict[str, str]:
+    """Map the short name of each index, as used for the dump directories, to its full RediSearch name"""
+    indexes = {}
     for index in full_index_list:
         index_name = index.split(".")[2]
         indexes[index_name] = index
@@ -40,42 +85,729 @@ def get_redis_indexes(r, index_list: Optional[list[str]]):
     return indexes
 
 
-def redis_dump(file_path, host, port, password, index_list):
-    redis_client = get_redis_client(host=host, port=port, password=password)
+def get_index_key(index_name: str) -> str:
+    """Build the key prefix of the documents of an index from its short name"""
+    return f"com.cosmotech.{index_name}.domain.{index_name.capitalize()}Idx"
+
+
+SYNC_ENGINE = "sync"
+ASYNC_ENGINE = "async"
+ENGINES = (SYNC_ENGINE, ASYNC_ENGINE)
+
+DUMP_JOURNAL = ".duq-dump-checkpoint.jsonl"
+UPLOAD_JOURNAL = ".duq-upload-checkpoint.jsonl"
+
+DEFAULT_PAGE_SIZE = 1000
+DEFAULT_WORKERS = 1
+
+# Field of the search results holding the id of each document, so it does not have to be parsed out of it
+ID_FIELD = "document_id"
+
+
+def fetch_page(redis_client, index: str, offset: int, page_size: int):
+    """
+    Fetch a single page of documents from a RediSearch index.
+
+    Args:
+        redis_client: The redis client to use.
+        index (str): The full name of the index to read.
+        offset (int): The position of the first document of the page.
+        page_size (int): The maximum number of documents in the page.
+
+    Returns:
+        The search result, holding the page documents and the total number of documents in the index.
+    """
+    return redis_client.ft(index).search(page_query(offset, page_size))
+
+
+def page_query(offset: int, page_size: int) -> Query:
+    """Build the query of a page of documents, returning each document along with its id"""
+    return Query("*").paging(offset, page_size).return_field("$.id", as_field=ID_FIELD).return_field("$")
+
+
+def list_index_keys(redis_client, index: str, page_size: int = DEFAULT_PAGE_SIZE) -> list[str]:
+    """
+    List the keys of all the documents of a RediSearch index.
+
+    Keys are fetched page by page with NOCONTENT searches, giving a stable snapshot of the index
+    that can be iterated over while its documents are being rewritten.
+
+    Args:
+        redis_client: The redis client to use.
+        index (str): The full name of the index to read.
+        page_size (int): The number of keys fetched per request.
+
+    Returns:
+        list[str]: The keys of the documents of the index.
+    """
+    if page_size < 1:
+        raise ValueError(f"The page size must be a positive integer, got {page_size}.")
+
+    keys = []
+    while True:
+        result = redis_client.ft(index).search(Query("*").no_content().paging(len(keys), page_size))
+        keys.extend(doc.id for doc in result.docs)
+        if not result.docs or len(keys) >= result.total:
+            return keys
+
+
+def dump_page(redis_client, index_name: str, index: str, writer, offset: int, page_size: int) -> list[str]:
+    """
+    Fetch a page of documents from an index and hand them to the writer of the index.
+
+    Args:
+        redis_client: The redis client to use.
+        index_name (str): The short name of the index, used for logging.
+        index (str): The full name of the index to read.
+        writer: The DirectoryWriter or BundleWriter of the index.
+        offset (int): The position of the first document of the page.
+        page_size (int): The maximum number of documents in the page.
+
+    Returns:
+        list[str]: The ids of the documents written.
+    """
+    with METRICS.measure(FETCH, index_name) as sample:
+        docs = fetch_page(redis_client, index, offset, page_size).docs
+        sample.items = len(docs)
+        sample.bytes = sum(len(doc.json) for doc in docs)
+    documents = decode_page(index_name, docs)
+    with METRICS.measure(WRITE, index_name, items=len(documents), nbytes=sample.bytes):
+        writer.write(documents)
+
+    return report_dump(index_name, documents)
+
+
+def decode_page(index_name: str, docs: list) -> list[tuple[str, str]]:
+    """Get the id of each document of a page, keeping its JSON content as returned by redis"""
+    with METRICS.measure(DECODE, index_name, items=len(docs), nbytes=sum(len(doc.json) for doc in docs)):
+        return [(document_id(doc), doc.json) for doc in docs]
+
+
+def document_id(doc) -> str:
+    """Get the id of a document of a search result, only parsing the document if redis did not return its id"""
+    json_id = getattr(doc, ID_FIELD, None)
+    if json_id is None:
+        return codec.loads(doc.json)["id"]
+    return json_id
+
+
+def report_dump(index_name: str, documents: list[tuple[str, str]]) -> list[str]:
+    """Log the documents of a dumped page and return their ids"""
+    for json_id, _ in documents:
+        LOGGER.info(f'{T("data_update_quest.core.redis_dump.dump").format(index=index_name):<20} :    {json_id}')
+
+    return [json_id for json_id, _ in documents]
+
+
+def dump_journaled_page(
+    journal: CheckpointJournal, redis_client, index_name: str, index: str, writer, offset: int, page_size: int
+) -> list[str]:
+    """Dump a page with dump_page and record it as completed in the checkpoint journal"""
+    ids = dump_page(redis_client, index_name, index, writer, offset, page_size)
+    journal.record(index_name, offset, count=len(ids), last=ids[-1] if ids else None)
+    return ids
+
+
+def open_dump(
+    path: Path, indexes: Iterable[str], dump_format: str, compression: str, resume: bool, incremental: bool
+) -> tuple[dict[str, Any], Optional[ContentManifest]]:
+    """
+    Create the writer of each index of a dump, and the content manifest of a directory dump.
+
+    The content manifest of a resumed dump would miss the documents of the pages done by the interrupted run,
+    so none is kept: the next incremental dump of the directory writes every document again.
+
+    Returns:
+        tuple[dict[str, Any], Optional[ContentManifest]]: The writers by index, and the content manifest if any.
+    """
+    content_manifest = None
+    if dump_format == DIRECTORY_FORMAT:
+        if resume:
+            (path / CONTENT_MANIFEST_FILE).unlink(missing_ok=True)
+        else:
+            content_manifest = ContentManifest(path, incremental)
+
+    writers = {}
+    for index in indexes:
+        if dump_format == NDJSON_FORMAT:
+            writers[index] = BundleWriter(path, index, compression)
+        elif content_manifest is not None:
+            writers[index] = content_manifest.writer(index, DirectoryWriter(path / index))
+        else:
+            writers[index] = DirectoryWriter(path / index)
+    return writers, content_manifest
+
+
+def close_dump(
+    path: Path, writers: dict[str, Any], dump_format: str, compression: str, content_manifest: Optional[ContentManifest]
+):
+    """Close the writers of a completed dump and write its manifests"""
+    entries = {index: writer.close() for index, writer in writers.items()}
+    if dump_format == NDJSON_FORMAT:
+        write_manifest(path, compression, entries)
+    if content_manifest is not None:
+        for index, delta in content_manifest.close().items():
+            LOGGER.info(
+                T("data_update_quest.core.redis_dump.delta").format(
+                    index=index, changed=len(delta["changed"]), deleted=len(delta["deleted"])
+                )
+            )
+
+
+def redis_dump(
+    file_path,
+    host,
+    port,
+    password,
+    index_list,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    workers: int = DEFAULT_WORKERS,
+    dump_format: str = DIRECTORY_FORMAT,
+    compression: str = "none",
+    resume: bool = False,
+    journal_path: Optional[Path] = None,
+    engine: str = SYNC_ENGINE,
+    incremental: bool = False,
+):
+    if page_size < 1:
+        raise ValueError(f"The page size must be a positive integer, got {page_size}.")
+    if dump_format not in DUMP_FORMATS:
+        raise ValueError(f"Unsupported dump format '{dump_format}', expected one of {', '.join(DUMP_FORMATS)}.")
+    if resume and dump_format == NDJSON_FORMAT:
+        raise ValueError("Only dumps using the directory format can be resumed.")
+    if incremental and dump_format == NDJSON_FORMAT:
+        raise ValueError("Only dumps using the directory format can be incremental.")
+    if incremental and resume:
+        raise ValueError("Incremental dumps can not be resumed, as the hashes of the interrupted run are lost.")
+    if engine not in ENGINES:
+        raise ValueError(f"Unsupported engine '{engine}', expected one of {', '.join(ENGINES)}.")
+
+    if engine == ASYNC_ENGINE:
+        from cosmotech.data_update_quest.core.database.redis.async_client import redis_dump_async
+
+        return asyncio.run(
+            redis_dump_async(
+                file_path,
+                host,
+                port,
+                password,
+                index_list,
+                page_size=page_size,
+                workers=workers,
+                dump_format=dump_format,
+                compression=compression,
+                resume=resume,
+                journal_path=journal_path,
+                incremental=incremental,
+            )
+        )
+
+    redis_client = get_redis_client(host=host, port=port, password=password, max_connections=workers)
     indexes = get_redis_indexes(redis_client, index_list)
 
+    path = Path(file_path)
+    journal = CheckpointJournal(
+        journal_path or path / DUMP_JOURNAL,
+        "redis-dump",
+        {"page_size": page_size, "format": dump_format},
+        resume=resume,
+    )
+    writers, content_manifest = open_dump(path, indexes, dump_format, compression, resume, incremental)
+    pages = []
     for index in indexes:
-        result = redis_client.ft(indexes[index]).search("*")
-        path = Path(file_path) / index
-        path.mkdir(parents=True, exist_ok=True)
+        total = fetch_page(redis_client, indexes[index], 0, 0).total
+        pages.extend((index, offset) for offset in range(0, total, page_size) if not journal.is_done(index, offset))
+
+    # Pages of every index are independent tasks, so large indexes are split across workers
+    # and the total dump time is bounded by the largest index rather than the sum of all of them
+    try:
+        with journal, ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    dump_journaled_page,
+                    journal,
+                    redis_client,
+                    index,
+                    indexes[index],
+                    writers[index],
+                    offset,
+                    page_size,
+                )
+                for index, offset in pages
+            ]
+            for future in futures:
+                future.result()
+    except BaseException:
+        for writer in writers.values():
+            writer.close()
+        raise
+
+    close_dump(path, writers, dump_format, compression, content_manifest)
+
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def batched(iterable: Iterable, size: int) -> Iterator[list]:
+    """
+    Split an iterable into lists of at most `size` elements.
+
+    Args:
+        iterable (Iterable): The elements to split.
+        size (int): The maximum number of elements per batch.
+
+    Yields:
+        list: The elements of the current batch.
+    """
+    if size < 1:
+        raise ValueError(f"The batch size must be a positive integer, got {size}.")
+
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def upload_batch(
+    redis_client, documents: dict[str, Any], index_name: Optional[str] = None, raw: bool = False
+) -> dict[str, Exception]:
+    """
+    Write a batch of JSON documents to redis in a single pipelined round-trip.
+
+    The pipeline is not transactional and is executed without raising, so a document
+    refused by redis does not prevent the rest of the batch from being written.
+
+    Args:
+        redis_client: The redis client to use.
+        documents (dict[str, Any]): The documents to write, indexed by their redis key.
+        index_name (Optional[str]): The short name of the index of the documents, used for the metrics.
+        raw (bool): If True, the documents are serialized JSON sent as they are, redis validating them.
+
+    Returns:
+        dict[str, Exception]: The error raised for each document that could not be written.
+    """
+    # Documents are serialized with the JSON codec as they are added to the pipeline, unless they already are
+    with METRICS.measure(ENCODE, index_name, items=len(documents)) as sample:
+        pipeline = redis_client.json().pipeline(transaction=False)
+        for key, data in documents.items():
+            content = data if raw else codec.dumps_bytes(data)
+            sample.bytes += len(content)
+            pipeline.execute_command("JSON.SET", key, ".", content)
+    with METRICS.measure(WRITE, index_name, items=len(documents)) as sample:
+        results = pipeline.execute(raise_on_error=False)
+        errors = {key: result for key, result in zip(documents, results) if isinstance(result, Exception)}
+        sample.errors = len(errors)
+
+    return errors
+
+
+def upload_documents(
+    redis_client, index_name: str, documents: dict[str, Any], errors: dict[str, Exception], raw: bool = False
+) -> list[str]:
+    """
+    Upload a batch of parsed documents of an index and report the outcome of each of them.
+
+    Args:
+        redis_client: The redis client to use.
+        index_name (str): The short name of the index, used for logging.
+        documents (dict[str, Any]): The documents to write, indexed by their redis key.
+        errors (dict[str, Exception]): The documents of the batch that already failed to be read.
+        raw (bool): If True, the documents are serialized JSON sent as they are.
+
+    Returns:
+        list[str]: The keys of the documents that could not be uploaded.
+    """
+    if documents:
+        errors.update(upload_batch(redis_client, documents, index_name, raw))
 
-        for doc in result.docs:
-            json_id = json.loads(doc.json)["id"]
+    return report_upload(index_name, documents, errors)
 
-            with open(file=path / (json_id + ".json"), mode="w") as file:
-                file.write(doc.json)
-                LOGGER.info(f'{T("data_update_quest.core.redis_dump.dump").format(index=index):<20} :    {json_id}')
 
+def report_upload(index_name: str, documents: dict[str, Any], errors: dict[str, Exception]) -> list[str]:
+    """
+    Log the outcome of each document of an uploaded batch.
 
-def file_upload(file_path, host, port, password):
-    redis_client = get_redis_client(host=host, port=port, password=password)
+    Args:
+        index_name (str): The short name of the index.
+        documents (dict[str, Any]): The documents of the batch, indexed by their redis key.
+        errors (dict[str, Exception]): The documents that could not be read or written.
 
+    Returns:
+        list[str]: The keys of the documents that could not be uploaded.
+    """
+    uploaded = [key for key in documents if key not in errors]
+    for key in uploaded:
+        LOGGER.info(
+            f'{T("data_update_quest.core.redis_file_upload.upload").format(index=index_name):<20} :    '
+            f'{key.rsplit(":", 1)[-1]}'
+        )
+    for key, error in errors.items():
+        LOGGER.error(T("data_update_quest.core.redis_file_upload.upload_error").format(key=key, error=error))
+    LOGGER.info(
+        T("data_update_quest.core.redis_file_upload.batch").format(
+            index=index_name, success=len(uploaded), failed=len(errors)
+        )
+    )
+
+    return list(errors)
+
+
+def upload_files(redis_client, index_name: str, json_files: list[Path]) -> list[str]:
+    """
+    Upload a batch of json files of an index directory to redis.
+
+    Args:
+        redis_client: The redis client to use.
+        index_name (str): The name of the index directory the files belong to.
+        json_files (list[Path]): The files to upload, named after the id of their document.
+
+    Returns:
+        list[str]: The keys of the documents that could not be uploaded.
+    """
+    documents, errors = read_files(index_name, json_files)
+    return upload_documents(redis_client, index_name, documents, errors)
+
+
+def read_files(index_name: str, json_files: list[Path]) -> tuple[dict[str, Any], dict[str, Exception]]:
+    """
+    Read and parse a batch of json files of an index directory.
+
+    Args:
+        index_name (str): The name of the index directory the files belong to.
+        json_files (list[Path]): The files to read, named after the id of their document.
+
+    Returns:
+        tuple[dict[str, Any], dict[str, Exception]]: The parsed documents and the errors of the files
+            that could not be read, both indexed by redis key.
+    """
+    contents = {}
+    errors = {}
+    with METRICS.measure(FETCH, index_name, items=len(json_files)) as sample:
+        for json_file in json_files:
+            key = f"{get_index_key(index_name)}:{json_file.name.split('.')[0]}"
+            try:
+                with json_file.open("rb") as file:
+                    contents[key] = file.read()
+            except OSError as e:
+                errors[key] = e
+        sample.bytes = sum(len(content) for content in contents.values())
+        sample.errors = len(errors)
+
+    documents = {}
+    with METRICS.measure(DECODE, index_name, items=len(contents), nbytes=sample.bytes) as sample:
+        for key, content in contents.items():
+            try:
+                documents[key] = codec.loads(content)
+            except ValueError as e:
+                errors[key] = e
+        sample.errors = len(contents) - len(documents)
+
+    return documents, errors
+
+
+# Files at least this large are memory-mapped instead of read when uploaded raw
+MMAP_THRESHOLD = 1024 * 1024
+
+
+def upload_raw_files(redis_client, index_name: str, json_files: list[Path]) -> list[str]:
+    """
+    Upload a batch of json files of an index directory to redis, without decoding them.
+
+    The content of each file is sent as the payload of its JSON.SET, redis checking that it is valid JSON.
+
+    Args:
+        redis_client: The redis client to use.
+        index_name (str): The name of the index directory the files belong to.
+        json_files (list[Path]): The files to upload, named after the id of their document.
+
+    Returns:
+        list[str]: The keys of the documents that could not be uploaded.
+    """
+    with open_raw_files(index_name, json_files) as (contents, errors):
+        return upload_documents(redis_client, index_name, contents, errors, raw=True)
+
+
+@contextmanager
+def open_raw_files(
+    index_name: str, json_files: list[Path]
+) -> Iterator[tuple[dict[str, Union[bytes, memoryview]], dict[str, Exception]]]:
+    """
+    Read a batch of json files of an index directory as raw bytes.
+
+    Files of at least MMAP_THRESHOLD bytes are memory-mapped, so redis-py sends them from the page cache
+    without copying them, and unmapped when leaving the context.
+
+    Args:
+        index_name (str): The name of the index directory the files belong to.
+        json_files (list[Path]): The files to read, named after the id of their document.
+
+    Yields:
+        tuple[dict[str, Union[bytes, memoryview]], dict[str, Exception]]: The content of the files and the errors
+            of the files that could not be read, both indexed by redis key.
+    """
+    contents = {}
+    errors = {}
+    with ExitStack() as stack:
+        with METRICS.measure(FETCH, index_name, items=len(json_files)) as sample:
+            for json_file in json_files:
+                key = f"{get_index_key(index_name)}:{json_file.name.split('.')[0]}"
+                try:
+                    with open(json_file, "rb") as file:
+                        size = os.fstat(file.fileno()).st_size
+                        if size < MMAP_THRESHOLD or not size:
+                            contents[key] = file.read()
+                            continue
+                        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                    stack.callback(mapped.close)
+                    contents[key] = memoryview(mapped)
+                    # The view must be released before the file is unmapped
+                    stack.callback(contents[key].release)
+                except OSError as e:
+                    errors[key] = e
+            sample.bytes = sum(len(content) for content in contents.values())
+            sample.errors = len(errors)
+
+        yield contents, errors
+
+
+def upload_lines(redis_client, index_name: str, lines: list[str]) -> list[str]:
+    """
+    Upload a batch of NDJSON lines of an index bundle to redis.
+
+    Args:
+        redis_client: The redis client to use.
+        index_name (str): The name of the index the lines belong to.
+        lines (list[str]): The JSON documents to upload, each holding its own id.
+
+    Returns:
+        list[str]: The keys of the documents that could not be uploaded.
+    """
+    documents, errors = parse_lines(index_name, lines)
+    return upload_documents(redis_client, index_name, documents, errors)
+
+
+def upload_raw_lines(redis_client, index_name: str, lines: list[str]) -> list[str]:
+    """
+    Upload a batch of NDJSON lines of an index bundle to redis, sending each line as it is.
+
+    Lines are still decoded to find the id of their document, but not serialized again.
+
+    Args:
+        redis_client: The redis client to use.
+        index_name (str): The name of the index the lines belong to.
+        lines (list[str]): The JSON documents to upload, each holding its own id.
+
+    Returns:
+        list[str]: The keys of the documents that could not be uploaded.
+    """
+    documents, errors = parse_lines(index_name, lines, raw=True)
+    return upload_documents(redis_client, index_name, documents, errors, raw=True)
+
+
+def parse_lines(index_name: str, lines: list[str], raw: bool = False) -> tuple[dict[str, Any], dict[str, Exception]]:
+    """
+    Parse a batch of NDJSON lines of an index bundle.
+
+    Args:
+        index_name (str): The name of the index the lines belong to.
+        lines (list[str]): The JSON documents, each holding its own id.
+        raw (bool): If True, the lines are kept as they are instead of their parsed documents.
+
+    Returns:
+        tuple[dict[str, Any], dict[str, Exception]]: The parsed documents and the errors of the lines
+            that could not be parsed, both indexed by redis key.
+    """
+    documents = {}
+    errors = {}
+    with METRICS.measure(DECODE, index_name, items=len(lines), nbytes=sum(map(len, lines))) as sample:
+        for position, line in enumerate(lines):
+            try:
+                data = codec.loads(line)
+                documents[f"{get_index_key(index_name)}:{data['id']}"] = line if raw else data
+            except (KeyError, TypeError, ValueError) as e:
+                errors[f"{get_index_key(index_name)}:<line {position}>"] = e
+        sample.errors = len(errors)
+
+    return documents, errors
+
+
+def read_upload_delta(path: Path) -> dict[str, dict[str, list[str]]]:
+    """
+    Read the documents changed and deleted by the last dump of a directory, from its content manifest.
+
+    Args:
+        path (Path): The dump directory.
+
+    Returns:
+        dict[str, dict[str, list[str]]]: The ids of the changed and deleted documents of each index.
+    """
+    manifest = read_content_manifest(path)
+    if manifest is None:
+        raise ValueError(
+            f"The directory '{path}' has no {CONTENT_MANIFEST_FILE}, only directory dumps can be uploaded incrementally."
+        )
+    return manifest["delta"]
+
+
+def iter_index_files(path: Path, delta: Optional[dict[str, dict[str, list[str]]]] = None) -> Iterator[tuple[str, list]]:
+    """
+    List the json files of each index directory of a dump, sorted so batches are the same from one run to the next.
+
+    Args:
+        path (Path): The dump directory.
+        delta (Optional[dict[str, dict[str, list[str]]]]): The delta of the last dump, to only list the changed files.
+
+    Yields:
+        tuple[str, list]: The name of each index and its files.
+    """
+    if delta is None:
+        for index in sorted(path.iterdir()):
+            if index.is_dir():
+                yield index.name, sorted(index.glob("*.json"))
+        return
+
+    for index_name, index_delta in sorted(delta.items()):
+        yield index_name, [path / index_name / (json_id + ".json") for json_id in index_delta["changed"]]
+
+
+def delete_documents(redis_client, index_name: str, ids: list[str], batch_size: int = DEFAULT_BATCH_SIZE) -> list[str]:
+    """
+    Delete documents of an index from redis, in pipelined batches.
+
+    Args:
+        redis_client: The redis client to use.
+        index_name (str): The short name of the index of the documents.
+        ids (list[str]): The ids of the documents to delete.
+        batch_size (int): The number of documents deleted per request.
+
+    Returns:
+        list[str]: The keys of the documents that could not be deleted.
+    """
+    failed_keys = []
+    for keys in batched([f"{get_index_key(index_name)}:{json_id}" for json_id in ids], batch_size):
+        with METRICS.measure(WRITE, index_name, items=len(keys)) as sample:
+            pipeline = redis_client.pipeline(transaction=False)
+            for key in keys:
+                pipeline.delete(key)
+            results = pipeline.execute(raise_on_error=False)
+            errors = {key: result for key, result in zip(keys, results) if isinstance(result, Exception)}
+            sample.errors = len(errors)
+        failed_keys.extend(report_delete(index_name, keys, errors))
+    return failed_keys
+
+
+def report_delete(index_name: str, keys: list[str], errors: dict[str, Exception]) -> list[str]:
+    """Log the outcome of a batch of deleted documents and return the keys that could not be deleted"""
+    for key, error in errors.items():
+        LOGGER.error(T("data_update_quest.core.redis_file_upload.delete_error").format(key=key, error=error))
+    LOGGER.info(
+        T("data_update_quest.core.redis_file_upload.deleted").format(index=index_name, count=len(keys) - len(errors))
+    )
+    return list(errors)
+
+
+def upload_journaled_batch(
+    journal: CheckpointJournal, unit: int, function, redis_client, index_name: str, batch: list
+) -> list[str]:
+    """
+    Upload a batch with one of the upload_files or upload_lines functions and record it in the checkpoint journal.
+
+    Batches with failed documents are not recorded, so a resumed run uploads them again.
+    """
+    failed_keys = function(redis_client, index_name, batch)
+    if not failed_keys:
+        last = batch[-1].name if isinstance(batch[-1], Path) else None
+        journal.record(index_name, unit, count=len(batch), last=last)
+    return failed_keys
+
+
+def file_upload(
+    file_path,
+    host,
+    port,
+    password,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int = DEFAULT_WORKERS,
+    resume: bool = False,
+    journal_path: Optional[Path] = None,
+    engine: str = SYNC_ENGINE,
+    incremental: bool = False,
+    validate: bool = False,
+) -> list[str]:
+    if engine not in ENGINES:
+        raise ValueError(f"Unsupported engine '{engine}', expected one of {', '.join(ENGINES)}.")
     path = Path(file_path)
     if not path.is_dir():
         raise ValueError(
             f"The provided file path '{file_path}' is not a directory. Please provide a valid directory path."
         )
+    # Only the documents changed since the previous dump are uploaded, and the deleted ones removed
+    delta = read_upload_delta(path) if incremental else None
 
-    indexes = {}
-    for index in path.iterdir():
-        indexes.setdefault(index, f"com.cosmotech.{index.name}.domain.{index.name.capitalize()}Idx")
+    if engine == ASYNC_ENGINE:
+        from cosmotech.data_update_quest.core.database.redis.async_client import file_upload_async
 
-    for index in indexes:
-        index_p = path / index
-        for json_file in index_p.glob("*.json"):
-            json_name = json_file.name.split(".")[0]
-            with json_file.open() as file:
-                redis_client.json().set(f"{indexes[index]}:{json_name}", ".", json.load(file))
-            LOGGER.info(
-                f'{T("data_update_quest.core.redis_file_upload.upload").format(index=index):<20} :    {json_name}'
+        return asyncio.run(
+            file_upload_async(
+                file_path,
+                host,
+                port,
+                password,
+                batch_size=batch_size,
+                workers=workers,
+                resume=resume,
+                journal_path=journal_path,
+                delta=delta,
+                validate=validate,
             )
+        )
+
+    redis_client = get_redis_client(host=host, port=port, password=password, max_connections=workers)
+
+    manifest = None if incremental else read_manifest(path)
+    journal = CheckpointJournal(
+        journal_path or path / UPLOAD_JOURNAL, "redis-file-upload", upload_settings(batch_size, delta), resume=resume
+    )
+
+    # Documents are only parsed and serialized again to validate them, they are sent as they are otherwise
+    files_function, lines_function = (upload_files, upload_lines) if validate else (upload_raw_files, upload_raw_lines)
+    failed_keys = []
+    with journal, ThreadPoolExecutor(max_workers=workers) as executor:
+        if manifest is None:
+            # Batches of every index are independent tasks sharing the connection pool of the client,
+            # files are sorted so batches are the same from one run to the next
+            futures = [
+                executor.submit(upload_journaled_batch, journal, unit, files_function, redis_client, index_name, batch)
+                for index_name, files in iter_index_files(path, delta)
+                for unit, batch in enumerate(batched(files, batch_size))
+                if not journal.is_done(index_name, unit)
+            ]
+            for future in futures:
+                failed_keys.extend(future.result())
+        else:
+            # Bundles are streamed, only a bounded number of batches is kept in flight
+            pending = deque()
+            for index in manifest["indexes"]:
+                for unit, lines in enumerate(batched(iter_bundle(path, index, manifest), batch_size)):
+                    if journal.is_done(index, unit):
+                        continue
+                    if len(pending) >= 2 * workers:
+                        failed_keys.extend(pending.popleft().result())
+                    pending.append(
+                        executor.submit(
+                            upload_journaled_batch, journal, unit, lines_function, redis_client, index, lines
+                        )
+                    )
+            while pending:
+                failed_keys.extend(pending.popleft().result())
+
+    for index_name, index_delta in sorted((delta or {}).items()):
+        failed_keys.extend(delete_documents(redis_client, index_name, index_delta["deleted"], batch_size))
+
+    return failed_keys
+
+
+def upload_settings(batch_size: int, delta: Optional[dict[str, dict[str, list[str]]]]) -> dict[str, Any]:
+    """Settings of the checkpoint journal of an upload, an incremental upload can only resume an incremental one"""
+    if delta is None:
+        return {"batch_size": batch_size}
+    return {"batch_size": batch_size, "incremental": True}
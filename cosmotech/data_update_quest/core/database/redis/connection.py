@@ -0,0 +1,159 @@
+# Copyright (C) - 2025 - Cosmo Tech
+# This document and all information contained herein is the exclusive property -
+# including all intellectual property rights pertaining thereto - of Cosmo Tech.
+# Any use, reproduction, translation, broadcasting, transmission, distribution,
+# etc., to any person is prohibited unless it has been previously and
+# specifically authorized by written means by Cosmo Tech.
+
+import threading
+from typing import Any
+from typing import Optional
+
+import redis
+
+# Connection settings of the redis clients, set once from the command line by configure_redis_client
+DEFAULT_CLIENT_OPTIONS = {
+    "unix_socket": None,
+    "max_connections": None,
+    "socket_timeout": None,
+    "socket_connect_timeout": None,
+    "socket_keepalive": False,
+    "retry_on_timeout": False,
+    "tls": False,
+    "tls_ca_cert": None,
+    "tls_cert": None,
+    "tls_key": None,
+    "tls_verify": True,
+}
+CLIENT_OPTIONS = dict(DEFAULT_CLIENT_OPTIONS)
+
+_POOLS: dict[tuple, redis.ConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def configure_redis_client(**options):
+    """
+    Set the connection settings used by every redis client created afterwards.
+
+    Args:
+        **options: Any of the keys of DEFAULT_CLIENT_OPTIONS, None values keep the default.
+    """
+    unknown = options.keys() - DEFAULT_CLIENT_OPTIONS.keys()
+    if unknown:
+        raise ValueError(f"Unknown redis client options: {', '.join(sorted(unknown))}.")
+    CLIENT_OPTIONS.update(
+        {key: DEFAULT_CLIENT_OPTIONS[key] if value is None else value for key, value in options.items()}
+    )
+
+
+def get_connection_kwargs(host, port, password, options: dict[str, Any]) -> tuple[type, dict[str, Any]]:
+    """
+    Build the connection class and arguments of a pool from the connection settings.
+
+    Args:
+        host: The redis host, ignored when connecting through a unix socket.
+        port: The redis port, ignored when connecting through a unix socket.
+        password: The redis password.
+        options (dict[str, Any]): The connection settings, as in DEFAULT_CLIENT_OPTIONS.
+
+    Returns:
+        tuple[type, dict[str, Any]]: The connection class and its arguments.
+    """
+    kwargs = {
+        "password": password,
+        "decode_responses": True,
+        "socket_timeout": options["socket_timeout"],
+        "retry_on_timeout": options["retry_on_timeout"],
+    }
+    if options["unix_socket"]:
+        if options["tls"]:
+            raise ValueError("TLS can not be used with a unix socket connection.")
+        # Connect timeout and keepalive only apply to TCP connections
+        return redis.UnixDomainSocketConnection, kwargs | {"path": options["unix_socket"]}
+
+    kwargs |= {
+        "host": host,
+        "port": port,
+        "socket_connect_timeout": options["socket_connect_timeout"],
+        "socket_keepalive": options["socket_keepalive"],
+    }
+    if not options["tls"]:
+        return redis.Connection, kwargs
+    return redis.SSLConnection, kwargs | {
+        "ssl_ca_certs": options["tls_ca_cert"],
+        "ssl_certfile": options["tls_cert"],
+        "ssl_keyfile": options["tls_key"],
+        "ssl_cert_reqs": "required" if options["tls_verify"] else "none",
+        "ssl_check_hostname": options["tls_verify"],
+    }
+
+
+def get_connection_pool(host, port, password, max_connections: Optional[int] = None) -> redis.ConnectionPool:
+    """
+    Get the connection pool of a redis server, shared by all the clients created with the same settings.
+
+    The configured maximum number of connections takes precedence over the one asked for by the caller.
+    A bounded pool blocks the threads asking for a connection until one is released, instead of failing,
+    so more workers than connections can share it.
+
+    Args:
+        host: The redis host.
+        port: The redis port.
+        password: The redis password.
+        max_connections (Optional[int]): The maximum number of connections of the pool, unbounded if None.
+
+    Returns:
+        redis.ConnectionPool: The pool of the server.
+    """
+    options = dict(CLIENT_OPTIONS)
+    max_connections = options.pop("max_connections") or max_connections
+    key = (host, port, password, max_connections, tuple(sorted(options.items())))
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            connection_class, kwargs = get_connection_kwargs(host, port, password, options)
+            if max_connections:
+                pool = redis.BlockingConnectionPool(
+                    max_connections=max_connections, timeout=None, connection_class=connection_class, **kwargs
+                )
+            else:
+                pool = redis.ConnectionPool(connection_class=connection_class, **kwargs)
+            _POOLS[key] = pool
+    return pool
+
+
+def get_async_connection_pool(host, port, password, max_connections: Optional[int] = None):
+    """
+    Create a connection pool for an asyncio client, with the same settings as get_connection_pool.
+
+    Pools of asyncio clients are bound to the event loop they are used in, so they are not shared.
+
+    Returns:
+        redis.asyncio.ConnectionPool: The pool of the server.
+    """
+    import redis.asyncio
+
+    async_connection_classes = {
+        redis.Connection: redis.asyncio.Connection,
+        redis.SSLConnection: redis.asyncio.SSLConnection,
+        redis.UnixDomainSocketConnection: redis.asyncio.UnixDomainSocketConnection,
+    }
+    options = dict(CLIENT_OPTIONS)
+    max_connections = options.pop("max_connections") or max_connections
+    connection_class, kwargs = get_connection_kwargs(host, port, password, options)
+    if max_connections:
+        return redis.asyncio.BlockingConnectionPool(
+            max_connections=max_connections,
+            timeout=None,
+            connection_class=async_connection_classes[connection_class],
+            **kwargs,
+        )
+    return redis.asyncio.ConnectionPool(connection_class=async_connection_classes[connection_class], **kwargs)
+
+
+def close_connection_pools():
+    """Close the connections of every shared pool"""
+    with _POOLS_LOCK:
+        for pool in _POOLS.values():
+            pool.disconnect()
+        _POOLS.clear()
@@ -0,0 +1,273 @@
+# Copyright (C) - 2025 - Cosmo Tech
+# This document and all information contained herein is the exclusive property -
+# including all intellectual property rights pertaining thereto - of Cosmo Tech.
+# Any use, reproduction, translation, broadcasting, transmission, distribution,
+# etc., to any person is prohibited unless it has been previously and
+# specifically authorized by written means by Cosmo Tech.
+
+import gzip
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Any
+from typing import Iterator
+from typing import Optional
+from typing import TextIO
+
+from cosmotech.data_update_quest.core import codec
+
+DIRECTORY_FORMAT = "directory"
+NDJSON_FORMAT = "ndjson"
+DUMP_FORMATS = (DIRECTORY_FORMAT, NDJSON_FORMAT)
+
+BUNDLE_EXTENSIONS = {"none": ".ndjson", "gzip": ".ndjson.gz", "zstd": ".ndjson.zst"}
+COMPRESSIONS = tuple(BUNDLE_EXTENSIONS)
+
+MANIFEST_FILE = "manifest.json"
+CONTENT_MANIFEST_FILE = "content-manifest.json"
+
+
+def open_stream(file_path: Path, mode: str, compression: str) -> TextIO:
+    """
+    Open a text stream on a bundle file, compressing or decompressing it on the fly.
+
+    Args:
+        file_path (Path): The bundle file to open.
+        mode (str): "r" to read the bundle, "w" to write it.
+        compression (str): One of "none", "gzip" or "zstd".
+
+    Returns:
+        TextIO: The opened text stream.
+    """
+    if compression == "none":
+        return open(file_path, mode=mode, encoding="utf-8")
+    if compression == "gzip":
+        return gzip.open(file_path, mode=mode + "t", encoding="utf-8")
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ValueError("The zstd compression requires the zstandard package to be installed.") from e
+        return zstandard.open(file_path, mode=mode + "t", encoding="utf-8")
+
+    raise ValueError(f"Unsupported compression '{compression}', expected one of {', '.join(COMPRESSIONS)}.")
+
+
+def to_line(content: str) -> str:
+    """Turn a JSON document into a single NDJSON line, re-encoding it only if it spans several lines"""
+    if "\n" in content:
+        content = codec.dumps(codec.loads(content))
+    return content + "\n"
+
+
+class DirectoryWriter:
+    """Write each document of an index to its own `<id>.json` file"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def write(self, documents: list[tuple[str, str]]):
+        for json_id, content in documents:
+            with open(file=self.path / (json_id + ".json"), mode="w") as file:
+                file.write(content)
+
+    def close(self) -> Optional[dict[str, Any]]:
+        return None
+
+
+class BundleWriter:
+    """
+    Write all the documents of an index as a single NDJSON stream.
+
+    Pages can be written concurrently by several workers, each page is written as a whole.
+    The number of documents and a sha256 checksum of the uncompressed stream are kept for the manifest.
+    """
+
+    def __init__(self, path: Path, index: str, compression: str):
+        path.mkdir(parents=True, exist_ok=True)
+        self.file_name = index + BUNDLE_EXTENSIONS[compression]
+        self.stream = open_stream(path / self.file_name, "w", compression)
+        self.checksum = hashlib.sha256()
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def write(self, documents: list[tuple[str, str]]):
+        lines = "".join(to_line(content) for _, content in documents)
+        with self.lock:
+            self.stream.write(lines)
+            self.checksum.update(lines.encode("utf-8"))
+            self.count += len(documents)
+
+    def close(self) -> dict[str, Any]:
+        self.stream.close()
+        return {"file": self.file_name, "count": self.count, "sha256": self.checksum.hexdigest()}
+
+
+def write_manifest(path: Path, compression: str, indexes: dict[str, dict[str, Any]]):
+    """
+    Write the manifest describing the bundles of a dump.
+
+    Args:
+        path (Path): The dump directory.
+        compression (str): The compression used for the bundles.
+        indexes (dict[str, dict[str, Any]]): The file, document count and checksum of each index bundle.
+    """
+    manifest = {"format": NDJSON_FORMAT, "compression": compression, "indexes": indexes}
+    with open(path / MANIFEST_FILE, "w") as file:
+        json.dump(manifest, file, indent=2)
+
+
+def read_manifest(path: Path) -> Optional[dict[str, Any]]:
+    """
+    Read the manifest of a bundle dump.
+
+    Args:
+        path (Path): The dump directory.
+
+    Returns:
+        Optional[dict[str, Any]]: The manifest, or None if the directory uses the directory-per-document layout.
+    """
+    manifest_path = path / MANIFEST_FILE
+    if not manifest_path.is_file():
+        return None
+
+    with open(manifest_path) as file:
+        manifest = json.load(file)
+    if manifest.get("format") != NDJSON_FORMAT:
+        return None
+    return manifest
+
+
+def iter_bundle(path: Path, index: str, manifest: dict[str, Any]) -> Iterator[str]:
+    """
+    Stream the documents of an index bundle, one JSON line at a time.
+
+    The document count and checksum are checked against the manifest once the stream is exhausted.
+
+    Args:
+        path (Path): The dump directory.
+        index (str): The name of the index to read.
+        manifest (dict[str, Any]): The manifest of the dump.
+
+    Yields:
+        str: The JSON content of each document.
+    """
+    entry = manifest["indexes"][index]
+    checksum = hashlib.sha256()
+    count = 0
+    with open_stream(path / entry["file"], "r", manifest["compression"]) as stream:
+        for line in stream:
+            checksum.update(line.encode("utf-8"))
+            if line.strip():
+                count += 1
+                yield line
+
+    if count != entry["count"]:
+        raise ValueError(f"The bundle '{entry['file']}' holds {count} documents, {entry['count']} were expected.")
+    if checksum.hexdigest() != entry["sha256"]:
+        raise ValueError(f"The bundle '{entry['file']}' does not match the checksum of its manifest.")
+
+
+def content_hash(content: str) -> str:
+    """Hash the JSON content of a document as returned by redis, which serializes a document the same way every time"""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def read_content_manifest(path: Path) -> Optional[dict[str, Any]]:
+    """
+    Read the content manifest of a directory dump.
+
+    Args:
+        path (Path): The dump directory.
+
+    Returns:
+        Optional[dict[str, Any]]: The manifest, or None if the dump does not have one.
+    """
+    manifest_path = path / CONTENT_MANIFEST_FILE
+    if not manifest_path.is_file():
+        return None
+
+    with open(manifest_path) as file:
+        return json.load(file)
+
+
+class ContentManifest:
+    """
+    Content hashes of the documents of a directory dump, kept in its content manifest.
+
+    The hashes of the previous dump of the directory tell which documents are new or changed, so an
+    incremental dump only rewrites those, and which were deleted from redis since, so their files are removed.
+    The manifest also records this delta, for an incremental upload to only restore what changed.
+    """
+
+    def __init__(self, path: Path, incremental: bool):
+        previous = read_content_manifest(path)
+        self.path = path
+        self.incremental = incremental
+        self.previous: dict[str, dict[str, str]] = previous["indexes"] if previous else {}
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.changed: dict[str, list[str]] = {}
+        self.lock = threading.Lock()
+
+    def writer(self, index: str, writer: "DirectoryWriter") -> "ContentManifestWriter":
+        with self.lock:
+            self.hashes.setdefault(index, {})
+            self.changed.setdefault(index, [])
+        return ContentManifestWriter(self, index, writer)
+
+    def record(self, index: str, documents: list[tuple[str, str]]) -> list[tuple[str, str]]:
+        """
+        Record the hashes of a page of documents of an index.
+
+        Returns:
+            list[tuple[str, str]]: The documents to write, only the new or changed ones for an incremental dump.
+        """
+        previous = self.previous.get(index, {})
+        hashes = {json_id: content_hash(content) for json_id, content in documents}
+        changed = [json_id for json_id, digest in hashes.items() if previous.get(json_id) != digest]
+        with self.lock:
+            self.hashes[index].update(hashes)
+            self.changed[index].extend(changed)
+
+        if not self.incremental:
+            return documents
+        changed = set(changed)
+        return [(json_id, content) for json_id, content in documents if json_id in changed]
+
+    def close(self) -> dict[str, dict[str, list[str]]]:
+        """
+        Remove the files of the deleted documents and write the content manifest.
+
+        Indexes absent from this dump keep their previous hashes, and are left out of the delta.
+
+        Returns:
+            dict[str, dict[str, list[str]]]: The ids of the changed and deleted documents of each dumped index.
+        """
+        delta = {}
+        for index, hashes in self.hashes.items():
+            deleted = sorted(self.previous.get(index, {}).keys() - hashes.keys())
+            for json_id in deleted:
+                (self.path / index / (json_id + ".json")).unlink(missing_ok=True)
+            delta[index] = {"changed": sorted(self.changed[index]), "deleted": deleted}
+
+        manifest = {"algorithm": "sha256", "indexes": self.previous | self.hashes, "delta": delta}
+        with open(self.path / CONTENT_MANIFEST_FILE, "w") as file:
+            json.dump(manifest, file, indent=2)
+        return delta
+
+
+class ContentManifestWriter:
+    """Writer of an index recording the hashes of its documents, and skipping the unchanged ones if incremental"""
+
+    def __init__(self, manifest: ContentManifest, index: str, writer: DirectoryWriter):
+        self.manifest = manifest
+        self.index = index
+        self.writer = writer
+
+    def write(self, documents: list[tuple[str, str]]):
+        self.writer.write(self.manifest.record(self.index, documents))
+
+    def close(self) -> Optional[dict[str, Any]]:
+        return self.writer.close()
@@ -0,0 +1,240 @@
+# Copyright (C) - 2025 - Cosmo Tech
+# This document and all information contained herein is the exclusive property -
+# including all intellectual property rights pertaining thereto - of Cosmo Tech.
+# Any use, reproduction, translation, broadcasting, transmission, distribution,
+# etc., to any person is prohibited unless it has been previously and
+# specifically authorized by written means by Cosmo Tech.
+
+import hashlib
+import time
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+from typing import Iterator
+from typing import Optional
+
+from redis.exceptions import ResponseError
+
+from cosmotech.orchestrator.utils.translate import T
+
+from cosmotech.data_update_quest.core import codec
+from cosmotech.data_update_quest.core.database.redis.client import DEFAULT_BATCH_SIZE
+from cosmotech.data_update_quest.core.database.redis.client import DEFAULT_PAGE_SIZE
+from cosmotech.data_update_quest.core.database.redis.client import DEFAULT_WORKERS
+from cosmotech.data_update_quest.core.database.redis.client import batched
+from cosmotech.data_update_quest.core.database.redis.client import get_index_key
+from cosmotech.data_update_quest.core.database.redis.client import get_redis_client
+from cosmotech.data_update_quest.core.database.redis.client import iter_index_files
+from cosmotech.data_update_quest.core.database.redis.client import list_index_keys
+from cosmotech.data_update_quest.core.database.redis.client import parse_lines
+from cosmotech.data_update_quest.core.database.redis.client import read_files
+from cosmotech.data_update_quest.core.database.redis.storage import iter_bundle
+from cosmotech.data_update_quest.core.database.redis.storage import read_manifest
+from cosmotech.data_update_quest.core.metrics import FETCH
+from cosmotech.data_update_quest.core.metrics import METRICS
+from cosmotech.data_update_quest.core.metrics import TRANSFORM
+from cosmotech.data_update_quest.core.migration.apply_template import get_chain_program
+from cosmotech.data_update_quest_cli.utils.logger import LOGGER
+
+# Kinds of mismatches between a dump and redis
+MISSING = "missing"
+EXTRA = "extra"
+DIFFERENT = "different"
+INVALID = "invalid"
+MISMATCHES = (MISSING, EXTRA, DIFFERENT, INVALID)
+
+
+def canonical_hash(data: Any) -> str:
+    """
+    Hash a JSON document in canonical form, with sorted keys and no whitespace.
+
+    Two documents holding the same values get the same hash whatever the order of their keys
+    and the way they were serialized.
+    """
+    return hashlib.sha256(codec.dumps_bytes(data, sort_keys=True)).hexdigest()
+
+
+def verify_batch(redis_client, program, index_name: str, batch: list) -> dict[str, list[str]]:
+    """
+    Compare a batch of dumped documents with their counterpart in redis, fetched with a single JSON.MGET.
+
+    Args:
+        redis_client: The redis client to use.
+        program: The compiled jq template giving the expected documents from the dumped ones, or None.
+        index_name (str): The short name of the index.
+        batch (list): The json files of an index directory, or the NDJSON lines of an index bundle.
+
+    Returns:
+        dict[str, list[str]]: The keys of the batch, and the keys of each kind of mismatch.
+    """
+    if isinstance(batch[0], Path):
+        documents, errors = read_files(index_name, batch)
+    else:
+        documents, errors = parse_lines(index_name, batch)
+
+    if program is None:
+        expected = {key: canonical_hash(data) for key, data in documents.items()}
+    else:
+        expected = {}
+        with METRICS.measure(TRANSFORM, index_name, items=len(documents)) as sample:
+            for key, data in documents.items():
+                try:
+                    expected[key] = canonical_hash(program.input(data).first())
+                except Exception as e:
+                    errors[key] = e
+            sample.errors = len(documents) - len(expected)
+
+    keys = list(expected)
+    with METRICS.measure(FETCH, index_name, items=len(keys)):
+        actual = redis_client.json().mget(keys, ".") if keys else []
+
+    result = {"keys": [*documents, *errors.keys() - documents.keys()], MISSING: [], DIFFERENT: [], INVALID: []}
+    for key, data in zip(keys, actual):
+        if data is None:
+            result[MISSING].append(key)
+        elif canonical_hash(data) != expected[key]:
+            result[DIFFERENT].append(key)
+    for key, error in errors.items():
+        LOGGER.error(T("data_update_quest.core.redis_verify.invalid").format(key=key, error=error))
+        result[INVALID].append(key)
+
+    return result
+
+
+def list_redis_keys(redis_client, index_name: str) -> list[str]:
+    """List the keys of an index with list_index_keys, an index that does not exist in redis having none"""
+    try:
+        return list_index_keys(redis_client, get_index_key(index_name), DEFAULT_PAGE_SIZE)
+    except ResponseError as e:
+        LOGGER.warning(T("data_update_quest.core.redis_verify.unknown_index").format(index=index_name, error=e))
+        return []
+
+
+def iter_dump_batches(path: Path, index_list: Optional[list[str]], batch_size: int) -> Iterator[tuple[str, list]]:
+    """
+    Split the documents of a dump into batches, reading the bundles of an NDJSON dump as a stream.
+
+    Args:
+        path (Path): The dump directory.
+        index_list (Optional[list[str]]): The indexes to read, all the indexes of the dump if empty.
+        batch_size (int): The number of documents per batch.
+
+    Yields:
+        tuple[str, list]: The name of the index and the files or lines of each batch.
+    """
+    manifest = read_manifest(path)
+    if manifest is None:
+        for index_name, files in iter_index_files(path):
+            if not index_list or index_name in index_list:
+                for batch in batched(files, batch_size):
+                    yield index_name, batch
+        return
+
+    for index_name in manifest["indexes"]:
+        if not index_list or index_name in index_list:
+            for lines in batched(iter_bundle(path, index_name, manifest), batch_size):
+                yield index_name, lines
+
+
+def redis_verify(
+    file_path,
+    host,
+    port,
+    password,
+    index_list: Optional[list[str]] = None,
+    template_files: Optional[list[Path]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int = DEFAULT_WORKERS,
+) -> dict[str, Any]:
+    """
+    Check that redis holds the documents of a dump, or the documents a template turns them into.
+
+    Documents are compared by the hash of their canonical form, fetched in batches with JSON.MGET.
+    Batches of every index are independent tasks shared by the workers, then the keys of each index
+    are listed to find the documents of redis that are not in the dump.
+
+    Args:
+        file_path: The dump directory, in the directory or NDJSON format.
+        host: The redis host.
+        port: The redis port.
+        password: The redis password.
+        index_list (Optional[list[str]]): The indexes to check, all the indexes of the dump if empty.
+        template_files (Optional[list[Path]]): Templates applied in order to the dumped documents
+            to get the expected ones, the dumped documents are expected as they are if empty.
+        batch_size (int): The number of documents compared per request.
+        workers (int): The number of batches compared concurrently.
+
+    Returns:
+        dict[str, Any]: The number of documents checked, the keys of each kind of mismatch, and the duration.
+    """
+    path = Path(file_path)
+    if not path.is_dir():
+        raise ValueError(
+            f"The provided file path '{file_path}' is not a directory. Please provide a valid directory path."
+        )
+    if batch_size < 1:
+        raise ValueError(f"The batch size must be a positive integer, got {batch_size}.")
+    program = get_chain_program(list(template_files)) if template_files else None
+    index_list = [index_name.lower() for index_name in index_list or []]
+
+    redis_client = get_redis_client(host=host, port=port, password=password, max_connections=workers)
+
+    start = time.perf_counter()
+    indexes: dict[str, dict[str, Any]] = {}
+
+    def collect(index_name: str, future: Future):
+        result = future.result()
+        index = indexes.setdefault(index_name, {"keys": set(), MISSING: [], DIFFERENT: [], INVALID: []})
+        index["keys"].update(result.pop("keys"))
+        for kind, keys in result.items():
+            index[kind].extend(keys)
+
+    # Batches are streamed, only a bounded number of them is kept in flight
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for index_name, batch in iter_dump_batches(path, index_list, batch_size):
+            if len(pending) >= 2 * workers:
+                collect(*pending.popleft())
+            pending.append((index_name, executor.submit(verify_batch, redis_client, program, index_name, batch)))
+        while pending:
+            collect(*pending.popleft())
+
+        # Indexes asked for but missing from the dump only hold extra documents
+        for index_name in index_list:
+            indexes.setdefault(index_name, {"keys": set(), MISSING: [], DIFFERENT: [], INVALID: []})
+        listings = {index_name: executor.submit(list_redis_keys, redis_client, index_name) for index_name in indexes}
+
+    report = {"documents": 0, "indexes": {}}
+    for index_name, index in sorted(indexes.items()):
+        redis_keys = listings[index_name].result()
+        summary = {
+            "documents": len(index["keys"]),
+            MISSING: sorted(index[MISSING]),
+            EXTRA: sorted(set(redis_keys) - index["keys"]),
+            DIFFERENT: sorted(index[DIFFERENT]),
+            INVALID: sorted(index[INVALID]),
+        }
+        report["indexes"][index_name] = summary
+        report["documents"] += summary["documents"]
+
+        for kind in (MISSING, EXTRA, DIFFERENT):
+            for key in summary[kind]:
+                LOGGER.warning(T(f"data_update_quest.core.redis_verify.{kind}").format(key=key))
+        LOGGER.info(
+            T("data_update_quest.core.redis_verify.index_done").format(
+                index=index_name,
+                documents=summary["documents"],
+                **{kind: len(summary[kind]) for kind in MISMATCHES},
+            )
+        )
+
+    report["mismatches"] = sum(len(summary[kind]) for summary in report["indexes"].values() for kind in MISMATCHES)
+    report["duration"] = time.perf_counter() - start
+    LOGGER.info(
+        T("data_update_quest.core.redis_verify.done").format(
+            count=report["documents"], mismatches=report["mismatches"], duration=report["duration"]
+        )
+    )
+    return report
@@ -0,0 +1,329 @@
+# Copyright (C) - 2025 - Cosmo Tech
+# This document and all information contained herein is the exclusive property -
+# including all intellectual property rights pertaining thereto - of Cosmo Tech.
+# Any use, reproduction, translation, broadcasting, transmission, distribution,
+# etc., to any person is prohibited unless it has been previously and
+# specifically authorized by written means by Cosmo Tech.
+
+import json
+import os
+import pathlib
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from typing import Any
+from typing import Callable
+from typing import Optional
+
+# Stages of the processing of a document, from its source to its destination
+FETCH = "fetch"
+DECODE = "decode"
+TRANSFORM = "transform"
+ENCODE = "encode"
+WRITE = "write"
+STAGES = (FETCH, DECODE, TRANSFORM, ENCODE, WRITE)
+
+# Index label of the measures of documents that do not belong to a known index
+UNKNOWN_INDEX = "unknown"
+
+# Upper bounds in seconds of the latency histogram buckets, the last bucket holding everything above
+LATENCY_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+JSON_FORMAT = "json"
+PROMETHEUS_FORMAT = "prometheus"
+METRICS_FORMATS = (JSON_FORMAT, PROMETHEUS_FORMAT)
+
+PROMETHEUS_PREFIX = "csm_duq"
+
+
+class StageMetrics:
+    """Counters and latency histogram of a stage of an index"""
+
+    __slots__ = ("calls", "items", "errors", "bytes", "seconds", "max", "buckets")
+
+    def __init__(self):
+        self.calls = 0
+        self.items = 0
+        self.errors = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def observe(self, seconds: float, items: int, nbytes: int, errors: int):
+        self.calls += 1
+        self.items += items
+        self.errors += errors
+        self.bytes += nbytes
+        self.seconds += seconds
+        self.max = max(self.max, seconds)
+        self.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def merge(self, other: "StageMetrics"):
+        self.calls += other.calls
+        self.items += other.items
+        self.errors += other.errors
+        self.bytes += other.bytes
+        self.seconds += other.seconds
+        self.max = max(self.max, other.max)
+        self.buckets = [count + other_count for count, other_count in zip(self.buckets, other.buckets)]
+
+    def quantile(self, rank: float) -> float:
+        """Estimate a latency quantile as the upper bound of the bucket holding it, the maximum for the last one"""
+        if not self.calls:
+            return 0.0
+        target = rank * self.calls
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.buckets):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "items": self.items,
+            "errors": self.errors,
+            "bytes": self.bytes,
+            "seconds": self.seconds,
+            "latency": {
+                "mean": self.seconds / self.calls if self.calls else 0.0,
+                "p50": self.quantile(0.5),
+                "p90": self.quantile(0.9),
+                "p99": self.quantile(0.99),
+                "max": self.max,
+                "buckets": dict(zip([*map(str, LATENCY_BUCKETS), "+Inf"], self.buckets)),
+            },
+        }
+
+
+class Sample:
+    """Measure of a single call of a stage, filled in by the caller while the stage runs"""
+
+    __slots__ = ("items", "bytes", "errors")
+
+    def __init__(self, items: int, nbytes: int):
+        self.items = items
+        self.bytes = nbytes
+        self.errors = 0
+
+
+class Measure:
+    """Timed call of a stage, recorded in its registry when it exits"""
+
+    __slots__ = ("registry", "stage", "index", "sample", "start")
+
+    def __init__(self, registry: "MetricsRegistry", stage: str, index: Optional[str], sample: Sample):
+        self.registry = registry
+        self.stage = stage
+        self.index = index
+        self.sample = sample
+
+    def __enter__(self) -> Sample:
+        self.start = time.perf_counter()
+        return self.sample
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        sample = self.sample
+        # A call raising an exception is recorded with all its documents as errors
+        if exc_type is not None and issubclass(exc_type, Exception):
+            sample.errors = max(sample.items, 1)
+        self.registry.observe(
+            self.stage, self.index, time.perf_counter() - self.start, sample.items, sample.bytes, sample.errors
+        )
+        return False
+
+
+class UntimedMeasure:
+    """Call of a stage of a disabled registry, neither timed nor recorded"""
+
+    __slots__ = ("sample",)
+
+    def __init__(self, sample: Sample):
+        self.sample = sample
+
+    def __enter__(self) -> Sample:
+        return self.sample
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        return False
+
+
+class MetricsRegistry:
+    """
+    Thread-safe registry of the metrics of a run, per stage and per index.
+
+    Each measure is one call of a stage, usually over a page or a batch of documents: it counts the call
+    and its duration in the latency histogram, and adds the documents, bytes and errors it handled.
+    A disabled registry records nothing, its measures costing neither a clock read nor a lock.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self._metrics: dict[tuple[str, str], StageMetrics] = {}
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.enabled = enabled
+
+    def observe(
+        self, stage: str, index: Optional[str], seconds: float, items: int = 1, nbytes: int = 0, errors: int = 0
+    ):
+        """
+        Record a call of a stage.
+
+        Args:
+            stage (str): The stage, one of STAGES.
+            index (Optional[str]): The short name of the index of the documents.
+            seconds (float): The duration of the call.
+            items (int): The number of documents handled by the call.
+            nbytes (int): The number of bytes read or written by the call.
+            errors (int): The number of documents the call failed on.
+        """
+        key = (stage, index or UNKNOWN_INDEX)
+        with self._lock:
+            metrics = self._metrics.get(key)
+            if metrics is None:
+                metrics = self._metrics[key] = StageMetrics()
+            metrics.observe(seconds, items, nbytes, errors)
+
+    def measure(self, stage: str, index: Optional[str], items: int = 1, nbytes: int = 0) -> Measure:
+        """
+        Time a call of a stage, the sample returned on entry can be updated with the documents and bytes it handled.
+
+        A call raising an exception is recorded with all its documents as errors.
+        """
+        if not self.enabled:
+            return UntimedMeasure(Sample(items, nbytes))
+        return Measure(self, stage, index, Sample(items, nbytes))
+
+    def reset(self):
+        with self._lock:
+            self._metrics.clear()
+            self.started = time.time()
+
+    def snapshot(self) -> dict[tuple[str, str], StageMetrics]:
+        """Copy the current metrics, to send the metrics of a worker process to its parent"""
+        with self._lock:
+            snapshot = {}
+            for key, metrics in self._metrics.items():
+                snapshot[key] = StageMetrics()
+                snapshot[key].merge(metrics)
+            return snapshot
+
+    def merge(self, snapshot: dict[tuple[str, str], StageMetrics]):
+        """Add the metrics of a snapshot taken in another registry"""
+        with self._lock:
+            for key, metrics in snapshot.items():
+                self._metrics.setdefault(key, StageMetrics()).merge(metrics)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Summarize the metrics.
+
+        Returns:
+            dict[str, Any]: The duration of the run and the metrics of each stage and index, by stage.
+        """
+        with self._lock:
+            stages = {}
+            for (stage, index), metrics in sorted(self._metrics.items(), key=lambda item: _stage_order(item[0])):
+                stages.setdefault(stage, {})[index] = metrics.to_dict()
+        return {"duration": time.time() - self.started, "stages": stages}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """Export the metrics in the Prometheus text exposition format, as read by the node exporter textfile collector"""
+        with self._lock:
+            items = sorted(self._metrics.items(), key=lambda item: _stage_order(item[0]))
+
+        lines = []
+
+        def add_counter(name: str, description: str, value: Callable[[StageMetrics], float]):
+            lines.append(f"# HELP {PROMETHEUS_PREFIX}_{name} {description}")
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{name} counter")
+            for (stage, index), metrics in items:
+                lines.append(f"{PROMETHEUS_PREFIX}_{name}{{{_labels(stage, index)}}} {value(metrics)}")
+
+        add_counter("stage_documents_total", "Documents handled per stage and index.", lambda m: m.items)
+        add_counter("stage_errors_total", "Documents that failed per stage and index.", lambda m: m.errors)
+        add_counter("stage_bytes_total", "Bytes read or written per stage and index.", lambda m: m.bytes)
+
+        name = f"{PROMETHEUS_PREFIX}_stage_duration_seconds"
+        lines.append(f"# HELP {name} Latency of the calls of each stage and index.")
+        lines.append(f"# TYPE {name} histogram")
+        for (stage, index), metrics in items:
+            labels = _labels(stage, index)
+            cumulative = 0
+            for bound, count in zip([*map(str, LATENCY_BUCKETS), "+Inf"], metrics.buckets):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{name}_sum{{{labels}}} {metrics.seconds}")
+            lines.append(f"{name}_count{{{labels}}} {metrics.calls}")
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: pathlib.Path, metrics_format: str = JSON_FORMAT):
+        """
+        Write the metrics to a file, replacing it atomically so a collector never reads a partial file.
+
+        Args:
+            path (pathlib.Path): The file to write.
+            metrics_format (str): One of METRICS_FORMATS.
+        """
+        if metrics_format not in METRICS_FORMATS:
+            raise ValueError(
+                f"Unsupported metrics format '{metrics_format}', expected one of {', '.join(METRICS_FORMATS)}."
+            )
+        content = self.to_prometheus() if metrics_format == PROMETHEUS_FORMAT else self.to_json()
+
+        path = pathlib.Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=path.parent, suffix=".tmp", delete=False) as file:
+            file.write(content)
+        os.replace(file.name, path)
+
+
+def _stage_order(key: tuple[str, str]) -> tuple[int, str]:
+    stage, index = key
+    return (STAGES.index(stage) if stage in STAGES else len(STAGES), index)
+
+
+def _labels(stage: str, index: str) -> str:
+    index = index.replace("\\", "\\\\").replace('"', '\\"')
+    return f'stage="{stage}",index="{index}"'
+
+
+def run_with_metrics(enabled: bool, function: Callable, *args) -> tuple[Any, dict[tuple[str, str], StageMetrics]]:
+    """
+    Run a function in a worker process and return its result with the metrics it recorded.
+
+    The registry of the worker is reset first, as a forked worker starts with a copy of the registry of its parent,
+    and enabled like the registry of the parent.
+    """
+    METRICS.reset()
+    METRICS.enabled = enabled
+    result = function(*args)
+    return result, METRICS.snapshot()
+
+
+# Registry of the current process, shared by all the commands and only enabled when metrics are written
+METRICS = MetricsRegistry(enabled=False)
@@ -0,0 +1,256 @@
+# Copyright (C) - 2025 - Cosmo Tech
+# This document and all information contained herein is the exclusive property -
+# including all intellectual property rights pertaining thereto - of Cosmo Tech.
+# Any use, reproduction, translation, broadcasting, transmission, distribution,
+# etc., to any person is prohibited unless it has been previously and
+# specifically authorized by written means by Cosmo Tech.
+
+import hashlib
+import os
+import pathlib
+import time
+from collections import deque
+from concurrent.futures import Executor
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import Union
+
+from cosmotech.data_update_quest.core import codec
+from cosmotech.data_update_quest.core.checkpoint import CheckpointJournal
+from cosmotech.data_update_quest.core.database.redis.client import batched
+from cosmotech.data_update_quest.core.database.redis.storage import CONTENT_MANIFEST_FILE
+from cosmotech.data_update_quest.core.database.redis.storage import MANIFEST_FILE
+from cosmotech.data_update_quest.core.database.redis.storage import open_stream
+from cosmotech.data_update_quest.core.metrics import DECODE
+from cosmotech.data_update_quest.core.metrics import ENCODE
+from cosmotech.data_update_quest.core.metrics import FETCH
+from cosmotech.data_update_quest.core.metrics import METRICS
+from cosmotech.data_update_quest.core.metrics import TRANSFORM
+from cosmotech.data_update_quest.core.metrics import WRITE
+from cosmotech.data_update_quest.core.metrics import run_with_metrics
+from cosmotech.data_update_quest.core.migration.apply_template import TEMPLATE_CACHE
+from cosmotech.data_update_quest.core.migration.apply_template import apply_template
+from cosmotech.data_update_quest.core.migration.apply_template import read_template_chain
+
+DEFAULT_CHUNK_SIZE = 200
+
+APPLY_JOURNAL = ".duq-apply-checkpoint.jsonl"
+
+NDJSON_SUFFIXES = {".ndjson": "none", ".jsonl": "none", ".gz": "gzip", ".zst": "zstd"}
+
+
+def get_stream_compression(file_path: pathlib.Path) -> Optional[str]:
+    """
+    Get the compression of an NDJSON stream from its file name.
+
+    Args:
+        file_path (pathlib.Path): The NDJSON file.
+
+    Returns:
+        Optional[str]: One of "none", "gzip" or "zstd", None if the file is not an NDJSON stream.
+    """
+    return NDJSON_SUFFIXES.get(pathlib.Path(file_path).suffix)
+
+
+def apply_template_to_files(template: str, files: list[tuple[str, str]]) -> list[tuple[str, Optional[str]]]:
+    """
+    Apply a JQ template to a chunk of JSON files, writing each result to its own output file.
+
+    Args:
+        template (str): The JQ template to apply.
+        files (list[tuple[str, str]]): The input and output path of each file of the chunk.
+
+    Returns:
+        list[tuple[str, Optional[str]]]: The input path of each file with its error message, None on success.
+    """
+    results = []
+    for input_file, output_file in files:
+        # Files of a dump are stored in the directory of their index
+        index_name = os.path.basename(os.path.dirname(input_file))
+        try:
+            with METRICS.measure(FETCH, index_name) as sample:
+                with open(input_file, "r", encoding="utf-8") as infile:
+                    data = infile.read()
+                sample.bytes = len(data)
+            transformed_data = apply_template(template, data, index_name)
+            with METRICS.measure(WRITE, index_name, nbytes=len(transformed_data)):
+                os.makedirs(os.path.dirname(output_file), exist_ok=True)
+                with open(output_file, "w", encoding="utf-8") as outfile:
+                    outfile.write(transformed_data)
+            results.append((input_file, None))
+        except Exception as e:
+            results.append((input_file, str(e)))
+    return results
+
+
+def apply_template_to_lines(
+    template: str, lines: list[tuple[int, str]], index_name: Optional[str] = None
+) -> list[tuple[int, Optional[str], Optional[str]]]:
+    """
+    Apply a JQ template to a chunk of NDJSON lines.
+
+    Args:
+        template (str): The JQ template to apply.
+        lines (list[tuple[int, str]]): The line number and content of each line of the chunk.
+        index_name (Optional[str]): The index of the documents of the stream, used for the metrics.
+
+    Returns:
+        list[tuple[int, Optional[str], Optional[str]]]: The line number of each line with either
+            its transformed content or its error message.
+    """
+    program = TEMPLATE_CACHE.get_program(template)
+    results = []
+    for line_number, line in lines:
+        try:
+            with METRICS.measure(DECODE, index_name, nbytes=len(line)):
+                data = codec.loads(line)
+            with METRICS.measure(TRANSFORM, index_name):
+                result = program.input(data).first()
+            with METRICS.measure(ENCODE, index_name) as sample:
+                content = codec.dumps(result)
+                sample.bytes = len(content)
+            results.append((line_number, content, None))
+        except Exception as e:
+            results.append((line_number, None, str(e)))
+    return results
+
+
+def iter_bounded(executor: Executor, function: Callable, chunks: Iterable, max_pending: int) -> Iterator[Any]:
+    """
+    Map a function over chunks on an executor, yielding results in order with a bounded number of chunks in flight.
+
+    Unlike Executor.map, chunks are only consumed as results are yielded, so streams of any size
+    can be processed with flat memory. The executor must be a process pool, the metrics recorded by
+    the workers being sent back with the results.
+    """
+    pending: deque[Future] = deque()
+    for chunk in chunks:
+        if len(pending) >= max_pending:
+            yield collect_metrics(pending.popleft())
+        pending.append(executor.submit(run_with_metrics, METRICS.enabled, function, *chunk))
+    while pending:
+        yield collect_metrics(pending.popleft())
+
+
+def collect_metrics(future: Future) -> Any:
+    """Get the result of a chunk run with run_with_metrics, adding the metrics of its worker to the registry"""
+    result, metrics = future.result()
+    METRICS.merge(metrics)
+    return result
+
+
+def apply_template_batch(
+    template_file: Union[pathlib.Path, list[pathlib.Path]],
+    input_path: pathlib.Path,
+    output_path: pathlib.Path,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    resume: bool = False,
+    journal_path: Optional[pathlib.Path] = None,
+) -> dict[str, Any]:
+    """
+    Apply a JQ template to every document of a directory or of an NDJSON stream on a process pool.
+
+    A directory input is mirrored into the output directory, every `*.json` file being transformed
+    into the file with the same relative path, except the manifests at the root of a dump.
+    An NDJSON input (`.ndjson`, `.jsonl`, optionally compressed as `.gz` or `.zst`) is transformed
+    into an NDJSON output stream, keeping the line order.
+    Documents are dispatched to the workers in chunks of `chunk_size`.
+
+    Args:
+        template_file (Union[pathlib.Path, list[pathlib.Path]]): The path to the file containing the JQ template,
+            or an ordered list of template files applied as a single fused chain.
+        input_path (pathlib.Path): The input directory or NDJSON file.
+        output_path (pathlib.Path): The output directory or NDJSON file.
+        workers (Optional[int]): The number of worker processes, the number of CPUs if None.
+        chunk_size (int): The number of documents sent to a worker at once.
+        resume (bool): If True, the chunks recorded in the checkpoint journal by a previous run are skipped.
+            Only directory inputs are journaled and can be resumed, chunks holding a failed document are not recorded.
+        journal_path (Optional[pathlib.Path]): The checkpoint journal, stored in the output directory by default.
+
+    Returns:
+        dict[str, Any]: The number of transformed documents, the failures with their source and error message,
+            and the duration of the run.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"The chunk size must be a positive integer, got {chunk_size}.")
+
+    template_files = [template_file] if isinstance(template_file, (str, pathlib.PurePath)) else list(template_file)
+    input_path = pathlib.Path(input_path)
+    output_path = pathlib.Path(output_path)
+    template = read_template_chain(template_files)
+    # Compile once in the parent process so an invalid template fails before any work is dispatched
+    TEMPLATE_CACHE.get_program(template)
+
+    workers = workers or os.cpu_count() or 1
+    summary = {"succeeded": 0, "failed": [], "duration": 0.0}
+    start = time.perf_counter()
+
+    if resume and not input_path.is_dir():
+        raise ValueError("Only directory inputs can be resumed.")
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        if input_path.is_dir():
+            journal = CheckpointJournal(
+                journal_path or output_path / APPLY_JOURNAL,
+                "apply-template",
+                {"chunk_size": chunk_size, "template": hashlib.sha256(template.encode()).hexdigest()},
+                resume=resume,
+            )
+            # Files are sorted so chunks are the same from one run to the next, the manifests at the root
+            # of a dump are not documents
+            files = (
+                (str(input_file), str(output_path / input_file.relative_to(input_path)))
+                for input_file in sorted(input_path.rglob("*.json"))
+                if input_file.parent != input_path or input_file.name not in (MANIFEST_FILE, CONTENT_MANIFEST_FILE)
+            )
+            units = deque()
+
+            def iter_remaining_chunks():
+                for unit, chunk in enumerate(batched(files, chunk_size)):
+                    if not journal.is_done(input_path.name, unit):
+                        units.append(unit)
+                        yield template, chunk
+
+            with journal:
+                for results in iter_bounded(executor, apply_template_to_files, iter_remaining_chunks(), 2 * workers):
+                    failed = [(source, error) for source, error in results if error is not None]
+                    summary["succeeded"] += len(results) - len(failed)
+                    summary["failed"].extend({"source": source, "error": error} for source, error in failed)
+                    unit = units.popleft()
+                    # Chunks with failed documents are not recorded, so a resumed run applies them again
+                    if not failed:
+                        journal.record(input_path.name, unit, count=len(results), last=results[-1][0])
+
+        elif (compression := get_stream_compression(input_path)) is not None:
+            output_compression = get_stream_compression(output_path) or "none"
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            with (
+                open_stream(input_path, "r", compression) as input_stream,
+                open_stream(output_path, "w", output_compression) as output_stream,
+            ):
+                lines = ((number, line) for number, line in enumerate(input_stream, start=1) if line.strip())
+                index_name = input_path.name.split(".")[0]
+                chunks = ((template, chunk, index_name) for chunk in batched(lines, chunk_size))
+                for results in iter_bounded(executor, apply_template_to_lines, chunks, 2 * workers):
+                    for line_number, result, error in results:
+                        if error is None:
+                            with METRICS.measure(WRITE, index_name, nbytes=len(result) + 1):
+                                output_stream.write(result + "\n")
+                            summary["succeeded"] += 1
+                        else:
+                            summary["failed"].append({"source": f"{input_path}:{line_number}", "error": error})
+
+        else:
+            raise ValueError(
+                f"The input path '{input_path}' must be a directory or an NDJSON file "
+                f"({', '.join(NDJSON_SUFFIXES)})."
+            )
+
+    summary["duration"] = time.perf_counter() - start
+    return summary
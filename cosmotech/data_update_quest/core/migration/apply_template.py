@@ -5,31 +5,181 @@
 # etc., to any person is prohibited unless it has been previously and
 # specifically authorized by written means by Cosmo Tech.
 
+import hashlib
+import os
 import pathlib
-import json
+import threading
+from collections import OrderedDict
+from typing import Optional
+
 import jq
 
+from cosmotech.data_update_quest.core import codec
+from cosmotech.data_update_quest.core.metrics import DECODE
+from cosmotech.data_update_quest.core.metrics import ENCODE
+from cosmotech.data_update_quest.core.metrics import METRICS
+from cosmotech.data_update_quest.core.metrics import TRANSFORM
+from cosmotech.data_update_quest.core.migration.native_transform import compile_template
+
+DEFAULT_TEMPLATE_CACHE_SIZE = 128
+
+
+class TemplateCache:
+    """
+    Bounded LRU cache of compiled JQ programs.
+
+    Programs are keyed by the sha256 of the template content, templates read from files are
+    additionally keyed by their resolved path and modification time so unchanged files are not read again.
+    Scripts generated from a change plan are compiled to a native Python program instead of a jq one.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_TEMPLATE_CACHE_SIZE):
+        if max_size < 1:
+            raise ValueError(f"The template cache size must be a positive integer, got {max_size}.")
+        self.max_size = max_size
+        self._programs = OrderedDict()
+        self._files = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_program(self, template: str):
+        """
+        Get the compiled program of a JQ template, compiling it on a cache miss.
+
+        Args:
+            template (str): The JQ template.
+
+        Returns:
+            The compiled JQ program, or the native program of a generated script.
+        """
+        key = hashlib.sha256(template.encode("utf-8")).hexdigest()
+        with self._lock:
+            if key in self._programs:
+                self.hits += 1
+                self._programs.move_to_end(key)
+                return self._programs[key]
+            self.misses += 1
+
+        program = compile_template(template) or jq.compile(template)
+
+        with self._lock:
+            self._programs[key] = program
+            self._programs.move_to_end(key)
+            while len(self._programs) > self.max_size:
+                self._programs.popitem(last=False)
+                self.evictions += 1
+        return program
+
+    def get_file_program(self, template_file: pathlib.Path):
+        """
+        Get the compiled program of a JQ template file, reading it only if it changed since the last call.
+
+        Args:
+            template_file (pathlib.Path): The path to the file containing the JQ template.
+
+        Returns:
+            The compiled JQ program.
+        """
+        stat = os.stat(template_file)
+        file_key = (os.path.realpath(template_file), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            template = self._files.get(file_key)
+            if template is not None:
+                self._files.move_to_end(file_key)
+
+        if template is None:
+            with open(template_file, "r") as file:
+                template = file.read()
+            with self._lock:
+                self._files[file_key] = template
+                while len(self._files) > self.max_size:
+                    self._files.popitem(last=False)
+
+        return self.get_program(template)
 
-def apply_template(template: str, data: str) -> str:
+    def stats(self) -> dict[str, int]:
+        """
+        Get the usage statistics of the cache.
+
+        Returns:
+            dict[str, int]: The hits, misses and evictions counts, the current size and the maximum size.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._programs),
+                "max_size": self.max_size,
+            }
+
+    def clear(self):
+        """Empty the cache and reset its statistics"""
+        with self._lock:
+            self._programs.clear()
+            self._files.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+TEMPLATE_CACHE = TemplateCache()
+
+
+def get_template_cache_stats() -> dict[str, int]:
+    """
+    Get the usage statistics of the compiled template cache shared by the apply functions.
+
+    Returns:
+        dict[str, int]: The hits, misses and evictions counts, the current size and the maximum size.
+    """
+    return TEMPLATE_CACHE.stats()
+
+
+def apply_program(program, data: str, index_name: Optional[str] = None) -> str:
+    """
+    Apply a compiled JQ program to the provided data.
+
+    Args:
+        program: The compiled JQ program to apply.
+        data (str): The JSON data to transform.
+        index_name (Optional[str]): The index of the document, used for the metrics.
+
+    Returns:
+        str: The transformed JSON data as a string.
+    """
+    # Parse the input data
+    with METRICS.measure(DECODE, index_name, nbytes=len(data)):
+        parsed_data = codec.loads(data)
+
+    # Apply the JQ program
+    with METRICS.measure(TRANSFORM, index_name):
+        result = program.input(parsed_data).first()
+
+    # Convert the result back to JSON string
+    with METRICS.measure(ENCODE, index_name) as sample:
+        content = codec.dumps(result, pretty=True)
+        sample.bytes = len(content)
+    return content
+
+
+def apply_template(template: str, data: str, index_name: Optional[str] = None) -> str:
     """
     Apply a JQ template to the provided data.
 
+    The compiled template is kept in the shared template cache, so applying the same template
+    to many documents compiles it only once.
+
     Args:
         template (str): The JQ template to apply.
         data (str): The JSON data to transform.
+        index_name (Optional[str]): The index of the document, used for the metrics.
 
     Returns:
         str: The transformed JSON data as a string.
     """
     try:
-        # Parse the input data
-        parsed_data = json.loads(data)
-
-        # Apply the JQ template
-        result = jq.compile(template).input(parsed_data).first()
-
-        # Convert the result back to JSON string
-        return json.dumps(result, indent=2)
+        return apply_program(TEMPLATE_CACHE.get_program(template), data, index_name)
 
     except Exception as e:
         raise ValueError(f"Error applying template: {e}") from e
@@ -39,6 +189,8 @@ def apply_template_from_file(template_file: pathlib.Path, data: str) -> str:
     """
     Apply a JQ template from a file to the provided data.
 
+    The template file is only read again if its modification time changed since the previous call.
+
     Args:
         template_file (str): The path to the file containing the JQ template.
         data (str): The JSON data to transform.
@@ -47,12 +199,11 @@ def apply_template_from_file(template_file: pathlib.Path, data: str) -> str:
         str: The transformed JSON data as a string.
     """
     try:
-        # Read the JQ template from the file
-        with open(template_file, "r") as file:
-            template = file.read()
+        # Get the compiled JQ template of the file
+        program = TEMPLATE_CACHE.get_file_program(template_file)
 
         # Apply the template
-        return apply_template(template, data)
+        return apply_program(program, data)
 
     except FileNotFoundError:
         raise ValueError(f"Template file not found: {template_file}")
@@ -60,6 +211,62 @@ def apply_template_from_file(template_file: pathlib.Path, data: str) -> str:
         raise ValueError(f"Error applying template from file: {e}") from e
 
 
+def compose_templates(templates: list[str]) -> str:
+    """
+    Compose an ordered list of JQ templates into a single JQ pipeline.
+
+    Each step is wrapped in its own parentheses and lines, so comments and function definitions
+    stay scoped to their step. Applying the composed template gives the same result as applying
+    each template to the result of the previous one, in a single pass over the document.
+
+    Args:
+        templates (list[str]): The JQ templates, in the order they must be applied.
+
+    Returns:
+        str: The composed JQ template.
+    """
+    if not templates:
+        raise ValueError("A migration chain needs at least one template.")
+    if len(templates) == 1:
+        return templates[0]
+    return "\n| ".join(f"(\n{template}\n)" for template in templates)
+
+
+def read_template_chain(template_files: list[pathlib.Path]) -> str:
+    """
+    Read an ordered list of JQ template files and compose them into a single JQ pipeline.
+
+    Args:
+        template_files (list[pathlib.Path]): The paths to the template files, in the order they must be applied.
+
+    Returns:
+        str: The composed JQ template.
+    """
+    templates = []
+    for template_file in template_files:
+        try:
+            with open(template_file, "r") as file:
+                templates.append(file.read())
+        except FileNotFoundError:
+            raise ValueError(f"Template file not found: {template_file}")
+    return compose_templates(templates)
+
+
+def get_chain_program(template_files: list[pathlib.Path]):
+    """
+    Get the compiled program of an ordered list of JQ template files.
+
+    Args:
+        template_files (list[pathlib.Path]): The paths to the template files, in the order they must be applied.
+
+    Returns:
+        The compiled JQ program applying every template in a single pass.
+    """
+    if len(template_files) == 1:
+        return TEMPLATE_CACHE.get_file_program(template_files[0])
+    return TEMPLATE_CACHE.get_program(read_template_chain(template_files))
+
+
 def apply_template_from_file_to_file(
     template_file: pathlib.Path, input_file: pathlib.Path, output_file: pathlib.Path
 ) -> bool:
@@ -83,7 +290,7 @@ def apply_template_from_file_to_file(
         transformed_data = apply_template_from_file(template_file, data)
 
         # Write the transformed data to the output file
-        with open(output_file, "w") as outfile:
+        with open(output_file, "w", encoding="utf-8") as outfile:
             outfile.write(transformed_data)
 
         return True
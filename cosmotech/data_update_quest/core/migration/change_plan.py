@@ -0,0 +1,120 @@
+# Copyright (C) - 2025 - Cosmo Tech
+# This document and all information contained herein is the exclusive property -
+# including all intellectual property rights pertaining thereto - of Cosmo Tech.
+# Any use, reproduction, translation, broadcasting, transmission, distribution,
+# etc., to any person is prohibited unless it has been previously and
+# specifically authorized by written means by Cosmo Tech.
+
+import copy
+import json
+from dataclasses import dataclass
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+PLAN_VERSION = 1
+
+
+@dataclass(frozen=True)
+class FieldRemoval:
+    field: str
+
+    def to_jq(self) -> str:
+        """The jq filter of the removal, as written in the generated script"""
+        return f"del(.{self.field})"
+
+
+@dataclass(frozen=True)
+class FieldAddition:
+    field: str
+    default: Any = None
+
+    def to_jq(self) -> str:
+        """The jq filter of the addition, as written in the generated script"""
+        return f".{self.field} = {json.dumps(self.default)}"
+
+
+@dataclass(frozen=True)
+class TypeChange:
+    field: str
+    old_type: Any
+    new_type: Any
+
+
+@dataclass(frozen=True)
+class ChangePlan:
+    """
+    The changes needed to migrate the objects of a model from a source schema to a target schema.
+
+    The plan is built once by the template generator and read by every emitter (jq script, README, JSON plan).
+    Defaults are deep copied when the plan is exported, so the plan can not be modified through its exports.
+    """
+
+    source_model: str
+    target_model: str
+    removals: Tuple[FieldRemoval, ...] = ()
+    additions: Tuple[FieldAddition, ...] = ()
+    type_changes: Tuple[TypeChange, ...] = ()
+    moves: Tuple[Any, ...] = ()
+
+    def is_empty(self) -> bool:
+        """Check if the plan has no change, the migration then being the identity"""
+        return not (self.removals or self.additions or self.type_changes or self.moves)
+
+    def to_dict(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Export the changes in the format of MigrationTemplateGenerator.analyze_changes.
+
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: The removals, additions, type changes and moves of the plan.
+        """
+        return {
+            "removals": [{"field": removal.field} for removal in self.removals],
+            "additions": [
+                {"field": addition.field, "default": copy.deepcopy(addition.default)} for addition in self.additions
+            ],
+            "type_changes": [
+                {"field": change.field, "old_type": change.old_type, "new_type": change.new_type}
+                for change in self.type_changes
+            ],
+            "moves": list(self.moves),
+        }
+
+    def to_json(self) -> str:
+        """
+        Export the plan as a JSON document, for the tools consuming the plan instead of the jq script.
+
+        Returns:
+            str: The plan version, the source and target models and their changes.
+        """
+        return json.dumps(
+            {"version": PLAN_VERSION, "source_model": self.source_model, "target_model": self.target_model}
+            | self.to_dict(),
+            indent=2,
+        )
+
+    @classmethod
+    def from_json(cls, content: str) -> "ChangePlan":
+        """
+        Load a plan exported with to_json.
+
+        Args:
+            content (str): The JSON document of the plan.
+
+        Returns:
+            ChangePlan: The loaded plan.
+        """
+        plan = json.loads(content)
+        if plan.get("version") != PLAN_VERSION:
+            raise ValueError(f"Unsupported change plan version {plan.get('version')}, expected {PLAN_VERSION}.")
+        return cls(
+            source_model=plan["source_model"],
+            target_model=plan["target_model"],
+            removals=tuple(FieldRemoval(removal["field"]) for removal in plan["removals"]),
+            additions=tuple(FieldAddition(addition["field"], addition["default"]) for addition in plan["additions"]),
+            type_changes=tuple(
+                TypeChange(change["field"], change["old_type"], change["new_type"]) for change in plan["type_changes"]
+            ),
+            moves=tuple(plan["moves"]),
+        )
@@ -0,0 +1,210 @@
+# Copyright (C) - 2025 - Cosmo Tech
+# This document and all information contained herein is the exclusive property -
+# including all intellectual property rights pertaining thereto - of Cosmo Tech.
+# Any use, reproduction, translation, broadcasting, transmission, distribution,
+# etc., to any person is prohibited unless it has been previously and
+# specifically authorized by written means by Cosmo Tech.
+
+import math
+import pathlib
+import time
+from itertools import islice
+from typing import Any
+from typing import Optional
+from typing import Union
+
+from cosmotech.orchestrator.utils.translate import T
+
+from cosmotech.data_update_quest.core.database.redis.client import DEFAULT_WORKERS
+from cosmotech.data_update_quest.core.database.redis.client import fetch_page
+from cosmotech.data_update_quest.core.database.redis.client import get_redis_client
+from cosmotech.data_update_quest.core.database.redis.client import get_redis_indexes
+from cosmotech.data_update_quest.core.database.redis.storage import iter_bundle
+from cosmotech.data_update_quest.core.database.redis.storage import read_manifest
+from cosmotech.data_update_quest.core.migration.apply_template import TEMPLATE_CACHE
+from cosmotech.data_update_quest.core.migration.apply_template import apply_program
+from cosmotech.data_update_quest.core.migration.apply_template import read_template_chain
+from cosmotech.data_update_quest_cli.utils.logger import LOGGER
+
+DEFAULT_SAMPLE_SIZE = 100
+
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(values: list[float], rank: float) -> float:
+    """
+    Get a percentile of a list of values, using the nearest-rank method.
+
+    Args:
+        values (list[float]): The values, in any order.
+        rank (float): The percentile to get, between 0 and 100.
+
+    Returns:
+        float: The smallest value greater than or equal to `rank` percent of the values, 0 if there are no values.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(math.ceil(rank / 100 * len(ordered)) - 1, 0)]
+
+
+def sample_redis_index(redis_client, index: str, sample_size: int) -> tuple[list[str], int]:
+    """
+    Sample the first documents of a RediSearch index.
+
+    Args:
+        redis_client: The redis client to use.
+        index (str): The full name of the RediSearch index.
+        sample_size (int): The number of documents to sample.
+
+    Returns:
+        tuple[list[str], int]: The JSON content of the sampled documents, and the number of documents of the index
+            as reported by FT.INFO.
+    """
+    documents = [doc.json for doc in fetch_page(redis_client, index, 0, sample_size).docs]
+    return documents, int(redis_client.ft(index).info()["num_docs"])
+
+
+def sample_dump(path: pathlib.Path, index_list: Optional[list[str]], sample_size: int) -> dict[str, tuple[list, int]]:
+    """
+    Sample the first documents of each index of a dump directory, in either layout.
+
+    Args:
+        path (pathlib.Path): The dump directory.
+        index_list (Optional[list[str]]): The indexes to sample, whatever their case, all indexes of the dump if empty.
+        sample_size (int): The number of documents to sample per index.
+
+    Returns:
+        dict[str, tuple[list, int]]: The JSON content of the sampled documents and the number of documents
+            of each index.
+    """
+    # Index names are not case sensitive, as everywhere else
+    index_list = {index.lower() for index in index_list or ()}
+    samples = {}
+    manifest = read_manifest(path)
+    if manifest is None:
+        for index in sorted(path.iterdir()):
+            if not index.is_dir() or (index_list and index.name.lower() not in index_list):
+                continue
+            files = sorted(index.glob("*.json"))
+            samples[index.name] = ([file.read_text() for file in files[:sample_size]], len(files))
+    else:
+        for index, entry in manifest["indexes"].items():
+            if index_list and index.lower() not in index_list:
+                continue
+            # The bundle is not read to its end, so its checksum is not checked
+            samples[index] = (list(islice(iter_bundle(path, index, manifest), sample_size)), entry["count"])
+    return samples
+
+
+def estimate_index(template: str, documents: list[str], count: int, workers: int = DEFAULT_WORKERS) -> dict[str, Any]:
+    """
+    Apply a template to sampled documents and project the transform time of the full index.
+
+    The template is compiled before the documents are timed, so the compile time is not counted
+    in the latency of the first document.
+
+    Args:
+        template (str): The JQ template to apply.
+        documents (list[str]): The JSON content of the sampled documents.
+        count (int): The number of documents of the full index.
+        workers (int): The number of workers the full index would be transformed with.
+
+    Raises:
+        ValueError: If the template can not be compiled.
+
+    Returns:
+        dict[str, Any]: The number of sampled and failed documents, the transform latency percentiles
+            in milliseconds, the ratio of the output size to the input size, and the projected duration
+            in seconds of the transform of the full index.
+    """
+    try:
+        program = TEMPLATE_CACHE.get_program(template)
+    except Exception as e:
+        raise ValueError(f"Error compiling template: {e}") from e
+
+    latencies = []
+    input_size = output_size = 0
+    failed = 0
+    for document in documents:
+        start = time.perf_counter()
+        try:
+            result = apply_program(program, document)
+        except Exception:
+            failed += 1
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+        input_size += len(document)
+        output_size += len(result)
+
+    mean = sum(latencies) / len(latencies) if latencies else 0.0
+    return {
+        "sampled": len(documents),
+        "failed": failed,
+        "documents": count,
+        "latency": {f"p{rank}": percentile(latencies, rank) for rank in PERCENTILES}
+        | {"mean": mean, "max": max(latencies, default=0.0)},
+        "size_ratio": output_size / input_size if input_size else 0.0,
+        "projected_duration": mean * count / 1000 / workers,
+    }
+
+
+def estimate(
+    template_file: Union[pathlib.Path, list[pathlib.Path]],
+    host,
+    port,
+    password,
+    index_list: Optional[list[str]],
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+    workers: int = DEFAULT_WORKERS,
+    dump_path: Optional[pathlib.Path] = None,
+) -> dict[str, dict[str, Any]]:
+    """
+    Estimate the duration of a migration by applying its template to a sample of documents of each index.
+
+    Documents are sampled from redis, the size of each index being read with FT.INFO,
+    or from a dump directory when `dump_path` is set. The projection only covers the transform
+    of the documents, not the time spent reading and writing them.
+
+    Args:
+        template_file (Union[pathlib.Path, list[pathlib.Path]]): The path to the file containing the JQ template,
+            or an ordered list of template files applied as a single fused chain.
+        host: The redis host.
+        port: The redis port.
+        password: The redis password.
+        index_list (Optional[list[str]]): The indexes to sample, all indexes if empty.
+        sample_size (int): The number of documents sampled per index.
+        workers (int): The number of workers the migration would run with.
+        dump_path (Optional[pathlib.Path]): A dump directory to sample instead of redis.
+
+    Returns:
+        dict[str, dict[str, Any]]: The estimate of each index, as returned by estimate_index.
+    """
+    if sample_size < 1:
+        raise ValueError(f"The sample size must be a positive integer, got {sample_size}.")
+
+    template_files = [template_file] if isinstance(template_file, (str, pathlib.PurePath)) else list(template_file)
+    template = read_template_chain(template_files)
+
+    if dump_path is not None:
+        samples = sample_dump(pathlib.Path(dump_path), index_list, sample_size)
+    else:
+        redis_client = get_redis_client(host=host, port=port, password=password)
+        indexes = get_redis_indexes(redis_client, index_list)
+        samples = {name: sample_redis_index(redis_client, index, sample_size) for name, index in indexes.items()}
+
+    estimates = {}
+    for index, (documents, count) in samples.items():
+        estimates[index] = estimate_index(template, documents, count, workers)
+        LOGGER.info(T("data_update_quest.core.estimate.index").format(index=index, **estimates[index]))
+        LOGGER.info(T("data_update_quest.core.estimate.latency").format(**estimates[index]["latency"]))
+
+    total = sum(index_estimate["projected_duration"] for index_estimate in estimates.values())
+    LOGGER.info(
+        T("data_update_quest.core.estimate.total").format(
+            documents=sum(index_estimate["documents"] for index_estimate in estimates.values()),
+            duration=total,
+            workers=workers,
+        )
+    )
+    return estimates
@@ -0,0 +1,197 @@
+# Copyright (C) - 2025 - Cosmo Tech
+# This document and all information contained herein is the exclusive property -
+# including all intellectual property rights pertaining thereto - of Cosmo Tech.
+# Any use, reproduction, translation, broadcasting, transmission, distribution,
+# etc., to any person is prohibited unless it has been previously and
+# specifically authorized by written means by Cosmo Tech.
+
+import os
+import pathlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from cosmotech.orchestrator.utils.translate import T
+
+from cosmotech.data_update_quest.core.migration.spec_cache import SpecCache
+from cosmotech.data_update_quest.core.migration.template_generator import MigrationTemplateGenerator
+from cosmotech.data_update_quest.core.migration.template_generator import ReferenceResolver
+from cosmotech.data_update_quest_cli.utils.logger import LOGGER
+
+# Specs and resolvers of a worker process, set once by init_worker so they are not sent with every model
+_WORKER_SPECS: Dict[str, Any] = {}
+
+
+def get_models(openapi: Dict[str, Any]) -> List[str]:
+    """
+    List the models of an OpenAPI definition.
+
+    Args:
+        openapi (Dict[str, Any]): The OpenAPI definition, either 3.x or Swagger 2.x.
+
+    Returns:
+        List[str]: The names of the schemas of the definition.
+    """
+    if "components" in openapi and "schemas" in openapi["components"]:
+        return list(openapi["components"]["schemas"])
+    return list(openapi.get("definitions", {}))
+
+
+def get_api_version(openapi: Dict[str, Any], file_path: str) -> str:
+    """Get the version of an OpenAPI definition, the name of its file if it has none"""
+    return str(openapi.get("info", {}).get("version") or pathlib.Path(file_path).stem)
+
+
+def match_models(
+    source_models: List[str], target_models: List[str], mapping: Optional[Dict[str, str]] = None
+) -> Dict[str, str]:
+    """
+    Match the models of a source definition with the models of a target definition.
+
+    Models are matched by name, unless the mapping gives the name of their target model.
+
+    Args:
+        source_models (List[str]): The models of the source definition.
+        target_models (List[str]): The models of the target definition.
+        mapping (Optional[Dict[str, str]]): The target model of source models renamed between both versions.
+
+    Returns:
+        Dict[str, str]: The target model of each source model with a match in the target definition.
+    """
+    mapping = mapping or {}
+    targets = set(target_models)
+    matches = {}
+    for source_model in source_models:
+        target_model = mapping.get(source_model, source_model)
+        if target_model in targets:
+            matches[source_model] = target_model
+        else:
+            LOGGER.warning(T("data_update_quest.core.generate_templates.unmatched").format(model=source_model))
+    return matches
+
+
+def init_worker(source_resolver: ReferenceResolver, target_resolver: ReferenceResolver):
+    """Keep the specs in the worker process, with one reference resolver per spec shared by all its models"""
+    _WORKER_SPECS["source"] = source_resolver.openapi
+    _WORKER_SPECS["target"] = target_resolver.openapi
+    _WORKER_SPECS["source_resolver"] = source_resolver
+    _WORKER_SPECS["target_resolver"] = target_resolver
+
+
+def generate_model_templates(
+    source_model: str, target_model: str, output_dir: str, return_schemas: bool = False
+) -> Tuple[Optional[str], Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Generate the templates of a model from the specs of the worker process.
+
+    Args:
+        source_model (str): The name of the model in the source definition.
+        target_model (str): The name of the model in the target definition.
+        output_dir (str): The directory in which the templates of the model are saved.
+        return_schemas (bool): If True, the schemas resolved for the model are sent back to be cached.
+
+    Returns:
+        Tuple[Optional[str], Optional[Dict[str, Any]], Optional[Dict[str, Any]]]: The error message if the templates
+            could not be generated, None on success, and the source and target schemas resolved for the model
+            if asked for, None for the schemas that were already resolved in the specs of the worker.
+    """
+    source_resolver, target_resolver = _WORKER_SPECS["source_resolver"], _WORKER_SPECS["target_resolver"]
+    resolved = (source_model not in source_resolver.models, target_model not in target_resolver.models)
+    try:
+        generator = MigrationTemplateGenerator(
+            _WORKER_SPECS["source"],
+            _WORKER_SPECS["target"],
+            source_model,
+            target_model,
+            source_resolver=source_resolver,
+            target_resolver=target_resolver,
+        )
+        generator.save_all_templates(output_dir)
+    except Exception as e:
+        return str(e), None, None
+    if not return_schemas:
+        return None, None, None
+    return None, generator.source_schema if resolved[0] else None, generator.target_schema if resolved[1] else None
+
+
+def generate_all_templates(
+    source_path: str,
+    target_path: str,
+    output_dir: str,
+    mapping_file: Optional[str] = None,
+    workers: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Generate the templates of every model present in both OpenAPI definitions, on a process pool.
+
+    Both definitions are loaded once, and the templates of each model are saved in
+    `<output_dir>/<source version>_to_<target version>/<model>`.
+    Models are resolved by the workers, with a spec cache they send the schemas they resolved back,
+    which are saved once every model is generated.
+
+    Args:
+        source_path (str): The source OpenAPI file.
+        target_path (str): The target OpenAPI file.
+        output_dir (str): The root directory of the template tree.
+        mapping_file (Optional[str]): A YAML or JSON file giving the target model of source models
+            renamed between both versions.
+        workers (Optional[int]): The number of worker processes, the number of CPUs if None.
+        cache_dir (Optional[str]): The directory of the on-disk spec cache, the specs are not cached if None.
+
+    Returns:
+        Dict[str, Any]: The directory of the template tree, the generated models and the models that failed
+            with their error message.
+    """
+    cache = None
+    if cache_dir is None:
+        source_resolver = ReferenceResolver(MigrationTemplateGenerator._load_file(source_path))
+        target_resolver = ReferenceResolver(MigrationTemplateGenerator._load_file(target_path))
+    else:
+        cache = SpecCache(cache_dir)
+        source_resolver = cache.load(source_path)
+        target_resolver = cache.load(target_path)
+    source_openapi = source_resolver.openapi
+    target_openapi = target_resolver.openapi
+    mapping = MigrationTemplateGenerator._load_file(mapping_file) if mapping_file else None
+
+    version_dir = pathlib.Path(output_dir) / (
+        f"{get_api_version(source_openapi, source_path)}_to_{get_api_version(target_openapi, target_path)}"
+    )
+    matches = match_models(get_models(source_openapi), get_models(target_openapi), mapping)
+
+    summary = {"output_dir": str(version_dir), "generated": [], "failed": []}
+    with ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count() or 1,
+        initializer=init_worker,
+        initargs=(source_resolver, target_resolver),
+    ) as executor:
+        futures = {
+            (source_model, target_model): executor.submit(
+                generate_model_templates, source_model, target_model, str(version_dir / source_model), cache is not None
+            )
+            for source_model, target_model in matches.items()
+        }
+        for (source_model, target_model), future in futures.items():
+            error, source_schema, target_schema = future.result()
+            if error is None:
+                summary["generated"].append(source_model)
+                for resolver, model, schema in (
+                    (source_resolver, source_model, source_schema),
+                    (target_resolver, target_model, target_schema),
+                ):
+                    if schema is not None:
+                        resolver.models.setdefault(model, schema)
+            else:
+                LOGGER.error(
+                    T("data_update_quest.core.generate_templates.model_failed").format(model=source_model, error=error)
+                )
+                summary["failed"].append({"model": source_model, "error": error})
+
+    if cache is not None:
+        cache.save(source_resolver)
+        cache.save(target_resolver)
+    return summary
@@ -0,0 +1,243 @@
+# Copyright (C) - 2025 - Cosmo Tech
+# This document and all information contained herein is the exclusive property -
+# including all intellectual property rights pertaining thereto - of Cosmo Tech.
+# Any use, reproduction, translation, broadcasting, transmission, distribution,
+# etc., to any person is prohibited unless it has been previously and
+# specifically authorized by written means by Cosmo Tech.
+
+"""
+Native Python transform of the jq scripts generated from a change plan.
+
+Generated scripts only chain `del(.path)` and `.path = <default>` filters, which are applied directly to
+the parsed documents instead of being marshalled through libjq for each document.
+A template is only run natively if it is written exactly as the generator writes the steps it is made of,
+every other template is compiled by jq.
+"""
+
+import copy
+import json
+import math
+import re
+from typing import Any
+from typing import Optional
+from typing import Sequence
+from typing import Union
+
+import jq
+
+from cosmotech.data_update_quest.core.migration.change_plan import ChangePlan
+from cosmotech.data_update_quest.core.migration.change_plan import FieldAddition
+from cosmotech.data_update_quest.core.migration.change_plan import FieldRemoval
+
+Step = Union[FieldRemoval, FieldAddition]
+
+# Paths jq reads as a plain chain of object keys
+FIELD_PATH = r"[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*"
+REMOVAL = re.compile(rf"del\(\.({FIELD_PATH})\)")
+ADDITION = re.compile(rf"\.({FIELD_PATH}) = (.+)")
+
+# Separator of the templates composed by compose_templates
+CHAIN_SEPARATOR = "\n)\n| (\n"
+
+# jq reads numbers as doubles, larger integers may come back rounded
+MAX_EXACT_INTEGER = 2**53
+SURROGATES = re.compile("[\ud800-\udfff]")
+
+
+class NativeFallback(Exception):
+    """Raised when a document has to be transformed by jq to get the same output"""
+
+
+def is_jq_exact(value: Any) -> bool:
+    """
+    Check that jq gives a value back unchanged.
+
+    jq writes integral numbers as integers, rounds the integers a double can not hold and refuses lone
+    surrogates, the documents holding such values are transformed by jq.
+    """
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+        elif isinstance(value, str):
+            if not value.isascii() and SURROGATES.search(value):
+                return False
+        elif value is None or isinstance(value, bool):
+            continue
+        elif isinstance(value, int):
+            if abs(value) > MAX_EXACT_INTEGER:
+                return False
+        elif isinstance(value, float):
+            if not math.isfinite(value) or value.is_integer():
+                return False
+        else:
+            return False
+    return True
+
+
+class NativeOutput:
+    """Output of a native transform, read like the output of a jq program"""
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def first(self) -> Any:
+        return self.value
+
+    def all(self) -> list[Any]:
+        return [self.value]
+
+
+class NativeProgram:
+    """
+    Program applying the removals and additions of a change plan directly to the documents.
+
+    It is used like a compiled jq program, with `program.input(document).first()`.
+    Documents are not modified, the objects along the edited paths are copied.
+    Documents the native transform can not reproduce exactly, holding values jq would change or
+    a field that is not an object along an edited path, are handed to the jq program of the same steps.
+    """
+
+    def __init__(self, steps: Sequence[Step]):
+        self.steps = tuple(steps)
+        self._edits = [
+            (isinstance(step, FieldRemoval), ["$", *step.field.split(".")], getattr(step, "default", None))
+            for step in self.steps
+        ]
+        self._program = None
+
+    @property
+    def template(self) -> str:
+        """The jq template of the steps, as the generator writes it"""
+        return "\n| ".join(step.to_jq() for step in self.steps) or "."
+
+    @property
+    def jq_program(self):
+        """The jq program of the steps, compiled on first use"""
+        if self._program is None:
+            self._program = jq.compile(self.template)
+        return self._program
+
+    def input(self, value: Any):
+        try:
+            return NativeOutput(self.transform(value))
+        except NativeFallback:
+            return self.jq_program.input(value)
+
+    def transform(self, document: Any) -> Any:
+        """
+        Apply the steps to a document.
+
+        Raises:
+            NativeFallback: If the document has to be transformed by jq.
+        """
+        if not (document is None or isinstance(document, dict)) or not is_jq_exact(document):
+            raise NativeFallback()
+
+        # The document is held like a member, so its root is copied and created like any other object
+        root = {"$": document}
+        owned = {id(root): root}
+        for removal, path, default in self._edits:
+            parent = root
+            for key in path[:-1]:
+                child = parent.get(key)
+                if child is None:
+                    # Nothing to delete under a missing or null member
+                    if removal:
+                        break
+                    child = parent[key] = {}
+                    owned[id(child)] = child
+                elif not isinstance(child, dict):
+                    raise NativeFallback()
+                elif id(child) not in owned:
+                    child = parent[key] = dict(child)
+                    owned[id(child)] = child
+                parent = child
+            else:
+                if removal:
+                    parent.pop(path[-1], None)
+                else:
+                    parent[path[-1]] = copy.deepcopy(default) if isinstance(default, (dict, list)) else default
+        return root["$"]
+
+
+def compile_plan(plan: ChangePlan) -> NativeProgram:
+    """
+    Compile a change plan to a native program, giving the same output as its generated jq script.
+
+    Args:
+        plan (ChangePlan): The plan, its type changes and moves are not part of the generated script.
+
+    Returns:
+        NativeProgram: The program applying the removals then the additions of the plan.
+    """
+    return NativeProgram(plan.removals + plan.additions)
+
+
+def parse_steps(template: str) -> Optional[list[Step]]:
+    """
+    Read the steps of a template generated from a change plan.
+
+    Args:
+        template (str): The jq template.
+
+    Returns:
+        Optional[list[Step]]: The removals and additions of the template, None if it is not written
+            as the generator writes them or if a default is a value jq would change.
+    """
+    lines = [line for line in template.splitlines() if line.strip() and not line.lstrip().startswith("#")]
+    if lines == ["."]:
+        return []
+
+    steps = []
+    for index, line in enumerate(lines):
+        if index:
+            if not line.startswith("| "):
+                return None
+            line = line[2:]
+
+        if match := REMOVAL.fullmatch(line):
+            step = FieldRemoval(match[1])
+        elif match := ADDITION.fullmatch(line):
+            try:
+                default = json.loads(match[2])
+            except ValueError:
+                return None
+            if not is_jq_exact(default):
+                return None
+            step = FieldAddition(match[1], default)
+        else:
+            return None
+
+        if step.to_jq() != line:
+            return None
+        steps.append(step)
+    return steps or None
+
+
+def compile_template(template: str) -> Optional[NativeProgram]:
+    """
+    Compile a template to a native program if it is a generated script, or a chain of generated scripts.
+
+    Args:
+        template (str): The jq template.
+
+    Returns:
+        Optional[NativeProgram]: The native program of the template, None if it has to be compiled by jq.
+    """
+    if template.startswith("(\n") and template.endswith("\n)"):
+        templates = template[2:-2].split(CHAIN_SEPARATOR)
+    else:
+        templates = [template]
+
+    steps = []
+    for part in templates:
+        part_steps = parse_steps(part)
+        if part_steps is None:
+            return None
+        steps.extend(part_steps)
+    return NativeProgram(steps)
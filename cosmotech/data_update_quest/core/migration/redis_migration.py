@@ -0,0 +1,202 @@
+# Copyright (C) - 2025 - Cosmo Tech
+# This document and all information contained herein is the exclusive property -
+# including all intellectual property rights pertaining thereto - of Cosmo Tech.
+# Any use, reproduction, translation, broadcasting, transmission, distribution,
+# etc., to any person is prohibited unless it has been previously and
+# specifically authorized by written means by Cosmo Tech.
+
+import hashlib
+import pathlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Optional
+from typing import Union
+
+from cosmotech.orchestrator.utils.translate import T
+
+from cosmotech.data_update_quest.core.checkpoint import CheckpointJournal
+from cosmotech.data_update_quest.core.database.redis.client import DEFAULT_BATCH_SIZE
+from cosmotech.data_update_quest.core.database.redis.client import DEFAULT_PAGE_SIZE
+from cosmotech.data_update_quest.core.database.redis.client import DEFAULT_WORKERS
+from cosmotech.data_update_quest.core.database.redis.client import batched
+from cosmotech.data_update_quest.core.database.redis.client import get_redis_client
+from cosmotech.data_update_quest.core.database.redis.client import get_redis_indexes
+from cosmotech.data_update_quest.core.database.redis.client import list_index_keys
+from cosmotech.data_update_quest.core.database.redis.client import upload_batch
+from cosmotech.data_update_quest.core.metrics import FETCH
+from cosmotech.data_update_quest.core.metrics import METRICS
+from cosmotech.data_update_quest.core.metrics import TRANSFORM
+from cosmotech.data_update_quest.core.migration.apply_template import get_chain_program
+from cosmotech.data_update_quest.core.migration.apply_template import read_template_chain
+from cosmotech.data_update_quest_cli.utils.logger import LOGGER
+
+MIGRATE_JOURNAL = ".duq-migrate-checkpoint.jsonl"
+
+
+def migrate_batch(redis_client, program, index_name: str, keys: list[str], dry_run: bool = False) -> list[str]:
+    """
+    Transform a batch of documents in place: read them with JSON.MGET, apply the template and write them back.
+
+    Args:
+        redis_client: The redis client to use.
+        program: The compiled jq template.
+        index_name (str): The short name of the index, used for logging.
+        keys (list[str]): The keys of the documents to migrate.
+        dry_run (bool): If True, documents are transformed but not written back.
+
+    Returns:
+        list[str]: The keys of the documents that could not be migrated.
+    """
+    results = {}
+    errors = {}
+    with METRICS.measure(FETCH, index_name, items=len(keys)):
+        documents = redis_client.json().mget(keys, ".")
+    with METRICS.measure(TRANSFORM, index_name, items=len(keys)) as sample:
+        for key, data in zip(keys, documents):
+            # Documents deleted since the keys were listed are skipped
+            if data is None:
+                continue
+            try:
+                results[key] = program.input(data).first()
+            except Exception as e:
+                errors[key] = e
+        sample.items = len(results) + len(errors)
+        sample.errors = len(errors)
+
+    if results and not dry_run:
+        errors.update(upload_batch(redis_client, results, index_name))
+
+    for key, error in errors.items():
+        LOGGER.error(T("data_update_quest.core.redis_migrate.migrate_error").format(key=key, error=error))
+    LOGGER.debug(
+        T("data_update_quest.core.redis_migrate.batch").format(
+            index=index_name, success=len(results.keys() - errors.keys()), failed=len(errors)
+        )
+    )
+
+    return list(errors)
+
+
+def migrate_journaled_batch(
+    journal: Optional[CheckpointJournal],
+    unit: int,
+    redis_client,
+    program,
+    index_name: str,
+    keys: list[str],
+    dry_run: bool,
+) -> list[str]:
+    """
+    Migrate a batch with migrate_batch and record it as completed in the checkpoint journal, if any.
+
+    Batches with failed documents are not recorded, so a resumed run migrates them again.
+    """
+    failed_keys = migrate_batch(redis_client, program, index_name, keys, dry_run)
+    if journal is not None and not failed_keys:
+        journal.record(index_name, unit, count=len(keys), last=keys[-1])
+    return failed_keys
+
+
+def redis_migrate(
+    template_file: Union[pathlib.Path, list[pathlib.Path]],
+    host,
+    port,
+    password,
+    index_list: Optional[list[str]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int = DEFAULT_WORKERS,
+    dry_run: bool = False,
+    resume: bool = False,
+    journal_path: Optional[pathlib.Path] = None,
+) -> dict[str, Any]:
+    """
+    Apply a JQ template to every document of the given indexes directly in redis, without going through files.
+
+    Args:
+        template_file (Union[pathlib.Path, list[pathlib.Path]]): The path to the file containing the JQ template,
+            or an ordered list of template files applied as a single fused chain.
+        host: The redis host.
+        port: The redis port.
+        password: The redis password.
+        index_list (Optional[list[str]]): The indexes to migrate, all indexes if empty.
+        batch_size (int): The number of documents read, transformed and written per batch.
+        workers (int): The number of batches processed concurrently.
+        dry_run (bool): If True, documents are transformed but not written back.
+        resume (bool): If True, the batches recorded in the checkpoint journal by a previous run are skipped.
+        journal_path (Optional[pathlib.Path]): The checkpoint journal, `.duq-migrate-checkpoint.jsonl` in the working
+            directory by default. No journal is kept unless `resume` or `journal_path` is set.
+
+    Returns:
+        dict[str, Any]: The number of documents, the failed keys and the duration of the migration.
+    """
+    template_files = [template_file] if isinstance(template_file, (str, pathlib.PurePath)) else list(template_file)
+    try:
+        program = get_chain_program(template_files)
+        # Native programs of generated scripts have no source, the journal is keyed by the text of the chain
+        template = read_template_chain(template_files)
+    except FileNotFoundError:
+        raise ValueError(f"Template file not found: {template_file}")
+    except ValueError as e:
+        raise ValueError(f"Error compiling template {template_file}: {e}") from e
+
+    redis_client = get_redis_client(host=host, port=port, password=password, max_connections=workers)
+    indexes = get_redis_indexes(redis_client, index_list)
+
+    # Migrations have no output directory, the journal is only kept when asked for, and never on a dry run
+    # as nothing is written then
+    journal = None
+    if not dry_run and (resume or journal_path is not None):
+        journal = CheckpointJournal(
+            journal_path or pathlib.Path(MIGRATE_JOURNAL),
+            "redis-migrate",
+            {"batch_size": batch_size, "template": hashlib.sha256(template.encode()).hexdigest()},
+            resume=resume,
+        )
+
+    summary = {"documents": 0, "failed": [], "duration": 0.0}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for index in indexes:
+            start = time.perf_counter()
+            # Keys are sorted so batches are the same from one run to the next
+            keys = sorted(list_index_keys(redis_client, indexes[index], DEFAULT_PAGE_SIZE))
+            batches = [
+                (unit, batch)
+                for unit, batch in enumerate(batched(keys, batch_size))
+                if journal is None or not journal.is_done(index, unit)
+            ]
+            futures = [
+                executor.submit(migrate_journaled_batch, journal, unit, redis_client, program, index, batch, dry_run)
+                for unit, batch in batches
+            ]
+            failed = [key for future in futures for key in future.result()]
+            duration = time.perf_counter() - start
+            count = sum(len(batch) for _, batch in batches)
+
+            LOGGER.info(
+                T("data_update_quest.core.redis_migrate.index_done").format(
+                    index=index,
+                    count=count - len(failed),
+                    failed=len(failed),
+                    duration=duration,
+                    rate=count / duration if duration else 0,
+                )
+            )
+            summary["documents"] += count
+            summary["failed"].extend(failed)
+            summary["duration"] += duration
+
+    LOGGER.info(
+        T("data_update_quest.core.redis_migrate.done").format(
+            count=summary["documents"] - len(summary["failed"]),
+            failed=len(summary["failed"]),
+            duration=summary["duration"],
+            rate=summary["documents"] / summary["duration"] if summary["duration"] else 0,
+        )
+    )
+    if journal is not None:
+        journal.close()
+    if dry_run:
+        LOGGER.info(T("data_update_quest.core.redis_migrate.dry_run"))
+
+    return summary
@@ -0,0 +1,103 @@
+# Copyright (C) - 2025 - Cosmo Tech
+# This document and all information contained herein is the exclusive property -
+# including all intellectual property rights pertaining thereto - of Cosmo Tech.
+# Any use, reproduction, translation, broadcasting, transmission, distribution,
+# etc., to any person is prohibited unless it has been previously and
+# specifically authorized by written means by Cosmo Tech.
+
+from dataclasses import dataclass
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+PROPERTY_ADDED = "added"
+PROPERTY_REMOVED = "removed"
+TYPE_CHANGED = "type_changed"
+
+
+@dataclass(frozen=True)
+class SchemaChange:
+    """
+    A change of a property between two versions of a resolved schema.
+
+    Attributes:
+        kind (str): One of PROPERTY_ADDED, PROPERTY_REMOVED or TYPE_CHANGED.
+        path (str): The dot path of the property, e.g. `security.accessControlList`.
+        source (Optional[Dict[str, Any]]): The schema of the property in the source version, None if added.
+        target (Optional[Dict[str, Any]]): The schema of the property in the target version, None if removed.
+    """
+
+    kind: str
+    path: str
+    source: Optional[Dict[str, Any]] = None
+    target: Optional[Dict[str, Any]] = None
+
+    @property
+    def old_type(self) -> Any:
+        return self.source.get("type") if self.source is not None else None
+
+    @property
+    def new_type(self) -> Any:
+        return self.target.get("type") if self.target is not None else None
+
+
+def _normalize_type(schema_type: Any) -> Any:
+    # A list of types is a union, its order does not matter
+    if isinstance(schema_type, list):
+        return frozenset(map(str, schema_type))
+    return schema_type
+
+
+def diff_schemas(source: Dict[str, Any], target: Dict[str, Any]) -> List[SchemaChange]:
+    """
+    Compare the properties of two resolved schemas.
+
+    The `properties` of both schemas are walked together once: a property only found in one of them
+    is reported as added or removed without walking its own properties, a property found in both
+    is reported if its type changed and its properties are compared in turn.
+
+    Args:
+        source (Dict[str, Any]): The resolved schema of the source version.
+        target (Dict[str, Any]): The resolved schema of the target version.
+
+    Returns:
+        List[SchemaChange]: The changes, removals first, in the order of the properties in the schemas.
+    """
+    removals = []
+    additions = []
+    type_changes = []
+
+    pending = [("", source, target)]
+    while pending:
+        parent_path, source_schema, target_schema = pending.pop()
+        source_properties = source_schema.get("properties") or {}
+        target_properties = target_schema.get("properties") or {}
+        nested = []
+
+        for name, source_property in source_properties.items():
+            path = f"{parent_path}.{name}" if parent_path else name
+            if name not in target_properties:
+                removals.append(SchemaChange(PROPERTY_REMOVED, path, source=source_property))
+                continue
+
+            target_property = target_properties[name]
+            if not isinstance(source_property, dict) or not isinstance(target_property, dict):
+                continue
+            if (
+                "type" in source_property
+                and "type" in target_property
+                and _normalize_type(source_property["type"]) != _normalize_type(target_property["type"])
+            ):
+                type_changes.append(SchemaChange(TYPE_CHANGED, path, source=source_property, target=target_property))
+            nested.append((path, source_property, target_property))
+
+        for name, target_property in target_properties.items():
+            if name not in source_properties:
+                path = f"{parent_path}.{name}" if parent_path else name
+                additions.append(SchemaChange(PROPERTY_ADDED, path, target=target_property))
+
+        # Nested properties are pushed in reverse so they are walked in the order of the schema
+        pending.extend(reversed(nested))
+
+    return removals + additions + type_changes
@@ -0,0 +1,140 @@
+# Copyright (C) - 2025 - Cosmo Tech
+# This document and all information contained herein is the exclusive property -
+# including all intellectual property rights pertaining thereto - of Cosmo Tech.
+# Any use, reproduction, translation, broadcasting, transmission, distribution,
+# etc., to any person is prohibited unless it has been previously and
+# specifically authorized by written means by Cosmo Tech.
+
+import hashlib
+import os
+import pathlib
+import pickle
+import stat
+import tempfile
+from typing import Dict
+
+from cosmotech.orchestrator.utils.translate import T
+
+from cosmotech.data_update_quest.core.migration.template_generator import MigrationTemplateGenerator
+from cosmotech.data_update_quest.core.migration.template_generator import ReferenceResolver
+from cosmotech.data_update_quest_cli.utils.logger import LOGGER
+
+# Bumped whenever the parsing or the resolution of specs changes, so older cache entries are ignored
+CACHE_VERSION = 1
+
+
+def get_default_cache_dir() -> pathlib.Path:
+    """Get the default spec cache directory, in the user cache directory"""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or pathlib.Path.home() / ".cache"
+    return pathlib.Path(cache_home) / "csm-duq" / "specs"
+
+
+class SpecCache:
+    """
+    On-disk cache of parsed OpenAPI specs and of their resolved schemas, keyed by the hash of the spec file.
+
+    Each entry is the pickled ReferenceResolver of a spec, holding the parsed spec, its resolved references
+    and its resolved models. As loading a pickle can run code, entries are only read from a cache directory
+    owned by the current user that no one else can write to, it is created private to the user.
+    The cache is disabled, specs being parsed every time, if its directory can not be created or written,
+    or if it is not private.
+    """
+
+    def __init__(self, directory: pathlib.Path):
+        self.directory = pathlib.Path(directory)
+        self.enabled = True
+        try:
+            self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        except OSError as e:
+            self._disable(e)
+        else:
+            if not self._is_private():
+                self.enabled = False
+                LOGGER.warning(T("data_update_quest.core.spec_cache.unsafe").format(directory=self.directory))
+        self._loaded: Dict[str, ReferenceResolver] = {}
+        # Number of resolved schemas of each loaded spec, to only write back the entries that grew
+        self._sizes: Dict[str, tuple] = {}
+
+    def _disable(self, error: OSError):
+        self.enabled = False
+        LOGGER.warning(T("data_update_quest.core.spec_cache.disabled").format(directory=self.directory, error=error))
+
+    def _is_private(self) -> bool:
+        """Check that the cache directory is owned by the current user and not writable by its group or others"""
+        # Ownership and permission bits are not checked where they do not exist
+        if not hasattr(os, "getuid"):
+            return True
+        status = self.directory.stat()
+        return status.st_uid == os.getuid() and not status.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+    def _entry_path(self, key: str) -> pathlib.Path:
+        return self.directory / f"{key}.v{CACHE_VERSION}.pickle"
+
+    @staticmethod
+    def _size(resolver: ReferenceResolver) -> tuple:
+        return len(resolver.models), len(resolver._resolved)
+
+    def load(self, file_path: str) -> ReferenceResolver:
+        """
+        Load a spec file, from the cache if the same content was loaded before.
+
+        Args:
+            file_path (str): The YAML or JSON OpenAPI file.
+
+        Returns:
+            ReferenceResolver: The resolver of the spec, its `openapi` attribute holding the parsed spec.
+        """
+        with open(file_path, "rb") as file:
+            content = file.read()
+        # The file type is part of the key, as the same content is not parsed the same way as JSON and YAML
+        key = f"{hashlib.sha256(content).hexdigest()}-{'json' if str(file_path).endswith('.json') else 'yaml'}"
+        if key in self._loaded:
+            return self._loaded[key]
+
+        resolver = None
+        entry_path = self._entry_path(key)
+        if self.enabled and entry_path.is_file():
+            try:
+                with open(entry_path, "rb") as file:
+                    resolver = pickle.load(file)
+                LOGGER.debug(T("data_update_quest.core.spec_cache.hit").format(file_path=file_path))
+            except Exception as e:
+                # A corrupted entry is parsed again and replaced
+                LOGGER.warning(T("data_update_quest.core.spec_cache.invalid").format(file_path=entry_path, error=e))
+
+        if resolver is None:
+            resolver = ReferenceResolver(MigrationTemplateGenerator._parse_content(content, file_path))
+            self._sizes[key] = None
+        else:
+            self._sizes[key] = self._size(resolver)
+        resolver.cache_key = key
+        self._loaded[key] = resolver
+        return resolver
+
+    def save(self, resolver: ReferenceResolver):
+        """
+        Write a loaded spec back to the cache if it is new or got new resolved schemas.
+
+        Args:
+            resolver (ReferenceResolver): A resolver returned by load.
+        """
+        if not self.enabled or self._sizes.get(resolver.cache_key) == self._size(resolver):
+            return
+
+        # Written to a temporary file first, so concurrent runs never read a partial entry
+        try:
+            file = tempfile.NamedTemporaryFile(dir=self.directory, suffix=".tmp", delete=False)
+        except OSError as e:
+            self._disable(e)
+            return
+        try:
+            with file:
+                pickle.dump(resolver, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(file.name, self._entry_path(resolver.cache_key))
+        except OSError as e:
+            self._disable(e)
+            return
+        finally:
+            # The temporary file is only left behind by a failed write
+            pathlib.Path(file.name).unlink(missing_ok=True)
+        self._sizes[resolver.cache_key] = self._size(resolver)
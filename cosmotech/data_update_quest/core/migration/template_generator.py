@@ -5,12 +5,95 @@
 # etc., to any person is prohibited unless it has been previously and
 # specifically authorized by written means by Cosmo Tech.
 
+import copy
 import json
 import yaml
 from typing import Dict, Any, List, Optional, Union
-from deepdiff import DeepDiff
 import os
 from datetime import datetime
+from functools import cached_property
+
+from cosmotech.data_update_quest.core.migration.change_plan import ChangePlan
+from cosmotech.data_update_quest.core.migration.change_plan import FieldAddition
+from cosmotech.data_update_quest.core.migration.change_plan import FieldRemoval
+from cosmotech.data_update_quest.core.migration.change_plan import TypeChange
+from cosmotech.data_update_quest.core.migration.schema_diff import PROPERTY_ADDED
+from cosmotech.data_update_quest.core.migration.schema_diff import PROPERTY_REMOVED
+from cosmotech.data_update_quest.core.migration.schema_diff import TYPE_CHANGED
+from cosmotech.data_update_quest.core.migration.schema_diff import diff_schemas
+
+
+# The C parser of libyaml is several times faster than the pure Python one
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+class ReferenceResolver:
+    """
+    Per-spec cache of resolved references.
+
+    Resolving a reference only depends on the references being resolved above it which it can reach again,
+    as they stop the resolution of cycles. Each referenced schema is thus resolved once per such cycle
+    context, which is always empty for schemas outside of a cycle. Resolved schemas are shared between
+    every place they are referenced from and must not be modified.
+    """
+
+    def __init__(self, openapi: Dict[str, Any]):
+        self.openapi = openapi
+        self._resolved: Dict[tuple, Dict[str, Any]] = {}
+        self._reachable: Dict[str, frozenset] = {}
+        self.models: Dict[str, Dict[str, Any]] = {}
+        # Key of the spec in the on-disk spec cache, if it was loaded through it
+        self.cache_key: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+
+    def reachable_refs(self, ref: str) -> frozenset:
+        """Get all the references that can be reached from a referenced schema, following references"""
+        if ref not in self._reachable:
+            reachable = set()
+            pending = [ref]
+            while pending:
+                schema = MigrationTemplateGenerator._extract_ref_schema(pending.pop(), self.openapi)
+                for child in self._iter_refs(schema):
+                    if child not in reachable:
+                        reachable.add(child)
+                        pending.append(child)
+            self._reachable[ref] = frozenset(reachable)
+        return self._reachable[ref]
+
+    @staticmethod
+    def _iter_refs(schema: Any):
+        pending = [schema]
+        while pending:
+            value = pending.pop()
+            if isinstance(value, dict):
+                if isinstance(value.get("$ref"), str):
+                    yield value["$ref"]
+                pending.extend(value.values())
+            elif isinstance(value, list):
+                pending.extend(value)
+
+    def resolve_ref(self, ref: str, resolved_refs: frozenset) -> Dict[str, Any]:
+        """
+        Resolve a referenced schema, reusing the result of a previous resolution in the same cycle context.
+
+        Args:
+            ref (str): The reference to resolve.
+            resolved_refs (frozenset): The references being resolved above this one.
+
+        Returns:
+            Dict[str, Any]: The referenced schema with all its references resolved.
+        """
+        key = (ref, resolved_refs & self.reachable_refs(ref))
+        if key in self._resolved:
+            self.hits += 1
+            return self._resolved[key]
+
+        self.misses += 1
+        ref_schema = MigrationTemplateGenerator._extract_ref_schema(ref, self.openapi)
+        resolved = MigrationTemplateGenerator._resolve_references(ref_schema, self.openapi, resolved_refs | {ref}, self)
+        self._resolved[key] = resolved
+        return resolved
 
 
 class MigrationTemplateGenerator:
@@ -25,44 +108,43 @@ class MigrationTemplateGenerator:
         target_openapi: Dict[str, Any],
         source_model_name: str,
         target_model_name: str,
+        source_resolver: Optional[ReferenceResolver] = None,
+        target_resolver: Optional[ReferenceResolver] = None,
     ):
-        """Initialize with OpenAPI schemas"""
-        # Extract schemas from OpenAPI
-        self.source_schema = self._extract_schema(source_openapi, source_model_name)
-        self.target_schema = self._extract_schema(target_openapi, target_model_name)
-
-        # Remove description fields before comparison
-        source_schema_no_desc = self._remove_descriptions(self.source_schema)
-        target_schema_no_desc = self._remove_descriptions(self.target_schema)
-
-        self.schema_diff = DeepDiff(source_schema_no_desc, target_schema_no_desc, ignore_order=True)
-
-    @staticmethod
-    def _remove_descriptions(schema: Dict[str, Any]) -> Dict[str, Any]:
-        """Remove all description fields from a schema recursively"""
-        if not isinstance(schema, dict):
-            return schema
-
-        result = {k: v for k, v in schema.items() if k != "description"}
-
-        for key, value in list(result.items()):
-            if isinstance(value, dict):
-                result[key] = MigrationTemplateGenerator._remove_descriptions(value)
-            elif isinstance(value, list):
-                result[key] = [
-                    MigrationTemplateGenerator._remove_descriptions(item) if isinstance(item, dict) else item
-                    for item in value
-                ]
+        """
+        Initialize with OpenAPI schemas.
 
-        return result
+        Resolvers can be given to share the resolved references of a spec between several generators.
+        """
+        # Extract schemas from OpenAPI, references of a spec are resolved once for both models
+        source_resolver = source_resolver or ReferenceResolver(source_openapi)
+        if target_resolver is None:
+            target_resolver = source_resolver if target_openapi is source_openapi else ReferenceResolver(target_openapi)
+        self.source_model_name = source_model_name
+        self.target_model_name = target_model_name
+        self.source_schema = self._extract_schema(source_openapi, source_model_name, source_resolver)
+        self.target_schema = self._extract_schema(target_openapi, target_model_name, target_resolver)
+
+        # Resolved schemas hold no description, only their properties are compared
+        self.schema_changes = diff_schemas(self.source_schema, self.target_schema)
 
     @staticmethod
     def _resolve_references(
-        schema: Dict[str, Any], openapi: Dict[str, Any], resolved_refs: Optional[set] = None
+        schema: Dict[str, Any],
+        openapi: Dict[str, Any],
+        resolved_refs: Optional[frozenset] = None,
+        resolver: Optional[ReferenceResolver] = None,
     ) -> Dict[str, Any]:
-        """Recursively resolve references in the schema"""
-        if resolved_refs is None:
-            resolved_refs = set()
+        """
+        Recursively resolve references in the schema.
+
+        `resolved_refs` holds the references being resolved above the schema, a reference to one of them
+        is a cycle and is not expanded again. Referenced schemas are resolved through `resolver`,
+        which keeps them for the next places they are referenced from.
+        """
+        resolved_refs = frozenset(resolved_refs or ())
+        if resolver is None:
+            resolver = ReferenceResolver(openapi)
 
         if not isinstance(schema, dict):
             return schema
@@ -75,13 +157,8 @@ class MigrationTemplateGenerator:
             if ref in resolved_refs:
                 return {k: v for k, v in schema.items() if k != "$ref"}
 
-            resolved_refs.add(ref)
-
-            # Extract referenced schema
-            ref_schema = MigrationTemplateGenerator._extract_ref_schema(ref, openapi)
-
-            # Recursively resolve references in the referenced schema
-            resolved_schema = MigrationTemplateGenerator._resolve_references(ref_schema, openapi, resolved_refs)
+            # Extract the referenced schema and recursively resolve its references, once per cycle context
+            resolved_schema = resolver.resolve_ref(ref, resolved_refs)
 
             # Merge any additional properties from the original schema, excluding description
             result = {k: v for k, v in schema.items() if k != "$ref" and k != "description"}
@@ -93,14 +170,17 @@ class MigrationTemplateGenerator:
             # Create a copy of the schema without allOf
             result = {k: v for k, v in schema.items() if k != "allOf"}
 
-            # Initialize merged properties and required fields
-            merged_properties = result.get("properties", {})
+            # Initialize required fields, the properties are copied as they are merged with the ones of allOf
+            if "properties" in result:
+                result["properties"] = dict(result["properties"])
             required_fields = set(result.get("required", []))
 
             # Process each schema in allOf
             for subschema in schema["allOf"]:
                 # Resolve references in the subschema
-                resolved_subschema = MigrationTemplateGenerator._resolve_references(subschema, openapi, resolved_refs)
+                resolved_subschema = MigrationTemplateGenerator._resolve_references(
+                    subschema, openapi, resolved_refs, resolver
+                )
 
                 # Merge properties
                 if "properties" in resolved_subschema:
@@ -146,18 +226,20 @@ class MigrationTemplateGenerator:
                 result["required"] = list(required_fields)
 
             # Continue processing the merged schema
-            return MigrationTemplateGenerator._resolve_references(result, openapi, resolved_refs)
+            return MigrationTemplateGenerator._resolve_references(result, openapi, resolved_refs, resolver)
 
         # Recursively process all properties, excluding description
         result = {}
         for key, value in schema.items():
             if key != "description":  # Skip description fields
                 if isinstance(value, dict):
-                    result[key] = MigrationTemplateGenerator._resolve_references(value, openapi, resolved_refs)
+                    result[key] = MigrationTemplateGenerator._resolve_references(
+                        value, openapi, resolved_refs, resolver
+                    )
                 elif isinstance(value, list):
                     result[key] = [
                         (
-                            MigrationTemplateGenerator._resolve_references(item, openapi, resolved_refs)
+                            MigrationTemplateGenerator._resolve_references(item, openapi, resolved_refs, resolver)
                             if isinstance(item, dict)
                             else item
                         )
@@ -183,60 +265,33 @@ class MigrationTemplateGenerator:
         raise ValueError(f"Unsupported reference format: {ref}")
 
     @staticmethod
-    def _extract_schema(openapi: Dict[str, Any], model_name: str) -> Dict[str, Any]:
-        """Extract schema from OpenAPI definition and resolve all references"""
+    def _extract_schema(
+        openapi: Dict[str, Any], model_name: str, resolver: Optional[ReferenceResolver] = None
+    ) -> Dict[str, Any]:
+        """Extract schema from OpenAPI definition and resolve all references, once per model with a resolver"""
+        if resolver is not None and model_name in resolver.models:
+            return resolver.models[model_name]
+
         # OpenAPI 3.x
         if "components" in openapi and "schemas" in openapi["components"]:
             if model_name in openapi["components"]["schemas"]:
                 schema = openapi["components"]["schemas"][model_name]
-                return MigrationTemplateGenerator._resolve_references(schema, openapi)
+                resolved = MigrationTemplateGenerator._resolve_references(schema, openapi, resolver=resolver)
+                if resolver is not None:
+                    resolver.models[model_name] = resolved
+                return resolved
 
         # OpenAPI/Swagger 2.x
         if "definitions" in openapi:
             if model_name in openapi["definitions"]:
                 schema = openapi["definitions"][model_name]
-                return MigrationTemplateGenerator._resolve_references(schema, openapi)
+                resolved = MigrationTemplateGenerator._resolve_references(schema, openapi, resolver=resolver)
+                if resolver is not None:
+                    resolver.models[model_name] = resolved
+                return resolved
 
         raise ValueError(f"Model {model_name} not found in OpenAPI definition")
 
-    @staticmethod
-    def _convert_path_to_dot_notation(path: str) -> str:
-        """
-        Convert a path from bracket notation to dot notation for jq.
-
-        Example:
-        "root['properties']['user']['properties']['address']['properties']['street']"
-        becomes "user.address.street"
-        """
-        # Extract all parts between ['properties'] and the next [ or end of string
-        parts = []
-        current_pos = 0
-
-        while True:
-            # Find the next ['properties'] occurrence
-            prop_start = path.find("['properties']", current_pos)
-            if prop_start == -1:
-                break
-
-            # Move past ['properties']
-            current_pos = prop_start + len("['properties']")
-
-            # Find the next property name
-            if current_pos < len(path) and path[current_pos:].startswith("['"):
-                # Extract the property name between quotes
-                name_start = path.find("'", current_pos) + 1
-                name_end = path.find("'", name_start)
-                if name_start > 0 and name_end > name_start:
-                    property_name = path[name_start:name_end]
-                    parts.append(property_name)
-                    current_pos = name_end + 2  # Move past the closing ']
-                else:
-                    # If we can't find a proper property name, break
-                    break
-
-        # Join parts with dots
-        return ".".join(parts)
-
     def _get_nested_default(self, path: str) -> Optional[Any]:
         """Get default value for a nested property path"""
         # Convert dot notation to a list of property names
@@ -277,93 +332,64 @@ class MigrationTemplateGenerator:
 
         return properties
 
-    def analyze_changes(self) -> Dict[str, List[Dict[str, Any]]]:
-        """Analyze schema differences and categorize them"""
-        changes = {
-            "removals": [],
-            "additions": [],
-            "type_changes": [],
-            "moves": [],  # For nested field restructuring
-        }
+    @cached_property
+    def change_plan(self) -> ChangePlan:
+        """The changes between both schemas, computed once and shared by all the generated outputs"""
+        removals = []
+        additions = []
 
         # Process removed fields
-        if "dictionary_item_removed" in self.schema_diff:
-            processed_fields = set()  # Track processed fields to avoid duplicates
-            for item in self.schema_diff["dictionary_item_removed"]:
-                if "['properties']" in item:
-                    field = self._convert_path_to_dot_notation(item)
-                    if (
-                        field and field not in processed_fields
-                    ):  # Only add if we extracted a valid field and haven't processed it yet
-                        # Add the top-level field
-                        changes["removals"].append({"field": field})
-                        processed_fields.add(field)
-
-                        # Check if this is an object reference
-                        field_schema = self._get_nested_schema_property(self.source_schema, field)
-                        if field_schema and isinstance(field_schema, dict) and "properties" in field_schema:
-                            # Extract all nested properties
-                            nested_props = self._extract_nested_properties(field_schema, field)
-                            for nested_prop in nested_props:
-                                if nested_prop not in processed_fields:
-                                    changes["removals"].append({"field": nested_prop})
-                                    processed_fields.add(nested_prop)
-
-        # Process added fields
-        if "dictionary_item_added" in self.schema_diff:
-            processed_fields = set()  # Track processed fields to avoid duplicates
-            for item in self.schema_diff["dictionary_item_added"]:
-                if "['properties']" in item:
-                    field = self._convert_path_to_dot_notation(item)
-                    if (
-                        field and field not in processed_fields
-                    ):  # Only add if we extracted a valid field and haven't processed it yet
-                        # Get default value if available
-                        default = self._get_nested_default(field)
-                        changes["additions"].append({"field": field, "default": default})
-                        processed_fields.add(field)
-
-                        # Check if this is an object reference
-                        field_schema = self._get_nested_schema_property(self.target_schema, field)
-                        if field_schema and isinstance(field_schema, dict) and "properties" in field_schema:
-                            # Extract all nested properties
-                            nested_props = self._extract_nested_properties(field_schema, field)
-                            for nested_prop in nested_props:
-                                if nested_prop not in processed_fields:
-                                    nested_default = self._get_nested_default(nested_prop)
-                                    changes["additions"].append({"field": nested_prop, "default": nested_default})
-                                    processed_fields.add(nested_prop)
+        processed_fields = set()  # Track processed fields to avoid duplicates
+        for change in self.schema_changes:
+            if change.kind == PROPERTY_REMOVED and change.path not in processed_fields:
+                # Add the top-level field
+                removals.append(FieldRemoval(change.path))
+                processed_fields.add(change.path)
+
+                # Check if this is an object reference, and extract all nested properties
+                for nested_prop in self._extract_nested_properties(change.source, change.path):
+                    if nested_prop not in processed_fields:
+                        removals.append(FieldRemoval(nested_prop))
+                        processed_fields.add(nested_prop)
+
+        # Process added fields, defaults are copied so the plan does not share them with the schemas
+        processed_fields = set()  # Track processed fields to avoid duplicates
+        for change in self.schema_changes:
+            if change.kind == PROPERTY_ADDED and change.path not in processed_fields:
+                # Get default value if available
+                default = self._get_nested_default(change.path)
+                additions.append(FieldAddition(change.path, copy.deepcopy(default)))
+                processed_fields.add(change.path)
+
+                # Check if this is an object reference, and extract all nested properties
+                for nested_prop in self._extract_nested_properties(change.target, change.path):
+                    if nested_prop not in processed_fields:
+                        nested_default = self._get_nested_default(nested_prop)
+                        additions.append(FieldAddition(nested_prop, copy.deepcopy(nested_default)))
+                        processed_fields.add(nested_prop)
 
         # Process type changes
-        if "type_changes" in self.schema_diff:
-            for path, change in self.schema_diff["type_changes"].items():
-                if "['properties']" in path and "['type']" in path:
-                    # Extract the path without the ['type'] part
-                    field_path = path.split("['type']")[0]
-                    field = self._convert_path_to_dot_notation(field_path)
-                    if field:  # Only add if we extracted a valid field
-                        changes["type_changes"].append(
-                            {"field": field, "old_type": change["old_value"], "new_type": change["new_value"]}
-                        )
-
-        return changes
-
-    def _get_nested_schema_property(self, schema: Dict[str, Any], path: str) -> Optional[Dict[str, Any]]:
-        """Get a nested property from a schema using a dot-notation path"""
-        parts = path.split(".")
-        current = schema
+        type_changes = [
+            TypeChange(change.path, change.old_type, change.new_type)
+            for change in self.schema_changes
+            if change.kind == TYPE_CHANGED
+        ]
 
-        for part in parts:
-            if "properties" in current and part in current["properties"]:
-                current = current["properties"][part]
-            else:
-                return None
+        return ChangePlan(
+            source_model=self.source_model_name,
+            target_model=self.target_model_name,
+            removals=tuple(removals),
+            additions=tuple(additions),
+            type_changes=tuple(type_changes),
+        )
 
-        return current
+    def analyze_changes(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Analyze schema differences and categorize them"""
+        return self.change_plan.to_dict()
 
     def generate_jq_script(self) -> str:
         """Generate jq transformation script with improved readability"""
-        changes = self.analyze_changes()
+        plan = self.change_plan
 
         jq_parts = []
 
@@ -373,26 +399,22 @@ class MigrationTemplateGenerator:
         jq_parts.append("")
 
         # Handle removals
-        if changes["removals"]:
+        if plan.removals:
             jq_parts.append("# Field removals")
-            for removal in changes["removals"]:
-                jq_parts.append(f"del(.{removal['field']})")
+            for removal in plan.removals:
+                jq_parts.append(removal.to_jq())
             jq_parts.append("")
 
         # Handle additions
-        if changes["additions"]:
+        if plan.additions:
             jq_parts.append("# Field additions")
-            for addition in changes["additions"]:
-                if addition["default"] is not None:
-                    default_json = json.dumps(addition["default"])
-                    jq_parts.append(f".{addition['field']} = {default_json}")
-                else:
-                    jq_parts.append(f".{addition['field']} = null")
+            for addition in plan.additions:
+                jq_parts.append(addition.to_jq())
             jq_parts.append("")
 
         # Format as multiline script with pipes
         if len(jq_parts) > 3:  # More than just the header comments
-            # Join non-comment lines with pipe
+            # Join non-comment lines with pipe, including across sections
             result = ""
             pipe_needed = False
 
@@ -404,30 +426,65 @@ class MigrationTemplateGenerator:
                     pipe_needed = True
                 else:
                     result += line + "\n"
-                    pipe_needed = False
 
             return result.strip()
 
         return "."  # Identity transform if no changes
 
+    def generate_json_plan(self) -> str:
+        """Generate the machine-readable JSON document of the change plan"""
+        return self.change_plan.to_json()
+
     @classmethod
     def from_openapi_files(
-        cls, source_path: str, target_path: str, source_model: str, target_model: str
+        cls,
+        source_path: str,
+        target_path: str,
+        source_model: str,
+        target_model: str,
+        cache_dir: Optional[str] = None,
     ) -> "MigrationTemplateGenerator":
-        """Create generator from OpenAPI files"""
-        source_openapi = cls._load_file(source_path)
-        target_openapi = cls._load_file(target_path)
+        """
+        Create generator from OpenAPI files.
 
-        return cls(source_openapi, target_openapi, source_model, target_model)
+        With a cache directory, the parsed specs and their resolved schemas are kept on disk
+        for the next runs on the same files.
+        """
+        if cache_dir is None:
+            source_openapi = cls._load_file(source_path)
+            target_openapi = cls._load_file(target_path)
+            return cls(source_openapi, target_openapi, source_model, target_model)
+
+        from cosmotech.data_update_quest.core.migration.spec_cache import SpecCache
+
+        cache = SpecCache(cache_dir)
+        source_resolver = cache.load(source_path)
+        target_resolver = cache.load(target_path)
+        generator = cls(
+            source_resolver.openapi,
+            target_resolver.openapi,
+            source_model,
+            target_model,
+            source_resolver=source_resolver,
+            target_resolver=target_resolver,
+        )
+        cache.save(source_resolver)
+        cache.save(target_resolver)
+        return generator
 
     @staticmethod
     def _load_file(file_path: str) -> Dict[str, Any]:
         """Load YAML or JSON file"""
-        with open(file_path, "r") as f:
-            if file_path.endswith(".json"):
-                return json.load(f)
-            else:  # Assume YAML
-                return yaml.safe_load(f)
+        with open(file_path, "rb") as f:
+            return MigrationTemplateGenerator._parse_content(f.read(), file_path)
+
+    @staticmethod
+    def _parse_content(content: bytes, file_path: str) -> Dict[str, Any]:
+        """Parse the content of a YAML or JSON file, with the C YAML parser when libyaml is available"""
+        if str(file_path).endswith(".json"):
+            return json.loads(content)
+        else:  # Assume YAML
+            return yaml.load(content, Loader=YamlLoader)
 
     def save_all_templates(self, output_dir: str):
         """Generate and save all templates to files"""
@@ -443,9 +500,13 @@ class MigrationTemplateGenerator:
         with open(os.path.join(output_dir, "README.md"), "w") as f:
             f.write(readme)
 
+        # Save the change plan for the tools that do not read the jq script
+        with open(os.path.join(output_dir, "plan.json"), "w") as f:
+            f.write(self.generate_json_plan())
+
     def _generate_readme(self) -> str:
         """Generate a README explaining how to use the generated templates"""
-        changes = self.analyze_changes()
+        plan = self.change_plan
 
         sections = [
             "# Data Migration Templates",
@@ -454,23 +515,23 @@ class MigrationTemplateGenerator:
         ]
 
         # Summarize changes
-        if changes["removals"]:
+        if plan.removals:
             sections.append("### Field Removals")
-            for removal in changes["removals"]:
-                sections.append(f"- `{removal['field']}`")
+            for removal in plan.removals:
+                sections.append(f"- `{removal.field}`")
             sections.append("")
 
-        if changes["additions"]:
+        if plan.additions:
             sections.append("### Field Additions")
-            for addition in changes["additions"]:
-                default_str = f" (default: `{addition['default']}`)" if addition["default"] is not None else ""
-                sections.append(f"- `{addition['field']}`{default_str}")
+            for addition in plan.additions:
+                default_str = f" (default: `{addition.default}`)" if addition.default is not None else ""
+                sections.append(f"- `{addition.field}`{default_str}")
             sections.append("")
 
-        if changes["type_changes"]:
+        if plan.type_changes:
             sections.append("### Type Changes")
-            for change in changes["type_changes"]:
-                sections.append(f"- `{change['field']}`: {change['old_type']} → {change['new_type']}")
+            for change in plan.type_changes:
+                sections.append(f"- `{change.field}`: {change.old_type} → {change.new_type}")
             sections.append("")
 
         # Add usage instructions
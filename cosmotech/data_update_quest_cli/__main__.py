@@ -8,14 +8,45 @@
 from cosmotech.orchestrator.utils.translate import T
 from cosmotech.data_update_quest_cli.utils.click import click
 import click_log
-from cosmotech.csm_data.utils.decorators import translate_help
 from cosmotech.data_update_quest import __version__
+from cosmotech.data_update_quest_cli.utils.lazy_group import LazyGroup
 from cosmotech.data_update_quest_cli.utils.logger import LOGGER
 
-from cosmotech.data_update_quest_cli.template_generator.generate import generate_templates
-from cosmotech.data_update_quest_cli.database.redis_dump import redis_dump_command
-from cosmotech.data_update_quest_cli.database.redis_list_index import redis_list_index_command
-from cosmotech.data_update_quest_cli.database.redis_file_upload import redis_file_upload_command
+# Subcommand modules are only imported when their subcommand is run
+SUBCOMMANDS = {
+    "generate-templates": (
+        "cosmotech.data_update_quest_cli.template_generator.generate:generate_templates",
+        "data_update_quest.commands.generate_templates.description",
+    ),
+    "apply-template": (
+        "cosmotech.data_update_quest_cli.migration.apply_template:apply_template_command",
+        "data_update_quest.commands.apply_template.description",
+    ),
+    "estimate": (
+        "cosmotech.data_update_quest_cli.migration.estimate:estimate_command",
+        "data_update_quest.commands.estimate.description",
+    ),
+    "redis-dump": (
+        "cosmotech.data_update_quest_cli.database.redis_dump:redis_dump_command",
+        "data_update_quest.commands.redis_dump.description",
+    ),
+    "redis-list-index": (
+        "cosmotech.data_update_quest_cli.database.redis_list_index:redis_list_index_command",
+        None,
+    ),
+    "redis-file-upload": (
+        "cosmotech.data_update_quest_cli.database.redis_file_upload:redis_file_upload_command",
+        "data_update_quest.commands.redis_file_upload.description",
+    ),
+    "redis-migrate": (
+        "cosmotech.data_update_quest_cli.database.redis_migrate:redis_migrate_command",
+        "data_update_quest.commands.redis_migrate.description",
+    ),
+    "redis-verify": (
+        "cosmotech.data_update_quest_cli.database.redis_verify:redis_verify_command",
+        "data_update_quest.commands.redis_verify.description",
+    ),
+}
 
 
 def print_version(ctx, param, value):
@@ -25,7 +56,13 @@ def print_version(ctx, param, value):
     ctx.exit()
 
 
-@click.group("csm-data", invoke_without_command=True)
+@click.group(
+    "csm-data",
+    cls=LazyGroup,
+    lazy_subcommands=SUBCOMMANDS,
+    invoke_without_command=True,
+    help=T("data_update_quest.commands.main.description"),
+)
 @click.pass_context
 @click_log.simple_verbosity_option(LOGGER, "--log-level", envvar="LOG_LEVEL", show_envvar=True)
 @click.option(
@@ -36,16 +73,75 @@ def print_version(ctx, param, value):
     is_eager=True,
     help=T("data_update_quest.commands.main.parameters.version"),
 )
-@translate_help("data_update_quest.commands.main.description")
-def main(ctx):
+@click.option(
+    "--metrics",
+    "metrics_path",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    envvar="CSM_DUQ_METRICS",
+    help=T("data_update_quest.commands.main.parameters.metrics"),
+)
+@click.option(
+    "--metrics-format",
+    type=click.Choice(["json", "prometheus"]),
+    default="json",
+    envvar="CSM_DUQ_METRICS_FORMAT",
+    help=T("data_update_quest.commands.main.parameters.metrics_format"),
+)
+@click.option(
+    "--profile",
+    "profile_path",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    envvar="CSM_DUQ_PROFILE",
+    help=T("data_update_quest.commands.main.parameters.profile"),
+)
+@click.option(
+    "--json-codec",
+    type=click.Choice(["auto", "orjson", "stdlib"]),
+    default=None,
+    envvar="CSM_DUQ_JSON_CODEC",
+    help=T("data_update_quest.commands.main.parameters.json_codec"),
+)
+def main(ctx, metrics_path, metrics_format, profile_path, json_codec):
     if ctx.invoked_subcommand is None:
         click.echo(T("data_update_quest.commands.main.content").format(version=__version__))
+        return
+
+    if json_codec:
+        from cosmotech.data_update_quest.core.codec import set_codec
+
+        try:
+            set_codec(json_codec)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="--json-codec")
+
+    # Both hooks are imported on demand, so they add nothing to the startup of the CLI when unused
+    if metrics_path:
+        from cosmotech.data_update_quest.core.metrics import METRICS
+
+        METRICS.enabled = True
+
+        def write_metrics():
+            METRICS.write(metrics_path, metrics_format)
+            LOGGER.info(T("data_update_quest.core.metrics.metrics_written").format(file_path=metrics_path))
+
+        ctx.call_on_close(write_metrics)
+
+    if profile_path:
+        import cProfile
+
+        profiler = cProfile.Profile()
+
+        def write_profile():
+            profiler.disable()
+            profiler.dump_stats(profile_path)
+            LOGGER.info(T("data_update_quest.core.metrics.profile_written").format(file_path=profile_path))
 
+        # Callbacks run in reverse order, so the profile is stopped before the metrics are written
+        ctx.call_on_close(write_profile)
+        profiler.enable()
 
-main.add_command(generate_templates, name="generate-templates")
-main.add_command(redis_dump_command, name="redis-dump")
-main.add_command(redis_list_index_command, name="redis-list-index")
-main.add_command(redis_file_upload_command, name="redis-file-upload")
 
 if __name__ == "__main__":
     main()
@@ -11,12 +11,16 @@ from cosmotech.csm_data.utils.decorators import translate_help
 from cosmotech.orchestrator.utils.translate import T
 
 from cosmotech.data_update_quest_cli.utils.click import click
+from cosmotech.data_update_quest_cli.utils.decorators import checkpoint_parameters
+from cosmotech.data_update_quest_cli.utils.decorators import engine_parameter
 from cosmotech.data_update_quest_cli.utils.decorators import redis_connection_parameters
+from cosmotech.data_update_quest_cli.utils.decorators import workers_parameter
 from cosmotech.data_update_quest_cli.utils.logger import LOGGER
 
 
 @click.command("redis_dump")
 @click.option(
+    "--file-path",
     "--file_path",
     "-f",
     type=click.Path(dir_okay=True, readable=True),
@@ -25,6 +29,7 @@ from cosmotech.data_update_quest_cli.utils.logger import LOGGER
     required=True,
 )
 @click.option(
+    "--index-list",
     "--index_list",
     "-i",
     type=str,
@@ -32,10 +37,70 @@ from cosmotech.data_update_quest_cli.utils.logger import LOGGER
     multiple=True,
     help=T("data_update_quest.commands.redis_dump.parameters.index_list"),
 )
+@click.option(
+    "--page-size",
+    "--page_size",
+    type=click.IntRange(min=1),
+    default=1000,
+    envvar="REDIS_PAGE_SIZE",
+    help=T("data_update_quest.commands.redis_dump.parameters.page_size"),
+)
+@click.option(
+    "--format",
+    "dump_format",
+    type=click.Choice(["directory", "ndjson"]),
+    default="directory",
+    envvar="REDIS_DUMP_FORMAT",
+    help=T("data_update_quest.commands.redis_dump.parameters.format"),
+)
+@click.option(
+    "--compression",
+    type=click.Choice(["none", "gzip", "zstd"]),
+    default="none",
+    envvar="REDIS_DUMP_COMPRESSION",
+    help=T("data_update_quest.commands.redis_dump.parameters.compression"),
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    default=False,
+    help=T("data_update_quest.commands.redis_dump.parameters.incremental"),
+)
+@workers_parameter
+@engine_parameter
 @redis_connection_parameters
+@checkpoint_parameters
 @translate_help("data_update_quest.commands.redis_dump.description")
-def redis_dump_command(file_path, password, host, port, index_list: Optional[tuple]):
+def redis_dump_command(
+    file_path,
+    password,
+    host,
+    port,
+    index_list: Optional[tuple],
+    page_size: int,
+    dump_format: str,
+    compression: str,
+    workers: int,
+    resume: bool,
+    journal_path: Optional[str],
+    engine: str,
+    incremental: bool,
+):
     from cosmotech.data_update_quest.core.database.redis.client import redis_dump
 
-    redis_dump(file_path=file_path, host=host, port=port, password=password, index_list=index_list)
+    redis_dump(
+        file_path=file_path,
+        host=host,
+        port=port,
+        password=password,
+        index_list=index_list,
+        page_size=page_size,
+        workers=workers,
+        dump_format=dump_format,
+        compression=compression,
+        resume=resume,
+        journal_path=journal_path,
+        engine=engine,
+        incremental=incremental,
+    )
     LOGGER.info(T("data_update_quest.core.redis_dump.file_saved").format(file_path=file_path))
@@ -9,11 +9,16 @@ from cosmotech.csm_data.utils.decorators import translate_help
 from cosmotech.orchestrator.utils.translate import T
 
 from cosmotech.data_update_quest_cli.utils.click import click
+from cosmotech.data_update_quest_cli.utils.decorators import checkpoint_parameters
+from cosmotech.data_update_quest_cli.utils.decorators import engine_parameter
 from cosmotech.data_update_quest_cli.utils.decorators import redis_connection_parameters
+from cosmotech.data_update_quest_cli.utils.decorators import workers_parameter
+from cosmotech.data_update_quest_cli.utils.logger import LOGGER
 
 
 @click.command("redis_file_upload")
 @click.option(
+    "--file-path",
     "--file_path",
     "-f",
     type=click.Path(dir_okay=True, readable=True),
@@ -21,9 +26,59 @@ from cosmotech.data_update_quest_cli.utils.decorators import redis_connection_pa
     help=T("data_update_quest.commands.redis_file_upload.parameters.file_path"),
     required=True,
 )
+@click.option(
+    "--batch-size",
+    "--batch_size",
+    type=click.IntRange(min=1),
+    default=500,
+    envvar="REDIS_BATCH_SIZE",
+    help=T("data_update_quest.commands.redis_file_upload.parameters.batch_size"),
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    default=False,
+    help=T("data_update_quest.commands.redis_file_upload.parameters.incremental"),
+)
+@click.option(
+    "--validate",
+    is_flag=True,
+    default=False,
+    help=T("data_update_quest.commands.redis_file_upload.parameters.validate"),
+)
+@workers_parameter
+@engine_parameter
 @redis_connection_parameters
+@checkpoint_parameters
 @translate_help("data_update_quest.commands.redis_file_upload.description")
-def redis_file_upload_command(file_path, password, host, port):
+def redis_file_upload_command(
+    file_path,
+    password,
+    host,
+    port,
+    batch_size: int,
+    workers: int,
+    resume: bool,
+    journal_path,
+    engine: str,
+    incremental: bool,
+    validate: bool,
+):
     from cosmotech.data_update_quest.core.database.redis.client import file_upload
 
-    file_upload(file_path=file_path, host=host, port=port, password=password)
+    failed_keys = file_upload(
+        file_path=file_path,
+        host=host,
+        port=port,
+        password=password,
+        batch_size=batch_size,
+        workers=workers,
+        resume=resume,
+        journal_path=journal_path,
+        engine=engine,
+        incremental=incremental,
+        validate=validate,
+    )
+    if failed_keys:
+        LOGGER.error(T("data_update_quest.core.redis_file_upload.upload_failed").format(count=len(failed_keys)))
+        click.get_current_context().exit(1)
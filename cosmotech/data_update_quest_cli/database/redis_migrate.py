@@ -0,0 +1,86 @@
+# Copyright (C) - 2025 - Cosmo Tech
+# This document and all information contained herein is the exclusive property -
+# including all intellectual property rights pertaining thereto - of Cosmo Tech.
+# Any use, reproduction, translation, broadcasting, transmission, distribution,
+# etc., to any person is prohibited unless it has been previously and
+# specifically authorized by written means by Cosmo Tech.
+
+from typing import Optional
+
+from cosmotech.csm_data.utils.decorators import translate_help
+from cosmotech.orchestrator.utils.translate import T
+
+from cosmotech.data_update_quest_cli.utils.click import click
+from cosmotech.data_update_quest_cli.utils.decorators import checkpoint_parameters
+from cosmotech.data_update_quest_cli.utils.decorators import redis_connection_parameters
+from cosmotech.data_update_quest_cli.utils.decorators import workers_parameter
+from cosmotech.data_update_quest_cli.utils.logger import LOGGER
+
+
+@click.command("redis_migrate")
+@click.option(
+    "--template",
+    "-t",
+    type=click.Path(exists=True, dir_okay=False, readable=True),
+    multiple=True,
+    help=T("data_update_quest.commands.redis_migrate.parameters.template"),
+    required=True,
+)
+@click.option(
+    "--index-list",
+    "--index_list",
+    "--index",
+    "-i",
+    type=str,
+    default=None,
+    multiple=True,
+    help=T("data_update_quest.commands.redis_migrate.parameters.index_list"),
+)
+@click.option(
+    "--batch-size",
+    "--batch_size",
+    type=click.IntRange(min=1),
+    default=500,
+    envvar="REDIS_BATCH_SIZE",
+    help=T("data_update_quest.commands.redis_migrate.parameters.batch_size"),
+)
+@click.option(
+    "--dry-run",
+    "--dry_run",
+    is_flag=True,
+    default=False,
+    help=T("data_update_quest.commands.redis_migrate.parameters.dry_run"),
+)
+@workers_parameter
+@redis_connection_parameters
+@checkpoint_parameters
+@translate_help("data_update_quest.commands.redis_migrate.description")
+def redis_migrate_command(
+    template,
+    password,
+    host,
+    port,
+    index_list: Optional[tuple],
+    batch_size: int,
+    dry_run: bool,
+    workers: int,
+    resume: bool,
+    journal_path: Optional[str],
+):
+    from cosmotech.data_update_quest.core.migration.redis_migration import redis_migrate
+
+    summary = redis_migrate(
+        template_file=list(template),
+        host=host,
+        port=port,
+        password=password,
+        index_list=index_list,
+        batch_size=batch_size,
+        workers=workers,
+        dry_run=dry_run,
+        resume=resume,
+        journal_path=journal_path,
+    )
+    if summary["failed"]:
+        LOGGER.error(T("data_update_quest.core.redis_migrate.migrate_failed").format(count=len(summary["failed"])))
+        click.get_current_context().exit(1)
@@ -0,0 +1,93 @@
+# Copyright (C) - 2025 - Cosmo Tech
+# This document and all information contained herein is the exclusive property -
+# including all intellectual property rights pertaining thereto - of Cosmo Tech.
+# Any use, reproduction, translation, broadcasting, transmission, distribution,
+# etc., to any person is prohibited unless it has been previously and
+# specifically authorized by written means by Cosmo Tech.
+
+import json
+from typing import Optional
+
+from cosmotech.csm_data.utils.decorators import translate_help
+from cosmotech.orchestrator.utils.translate import T
+
+from cosmotech.data_update_quest_cli.utils.click import click
+from cosmotech.data_update_quest_cli.utils.decorators import redis_connection_parameters
+from cosmotech.data_update_quest_cli.utils.decorators import workers_parameter
+from cosmotech.data_update_quest_cli.utils.logger import LOGGER
+
+
+@click.command("redis_verify")
+@click.option(
+    "--file-path",
+    "--file_path",
+    "-f",
+    type=click.Path(exists=True, file_okay=False, readable=True),
+    envvar="REDIS_FILE_PATH",
+    help=T("data_update_quest.commands.redis_verify.parameters.file_path"),
+    required=True,
+)
+@click.option(
+    "--index-list",
+    "--index_list",
+    "--index",
+    "-i",
+    type=str,
+    default=None,
+    multiple=True,
+    help=T("data_update_quest.commands.redis_verify.parameters.index_list"),
+)
+@click.option(
+    "--template",
+    "-t",
+    type=click.Path(exists=True, dir_okay=False, readable=True),
+    multiple=True,
+    help=T("data_update_quest.commands.redis_verify.parameters.template"),
+)
+@click.option(
+    "--batch-size",
+    "--batch_size",
+    type=click.IntRange(min=1),
+    default=500,
+    envvar="REDIS_BATCH_SIZE",
+    help=T("data_update_quest.commands.redis_verify.parameters.batch_size"),
+)
+@click.option(
+    "--report",
+    "report_path",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help=T("data_update_quest.commands.redis_verify.parameters.report"),
+)
+@workers_parameter
+@redis_connection_parameters
+@translate_help("data_update_quest.commands.redis_verify.description")
+def redis_verify_command(
+    file_path,
+    password,
+    host,
+    port,
+    index_list: Optional[tuple],
+    template: tuple,
+    batch_size: int,
+    report_path: Optional[str],
+    workers: int,
+):
+    from cosmotech.data_update_quest.core.database.redis.verify import redis_verify
+
+    report = redis_verify(
+        file_path=file_path,
+        host=host,
+        port=port,
+        password=password,
+        index_list=index_list,
+        template_files=list(template),
+        batch_size=batch_size,
+        workers=workers,
+    )
+    if report_path:
+        with open(report_path, "w") as file:
+            json.dump(report, file, indent=2)
+    if report["mismatches"]:
+        LOGGER.error(T("data_update_quest.core.redis_verify.verify_failed").format(count=report["mismatches"]))
+        click.get_current_context().exit(1)
@@ -0,0 +1,78 @@
+# Copyright (C) - 2025 - Cosmo Tech
+# This document and all information contained herein is the exclusive property -
+# including all intellectual property rights pertaining thereto - of Cosmo Tech.
+# Any use, reproduction, translation, broadcasting, transmission, distribution,
+# etc., to any person is prohibited unless it has been previously and
+# specifically authorized by written means by Cosmo Tech.
+
+from typing import Optional
+
+from cosmotech.csm_data.utils.decorators import translate_help
+from cosmotech.orchestrator.utils.translate import T
+
+from cosmotech.data_update_quest_cli.utils.click import click
+from cosmotech.data_update_quest_cli.utils.decorators import checkpoint_parameters
+from cosmotech.data_update_quest_cli.utils.logger import LOGGER
+
+
+@click.command("apply-template")
+@click.argument("template_path", type=click.Path(exists=True, dir_okay=False, readable=True))
+@click.argument("input_path", type=click.Path(exists=True, readable=True))
+@click.argument("output_path", type=click.Path(writable=True))
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    envvar="CSM_DUQ_WORKERS",
+    help=T("data_update_quest.commands.apply_template.parameters.workers"),
+)
+@click.option(
+    "--chunk-size",
+    type=click.IntRange(min=1),
+    default=200,
+    help=T("data_update_quest.commands.apply_template.parameters.chunk_size"),
+)
+@click.option(
+    "--then",
+    "next_templates",
+    type=click.Path(exists=True, dir_okay=False, readable=True),
+    multiple=True,
+    help=T("data_update_quest.commands.apply_template.parameters.then"),
+)
+@checkpoint_parameters
+@translate_help("data_update_quest.commands.apply_template.description")
+def apply_template_command(
+    template_path: str,
+    input_path: str,
+    output_path: str,
+    workers: Optional[int],
+    chunk_size: int,
+    next_templates: tuple[str],
+    resume: bool,
+    journal_path: Optional[str],
+):
+    from cosmotech.data_update_quest.core.migration.apply_batch import apply_template_batch
+
+    summary = apply_template_batch(
+        [template_path, *next_templates],
+        input_path,
+        output_path,
+        workers=workers,
+        chunk_size=chunk_size,
+        resume=resume,
+        journal_path=journal_path,
+    )
+
+    for failure in summary["failed"]:
+        LOGGER.error(
+            T("data_update_quest.commands.apply_template.failure").format(
+                source=failure["source"], error=failure["error"]
+            )
+        )
+    LOGGER.info(
+        T("data_update_quest.commands.apply_template.summary").format(
+            succeeded=summary["succeeded"], failed=len(summary["failed"]), duration=summary["duration"]
+        )
+    )
+    if summary["failed"]:
+        click.get_current_context().exit(1)
@@ -0,0 +1,92 @@
+# Copyright (C) - 2025 - Cosmo Tech
+# This document and all information contained herein is the exclusive property -
+# including all intellectual property rights pertaining thereto - of Cosmo Tech.
+# Any use, reproduction, translation, broadcasting, transmission, distribution,
+# etc., to any person is prohibited unless it has been previously and
+# specifically authorized by written means by Cosmo Tech.
+
+from typing import Optional
+
+from cosmotech.csm_data.utils.decorators import translate_help
+from cosmotech.orchestrator.utils.translate import T
+
+from cosmotech.data_update_quest_cli.utils.click import click
+from cosmotech.data_update_quest_cli.utils.decorators import redis_connection_parameters
+from cosmotech.data_update_quest_cli.utils.decorators import workers_parameter
+
+
+@click.command("estimate")
+@click.option(
+    "--template",
+    "-t",
+    type=click.Path(exists=True, dir_okay=False, readable=True),
+    multiple=True,
+    help=T("data_update_quest.commands.estimate.parameters.template"),
+    required=True,
+)
+@click.option(
+    "--index-list",
+    "--index_list",
+    "--index",
+    "-i",
+    type=str,
+    default=None,
+    multiple=True,
+    help=T("data_update_quest.commands.estimate.parameters.index_list"),
+)
+@click.option(
+    "--sample-size",
+    "--sample_size",
+    type=click.IntRange(min=1),
+    default=100,
+    help=T("data_update_quest.commands.estimate.parameters.sample_size"),
+)
+@click.option(
+    "--dump-path",
+    "--dump_path",
+    type=click.Path(exists=True, file_okay=False, readable=True),
+    default=None,
+    help=T("data_update_quest.commands.estimate.parameters.dump_path"),
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help=T("data_update_quest.commands.estimate.parameters.output"),
+)
+@workers_parameter
+@redis_connection_parameters(password_required=False)
+@translate_help("data_update_quest.commands.estimate.description")
+def estimate_command(
+    template,
+    password,
+    host,
+    port,
+    index_list: Optional[tuple],
+    sample_size: int,
+    dump_path: Optional[str],
+    output: Optional[str],
+    workers: int,
+):
+    import json
+
+    # Dump directories are sampled without connecting to redis
+    if dump_path is None and password is None:
+        raise click.UsageError(T("data_update_quest.commands.estimate.password_required"))
+
+    from cosmotech.data_update_quest.core.migration.estimate import estimate
+
+    estimates = estimate(
+        template_file=list(template),
+        host=host,
+        port=port,
+        password=password,
+        index_list=index_list,
+        sample_size=sample_size,
+        workers=workers,
+        dump_path=dump_path,
+    )
+    if output:
+        with open(output, "w") as file:
+            json.dump(estimates, file, indent=2)
@@ -5,6 +5,8 @@
 # etc., to any person is prohibited unless it has been previously and
 # specifically authorized by written means by Cosmo Tech.
 
+from typing import Optional
+
 from cosmotech.csm_data.utils.decorators import translate_help
 from cosmotech.orchestrator.utils.translate import T
 
@@ -15,19 +17,89 @@ from cosmotech.data_update_quest_cli.utils.logger import LOGGER
 @click.command("generate-templates")
 @click.argument("source_path", type=click.Path(exists=True, dir_okay=False, readable=True))
 @click.argument("target_path", type=click.Path(exists=True, dir_okay=False, readable=True))
-@click.argument("source_model", type=str)
-@click.argument("target_model", type=str)
+@click.argument("source_model", type=str, required=False)
+@click.argument("target_model", type=str, required=False)
 @click.option(
     "--output-dir",
     type=click.Path(file_okay=False, writable=True, readable=True),
     default=".",
     help=T("data_update_quest.commands.generate_templates.parameters.output_dir"),
 )
+@click.option(
+    "--all-models",
+    is_flag=True,
+    default=False,
+    help=T("data_update_quest.commands.generate_templates.parameters.all_models"),
+)
+@click.option(
+    "--mapping",
+    type=click.Path(exists=True, dir_okay=False, readable=True),
+    default=None,
+    help=T("data_update_quest.commands.generate_templates.parameters.mapping"),
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    envvar="CSM_DUQ_WORKERS",
+    help=T("data_update_quest.commands.generate_templates.parameters.workers"),
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, writable=True),
+    default=None,
+    envvar="CSM_DUQ_CACHE_DIR",
+    help=T("data_update_quest.commands.generate_templates.parameters.cache_dir"),
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help=T("data_update_quest.commands.generate_templates.parameters.no_cache"),
+)
 @translate_help("data_update_quest.commands.generate_templates.description")
-def generate_templates(source_path: str, target_path: str, source_model: str, target_model: str, output_dir: str):
+def generate_templates(
+    source_path: str,
+    target_path: str,
+    source_model: Optional[str],
+    target_model: Optional[str],
+    output_dir: str,
+    all_models: bool,
+    mapping: Optional[str],
+    workers: Optional[int],
+    cache_dir: Optional[str],
+    no_cache: bool,
+):
+    from cosmotech.data_update_quest.core.migration.spec_cache import get_default_cache_dir
+
+    if no_cache:
+        cache_dir = None
+    elif cache_dir is None:
+        cache_dir = get_default_cache_dir()
+
+    if all_models:
+        from cosmotech.data_update_quest.core.migration.generate_batch import generate_all_templates
+
+        summary = generate_all_templates(
+            source_path, target_path, output_dir, mapping_file=mapping, workers=workers, cache_dir=cache_dir
+        )
+        LOGGER.info(
+            T("data_update_quest.commands.generate_templates.all_models_summary").format(
+                generated=len(summary["generated"]), failed=len(summary["failed"]), output_dir=summary["output_dir"]
+            )
+        )
+        if summary["failed"]:
+            click.get_current_context().exit(1)
+        return
+
+    if source_model is None or target_model is None:
+        raise click.UsageError(T("data_update_quest.commands.generate_templates.models_required"))
+
     from cosmotech.data_update_quest.core.migration.template_generator import MigrationTemplateGenerator
 
-    generator = MigrationTemplateGenerator.from_openapi_files(source_path, target_path, source_model, target_model)
+    generator = MigrationTemplateGenerator.from_openapi_files(
+        source_path, target_path, source_model, target_model, cache_dir=cache_dir
+    )
 
     # Save all templates to the specified output directory
     generator.save_all_templates(output_dir)
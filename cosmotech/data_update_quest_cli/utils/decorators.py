@@ -5,14 +5,24 @@
 # etc., to any person is prohibited unless it has been previously and
 # specifically authorized by written means by Cosmo Tech.
 
+"""
+Decorators adding shared options to the commands.
+
+In each decorator the options are stacked above `@wraps(func)`, so they are applied after it and added to
+the parameters of the command that `wraps` copies along with `__click_params__`, instead of being replaced by them.
+"""
+
 from functools import wraps
 
 from cosmotech.orchestrator.utils.translate import T
 from cosmotech.data_update_quest_cli.utils.click import click
 
 
-def redis_connection_parameters(func):
-    @wraps(func)
+def redis_connection_parameters(func=None, *, password_required: bool = True):
+    # Used as @redis_connection_parameters(password_required=False) by commands that do not always connect to redis
+    if func is None:
+        return lambda decorated: redis_connection_parameters(decorated, password_required=password_required)
+
     @click.option(
         "--host", type=str, default="localhost", envvar="REDIS_HOST", help=T("data_update_quest.commands.redis.host")
     )
@@ -25,8 +35,139 @@ def redis_connection_parameters(func):
         type=str,
         envvar="REDIS_SECRET",
         help=T("data_update_quest.commands.redis.password"),
-        required=True,
+        required=password_required,
+    )
+    @click.option(
+        "--unix-socket",
+        type=click.Path(dir_okay=False),
+        default=None,
+        envvar="REDIS_UNIX_SOCKET",
+        help=T("data_update_quest.commands.redis.unix_socket"),
+    )
+    @click.option(
+        "--max-connections",
+        type=click.IntRange(min=1),
+        default=None,
+        envvar="REDIS_MAX_CONNECTIONS",
+        help=T("data_update_quest.commands.redis.max_connections"),
     )
+    @click.option(
+        "--socket-timeout",
+        type=click.FloatRange(min=0, min_open=True),
+        default=None,
+        envvar="REDIS_SOCKET_TIMEOUT",
+        help=T("data_update_quest.commands.redis.socket_timeout"),
+    )
+    @click.option(
+        "--connect-timeout",
+        "socket_connect_timeout",
+        type=click.FloatRange(min=0, min_open=True),
+        default=None,
+        envvar="REDIS_CONNECT_TIMEOUT",
+        help=T("data_update_quest.commands.redis.connect_timeout"),
+    )
+    @click.option(
+        "--keepalive/--no-keepalive",
+        "socket_keepalive",
+        default=False,
+        envvar="REDIS_KEEPALIVE",
+        help=T("data_update_quest.commands.redis.keepalive"),
+    )
+    @click.option(
+        "--retry-on-timeout",
+        is_flag=True,
+        default=False,
+        envvar="REDIS_RETRY_ON_TIMEOUT",
+        help=T("data_update_quest.commands.redis.retry_on_timeout"),
+    )
+    @click.option(
+        "--tls", is_flag=True, default=False, envvar="REDIS_TLS", help=T("data_update_quest.commands.redis.tls")
+    )
+    @click.option(
+        "--tls-ca-cert",
+        type=click.Path(exists=True, dir_okay=False),
+        default=None,
+        envvar="REDIS_TLS_CA_CERT",
+        help=T("data_update_quest.commands.redis.tls_ca_cert"),
+    )
+    @click.option(
+        "--tls-cert",
+        type=click.Path(exists=True, dir_okay=False),
+        default=None,
+        envvar="REDIS_TLS_CERT",
+        help=T("data_update_quest.commands.redis.tls_cert"),
+    )
+    @click.option(
+        "--tls-key",
+        type=click.Path(exists=True, dir_okay=False),
+        default=None,
+        envvar="REDIS_TLS_KEY",
+        help=T("data_update_quest.commands.redis.tls_key"),
+    )
+    @click.option(
+        "--tls-verify/--tls-no-verify",
+        default=True,
+        envvar="REDIS_TLS_VERIFY",
+        help=T("data_update_quest.commands.redis.tls_verify"),
+    )
+    @wraps(func)
+    def f(*args, **kwargs):
+        from cosmotech.data_update_quest.core.database.redis.connection import DEFAULT_CLIENT_OPTIONS
+        from cosmotech.data_update_quest.core.database.redis.connection import configure_redis_client
+
+        # The connection settings are shared by every client of the command, only host, port and password
+        # are passed on to the command
+        configure_redis_client(**{key: kwargs.pop(key) for key in DEFAULT_CLIENT_OPTIONS})
+        return func(*args, **kwargs)
+
+    return f
+
+
+def workers_parameter(func):
+    @click.option(
+        "--workers",
+        type=click.IntRange(min=1),
+        default=1,
+        envvar="CSM_DUQ_WORKERS",
+        help=T("data_update_quest.commands.redis.workers"),
+    )
+    @wraps(func)
+    def f(*args, **kwargs):
+        return func(*args, **kwargs)
+
+    return f
+
+
+def engine_parameter(func):
+    @click.option(
+        "--engine",
+        type=click.Choice(["sync", "async"]),
+        default="sync",
+        envvar="CSM_DUQ_ENGINE",
+        help=T("data_update_quest.commands.redis.engine"),
+    )
+    @wraps(func)
+    def f(*args, **kwargs):
+        return func(*args, **kwargs)
+
+    return f
+
+
+def checkpoint_parameters(func):
+    @click.option(
+        "--resume",
+        is_flag=True,
+        default=False,
+        help=T("data_update_quest.commands.checkpoint.resume"),
+    )
+    @click.option(
+        "--journal",
+        "journal_path",
+        type=click.Path(dir_okay=False, writable=True),
+        default=None,
+        help=T("data_update_quest.commands.checkpoint.journal"),
+    )
+    @wraps(func)
     def f(*args, **kwargs):
         return func(*args, **kwargs)
 
@@ -0,0 +1,58 @@
+# Copyright (C) - 2025 - Cosmo Tech
+# This document and all information contained herein is the exclusive property -
+# including all intellectual property rights pertaining thereto - of Cosmo Tech.
+# Any use, reproduction, translation, broadcasting, transmission, distribution,
+# etc., to any person is prohibited unless it has been previously and
+# specifically authorized by written means by Cosmo Tech.
+
+import importlib
+from typing import Optional
+
+from cosmotech.orchestrator.utils.translate import T
+
+from cosmotech.data_update_quest_cli.utils.click import click
+
+
+class LazyGroup(click.RichGroup):
+    """
+    Command group importing the module of a subcommand only when the subcommand is run.
+
+    Subcommands are declared as `name: (import path, help translation key)`, the import path being
+    `module:attribute`. Listing the subcommands in the help of the group only uses their translated help,
+    so neither `--help` nor `--version` of the group import any subcommand.
+    """
+
+    def __init__(self, *args, lazy_subcommands: Optional[dict[str, tuple[str, Optional[str]]]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+        self._loaded: dict[str, click.Command] = {}
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted([*super().list_commands(ctx), *self.lazy_subcommands])
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if cmd_name not in self.lazy_subcommands:
+            return super().get_command(ctx, cmd_name)
+        if cmd_name in self._loaded:
+            return self._loaded[cmd_name]
+
+        # Placeholder only describing the subcommand, replaced by the real command in resolve_command
+        _, help_key = self.lazy_subcommands[cmd_name]
+        return click.RichCommand(cmd_name, help=T(help_key) if help_key else None)
+
+    def resolve_command(self, ctx: click.Context, args: list[str]):
+        cmd_name, cmd, args = super().resolve_command(ctx, args)
+        if cmd_name in self.lazy_subcommands:
+            cmd = self.load_command(cmd_name)
+        return cmd_name, cmd, args
+
+    def load_command(self, cmd_name: str) -> click.Command:
+        """Import the module of a lazy subcommand and get its command"""
+        if cmd_name not in self._loaded:
+            import_path, _ = self.lazy_subcommands[cmd_name]
+            module_name, attribute = import_path.split(":")
+            command = getattr(importlib.import_module(module_name), attribute)
+            if not isinstance(command, click.Command):
+                raise ValueError(f"Lazy subcommand '{cmd_name}' is not a click command: {import_path}")
+            self._loaded[cmd_name] = command
+        return self._loaded[cmd_name]
@@ -0,0 +1,163 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from redis.exceptions import ResponseError
+
+from cosmotech.data_update_quest.core.database.redis import async_client
+from cosmotech.data_update_quest.core.database.redis import client
+
+
+DELETED = object()
+
+
+class FakePipeline:
+    """Minimal JSON pipeline recording JSON.SET and DEL calls and refusing documents flagged as invalid"""
+
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.commands = []
+
+    def set(self, key, path, data):
+        self.commands.append((key, data))
+
+    def delete(self, key):
+        self.commands.append((key, DELETED))
+
+    def execute_command(self, command, key, path, content):
+        """Raw JSON.SET, refusing invalid JSON as redis does"""
+        assert command == "JSON.SET"
+        self.redis_client.payloads[key] = bytes(content) if isinstance(content, memoryview) else content
+        try:
+            self.set(key, path, json.loads(self.redis_client.payloads[key]))
+        except ValueError as e:
+            self.commands.append((key, ResponseError(str(e))))
+
+    def execute(self, raise_on_error=True):
+        results = []
+        for key, data in self.commands:
+            if data is DELETED:
+                results.append(int(self.redis_client.store.pop(key, None) is not None))
+            elif isinstance(data, Exception):
+                results.append(data)
+            elif isinstance(data, dict) and data.get("refused"):
+                results.append(ResponseError("refused by redis"))
+            else:
+                self.redis_client.store[key] = data
+                results.append(True)
+        self.commands = []
+        return results
+
+
+class FakeJSON:
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+
+    def mget(self, keys, path):
+        return [self.redis_client.store.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        self.redis_client.pipelines.append(FakePipeline(self.redis_client))
+        return self.redis_client.pipelines[-1]
+
+
+class FakeSearch:
+    """RediSearch index over the documents whose key starts with the index name, honoring LIMIT paging"""
+
+    def __init__(self, redis_client, index):
+        self.redis_client = redis_client
+        self.index = index
+
+    def documents(self):
+        prefix = self.index + ":"
+        return [(key, data) for key, data in sorted(self.redis_client.store.items()) if key.startswith(prefix)]
+
+    def search(self, query):
+        documents = self.documents()
+        page = documents[query._offset : query._offset + query._num]
+        if query._no_content:
+            docs = [SimpleNamespace(id=key) for key, _ in page]
+        else:
+            docs = [SimpleNamespace(id=key, json=json.dumps(data)) for key, data in page]
+            # The id is returned under its alias, and left out of the results of the documents without one
+            fields = query._return_fields
+            if "$.id" in fields:
+                for doc, (_, data) in zip(docs, page):
+                    if "id" in data:
+                        setattr(doc, fields[fields.index("$.id") + 2], data["id"])
+        return SimpleNamespace(docs=docs, total=len(documents))
+
+    def info(self):
+        return {"index_name": self.index, "num_docs": str(len(self.documents()))}
+
+
+class FakeRedisClient:
+    """In-memory stand-in for the subset of the redis client used by the dump and upload functions"""
+
+    def __init__(self):
+        self.store = {}
+        self.payloads = {}
+        self.pipelines = []
+
+    def add_documents(self, index, documents):
+        for document in documents:
+            self.store[f"{index}:{document['id']}"] = document
+
+    def ft(self, index):
+        return FakeSearch(self, index)
+
+    def json(self):
+        return FakeJSON(self)
+
+    def pipeline(self, transaction=True):
+        self.pipelines.append(FakePipeline(self))
+        return self.pipelines[-1]
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis_client = FakeRedisClient()
+    monkeypatch.setattr(client, "get_redis_client", lambda **kwargs: redis_client)
+    monkeypatch.setattr(
+        client,
+        "get_redis_indexes",
+        lambda r, index_list: {name: client.get_index_key(name) for name in index_list},
+    )
+    return redis_client
+
+
+class FakeAsyncPipeline(FakePipeline):
+    """Pipeline of the asyncio client, receiving JSON.SET as raw commands"""
+
+    async def execute(self, raise_on_error=True):
+        return super().execute(raise_on_error)
+
+
+class FakeAsyncSearch(FakeSearch):
+    async def search(self, query):
+        return super().search(query)
+
+
+class FakeAsyncRedisClient:
+    """Asyncio stand-in sharing the store of a FakeRedisClient, tracking the concurrent pipelines"""
+
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.closed = False
+
+    def ft(self, index):
+        return FakeAsyncSearch(self.redis_client, index)
+
+    def pipeline(self, transaction=True):
+        self.redis_client.pipelines.append(FakeAsyncPipeline(self.redis_client))
+        return self.redis_client.pipelines[-1]
+
+    async def close(self, close_connection_pool=None):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_async_redis(monkeypatch, fake_redis):
+    async_redis_client = FakeAsyncRedisClient(fake_redis)
+    monkeypatch.setattr(async_client, "get_async_redis_client", lambda **kwargs: async_redis_client)
+    return async_redis_client
@@ -0,0 +1,105 @@
+import asyncio
+import json
+
+import pytest
+
+from cosmotech.data_update_quest.core.checkpoint import CheckpointJournal
+from cosmotech.data_update_quest.core.database.redis.async_client import bounded_gather
+from cosmotech.data_update_quest.core.database.redis.client import ASYNC_ENGINE
+from cosmotech.data_update_quest.core.database.redis.client import UPLOAD_JOURNAL
+from cosmotech.data_update_quest.core.database.redis.client import file_upload
+from cosmotech.data_update_quest.core.database.redis.client import get_index_key
+from cosmotech.data_update_quest.core.database.redis.client import redis_dump
+
+
+def write_documents(path, documents):
+    path.mkdir(parents=True)
+    for document in documents:
+        (path / f"{document['id']}.json").write_text(json.dumps(document))
+
+
+def test_bounded_gather_limits_concurrency():
+    running = []
+    peak = []
+
+    async def work(i):
+        running.append(i)
+        peak.append(len(running))
+        await asyncio.sleep(0)
+        running.remove(i)
+        return i
+
+    results = asyncio.run(bounded_gather((work(i) for i in range(10)), 3))
+
+    assert sorted(results) == list(range(10))
+    assert max(peak) == 3
+
+
+def test_bounded_gather_stops_on_first_error():
+    started = []
+
+    async def work(i):
+        started.append(i)
+        await asyncio.sleep(0)
+        if i == 1:
+            raise RuntimeError("boom")
+        return i
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(bounded_gather((work(i) for i in range(100)), 2))
+    assert len(started) < 100
+
+
+@pytest.mark.parametrize("dump_format", ["directory", "ndjson"])
+def test_async_dump_matches_sync_dump(tmp_path, fake_async_redis, dump_format):
+    documents = [{"id": f"o-{i:02}", "name": f"Organization {i}"} for i in range(23)]
+    fake_async_redis.redis_client.add_documents(get_index_key("organization"), documents)
+
+    for engine in ["sync", ASYNC_ENGINE]:
+        redis_dump(
+            tmp_path / engine,
+            "localhost",
+            6379,
+            "password",
+            ["organization"],
+            page_size=5,
+            workers=3,
+            dump_format=dump_format,
+            engine=engine,
+        )
+
+    assert fake_async_redis.closed
+    for path in (tmp_path / "sync").rglob("*"):
+        if path.is_file() and not path.name.startswith(".duq"):
+            assert path.read_bytes() == (tmp_path / ASYNC_ENGINE / path.relative_to(tmp_path / "sync")).read_bytes()
+
+
+def test_async_upload_reports_refused_documents(tmp_path, fake_async_redis):
+    write_documents(tmp_path / "organization", [{"id": f"o-{i}"} for i in range(7)])
+    write_documents(tmp_path / "workspace", [{"id": "w-1"}, {"id": "w-2", "refused": True}])
+    (tmp_path / "workspace" / "w-3.json").write_text("{not json")
+
+    failed_keys = file_upload(tmp_path, "localhost", 6379, "password", batch_size=3, workers=2, engine=ASYNC_ENGINE)
+
+    prefix = get_index_key("workspace")
+    store = fake_async_redis.redis_client.store
+    assert sorted(failed_keys) == [f"{prefix}:w-2", f"{prefix}:w-3"]
+    assert store[f"{get_index_key('organization')}:o-4"] == {"id": "o-4"}
+    assert len(store) == 8
+
+
+def test_async_upload_resume_skips_done_batches(tmp_path, fake_async_redis):
+    write_documents(tmp_path / "workspace", [{"id": f"w-{i}"} for i in range(7)])
+    with CheckpointJournal(tmp_path / UPLOAD_JOURNAL, "redis-file-upload", {"batch_size": 3}) as journal:
+        journal.record("workspace", 0, count=3)
+
+    failed_keys = file_upload(tmp_path, "localhost", 6379, "password", batch_size=3, resume=True, engine=ASYNC_ENGINE)
+
+    prefix = get_index_key("workspace")
+    assert failed_keys == []
+    assert sorted(fake_async_redis.redis_client.store) == [f"{prefix}:w-{i}" for i in range(3, 7)]
+
+
+def test_unknown_engine_is_refused(tmp_path, fake_redis):
+    with pytest.raises(ValueError):
+        file_upload(tmp_path, "localhost", 6379, "password", engine="gevent")
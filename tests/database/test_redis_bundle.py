@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+from cosmotech.data_update_quest.core.database.redis.client import file_upload
+from cosmotech.data_update_quest.core.database.redis.client import get_index_key
+from cosmotech.data_update_quest.core.database.redis.client import redis_dump
+from cosmotech.data_update_quest.core.database.redis.storage import MANIFEST_FILE
+
+
+@pytest.mark.parametrize("compression", ["none", "gzip", "zstd"])
+@pytest.mark.parametrize("workers", [1, 3])
+def test_bundle_round_trip(tmp_path, fake_redis, compression, workers):
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+    organizations = [{"id": f"o-{i}", "name": f"Organization\n{i}", "tags": ["a", "b"]} for i in range(11)]
+    workspaces = [{"id": f"w-{i}", "organizationId": "o-1"} for i in range(4)]
+    fake_redis.add_documents(get_index_key("organization"), organizations)
+    fake_redis.add_documents(get_index_key("workspace"), workspaces)
+    expected_store = dict(fake_redis.store)
+
+    redis_dump(
+        tmp_path,
+        "localhost",
+        6379,
+        "password",
+        ["organization", "workspace"],
+        page_size=4,
+        workers=workers,
+        dump_format="ndjson",
+        compression=compression,
+    )
+
+    manifest = json.loads((tmp_path / MANIFEST_FILE).read_text())
+    assert manifest["compression"] == compression
+    assert manifest["indexes"]["organization"]["count"] == 11
+    assert manifest["indexes"]["workspace"]["count"] == 4
+    assert not (tmp_path / "organization").exists()
+
+    fake_redis.store.clear()
+    failed_keys = file_upload(tmp_path, "localhost", 6379, "password", batch_size=3, workers=workers)
+
+    assert failed_keys == []
+    assert fake_redis.store == expected_store
+
+
+def test_bundle_checksum_mismatch(tmp_path, fake_redis):
+    fake_redis.add_documents(get_index_key("runner"), [{"id": "r-1"}, {"id": "r-2"}])
+    redis_dump(tmp_path, "localhost", 6379, "password", ["runner"], dump_format="ndjson")
+
+    bundle = tmp_path / "runner.ndjson"
+    bundle.write_text(bundle.read_text().replace("r-2", "r-3"))
+
+    with pytest.raises(ValueError):
+        file_upload(tmp_path, "localhost", 6379, "password")
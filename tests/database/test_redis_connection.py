@@ -0,0 +1,123 @@
+import pytest
+import redis
+from click.testing import CliRunner
+
+from cosmotech.data_update_quest.core.database.redis import client
+from cosmotech.data_update_quest.core.database.redis import connection
+from cosmotech.data_update_quest.core.database.redis import verify
+from cosmotech.data_update_quest.core.migration import redis_migration
+from cosmotech.data_update_quest_cli.database.redis_dump import redis_dump_command
+from cosmotech.data_update_quest_cli.database.redis_file_upload import redis_file_upload_command
+from cosmotech.data_update_quest_cli.database.redis_list_index import redis_list_index_command
+from cosmotech.data_update_quest_cli.database.redis_migrate import redis_migrate_command
+from cosmotech.data_update_quest_cli.database.redis_verify import redis_verify_command
+
+
+@pytest.fixture(autouse=True)
+def reset_connection_settings():
+    yield
+    connection.configure_redis_client(**{key: None for key in connection.DEFAULT_CLIENT_OPTIONS})
+    connection.close_connection_pools()
+
+
+def test_clients_share_the_pool_of_a_server():
+    first = client.get_redis_client(host="localhost", port=6379, password="secret", max_connections=4)
+    second = client.get_redis_client(host="localhost", port=6379, password="secret", max_connections=4)
+    other = client.get_redis_client(host="other", port=6379, password="secret", max_connections=4)
+
+    assert first.connection_pool is second.connection_pool
+    assert first.connection_pool is not other.connection_pool
+    assert isinstance(first.connection_pool, redis.BlockingConnectionPool)
+    assert first.connection_pool.max_connections == 4
+    assert first.connection_pool.connection_kwargs["decode_responses"] is True
+
+
+def test_configured_settings_apply_to_new_clients():
+    connection.configure_redis_client(
+        max_connections=16, socket_timeout=5.0, socket_connect_timeout=2.0, socket_keepalive=True, retry_on_timeout=True
+    )
+
+    pool = client.get_redis_client(host="localhost", port=6379, password="secret", max_connections=4).connection_pool
+
+    assert pool.max_connections == 16
+    assert pool.connection_kwargs["socket_timeout"] == 5.0
+    assert pool.connection_kwargs["socket_connect_timeout"] == 2.0
+    assert pool.connection_kwargs["socket_keepalive"] is True
+    assert pool.connection_kwargs["retry_on_timeout"] is True
+
+
+def test_unix_socket_and_tls_connections(tmp_path):
+    connection.configure_redis_client(unix_socket=str(tmp_path / "redis.sock"))
+    pool = connection.get_connection_pool("localhost", 6379, "secret")
+    assert pool.connection_class is redis.UnixDomainSocketConnection
+    assert pool.connection_kwargs["path"] == str(tmp_path / "redis.sock")
+
+    connection.configure_redis_client(unix_socket=None, tls=True, tls_verify=False)
+    pool = connection.get_connection_pool("localhost", 6379, "secret")
+    assert pool.connection_class is redis.SSLConnection
+    assert pool.connection_kwargs["ssl_cert_reqs"] == "none"
+
+    connection.configure_redis_client(unix_socket=str(tmp_path / "redis.sock"))
+    with pytest.raises(ValueError):
+        connection.get_connection_pool("localhost", 6379, "secret")
+
+
+def test_unknown_settings_are_refused():
+    with pytest.raises(ValueError):
+        connection.configure_redis_client(ssl=True)
+
+
+def test_connection_options_are_read_from_the_command_line(monkeypatch):
+    clients = []
+    monkeypatch.setattr(client, "get_redis_indexes", lambda redis_client, index_list: clients.append(redis_client))
+
+    result = CliRunner().invoke(
+        redis_list_index_command,
+        ["-p", "secret", "--max-connections", "8", "--socket-timeout", "3", "--keepalive", "--retry-on-timeout"],
+    )
+
+    assert result.exit_code == 0, result.output
+    pool = clients[0].connection_pool
+    assert pool.max_connections == 8
+    assert pool.connection_kwargs["socket_timeout"] == 3.0
+    assert pool.connection_kwargs["socket_keepalive"] is True
+    assert pool.connection_kwargs["retry_on_timeout"] is True
+
+
+@pytest.mark.parametrize(
+    "command, module, name, result",
+    [
+        (redis_dump_command, client, "redis_dump", None),
+        (redis_file_upload_command, client, "file_upload", []),
+        (redis_migrate_command, redis_migration, "redis_migrate", {"failed": []}),
+        (redis_verify_command, verify, "redis_verify", {"mismatches": 0}),
+    ],
+)
+def test_commands_moving_data_take_the_connection_options(command, module, name, result, monkeypatch, tmp_path):
+    calls = []
+    monkeypatch.setattr(module, name, lambda **kwargs: calls.append(kwargs) or result)
+    template_file = tmp_path / "transform.jq"
+    template_file.write_text(".")
+    arguments = ["-t", str(template_file)] if command is redis_migrate_command else ["-f", str(tmp_path)]
+
+    result = CliRunner().invoke(
+        command, [*arguments, "-p", "secret", "--host", "redis.example", "--tls", "--tls-no-verify"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert calls[0]["password"] == "secret"
+    assert calls[0]["host"] == "redis.example"
+    assert connection.CLIENT_OPTIONS["tls"] is True
+    assert connection.CLIENT_OPTIONS["tls_verify"] is False
+
+
+@pytest.mark.parametrize("option", ["--batch-size", "--batch_size"])
+def test_options_accept_dashes_and_underscores(option, monkeypatch, tmp_path):
+    calls = []
+    monkeypatch.setattr(client, "file_upload", lambda **kwargs: calls.append(kwargs) or [])
+
+    result = CliRunner().invoke(redis_file_upload_command, ["--file-path", str(tmp_path), "-p", "secret", option, "7"])
+
+    assert result.exit_code == 0, result.output
+    assert calls[0]["file_path"] == str(tmp_path)
+    assert calls[0]["batch_size"] == 7
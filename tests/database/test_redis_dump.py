@@ -0,0 +1,34 @@
+import json
+
+import pytest
+
+from cosmotech.data_update_quest.core.database.redis.client import get_index_key
+from cosmotech.data_update_quest.core.database.redis.client import redis_dump
+
+
+@pytest.mark.parametrize("document_count,page_size", [(0, 10), (5, 10), (10, 10), (25, 10), (3, 1)])
+def test_redis_dump_covers_the_index(tmp_path, document_count, page_size, fake_redis):
+    documents = [{"id": f"o-{i:02}"} for i in range(document_count)]
+    fake_redis.add_documents(get_index_key("organization"), documents)
+
+    redis_dump(tmp_path, "localhost", 6379, "password", ["organization"], page_size=page_size)
+
+    dumped = sorted((tmp_path / "organization").glob("*.json"))
+    assert [json.loads(file.read_text()) for file in dumped] == documents
+
+
+def test_redis_dump_invalid_page_size(tmp_path):
+    with pytest.raises(ValueError):
+        redis_dump(tmp_path, "localhost", 6379, "password", ["organization"], page_size=0)
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_redis_dump_writes_every_page(tmp_path, fake_redis, workers):
+    documents = [{"id": f"o-{i}", "name": f"Organization {i}"} for i in range(23)]
+    fake_redis.add_documents(get_index_key("organization"), documents)
+
+    redis_dump(tmp_path, "localhost", 6379, "password", ["organization"], page_size=5, workers=workers)
+
+    dumped = sorted((tmp_path / "organization").glob("*.json"))
+    assert len(dumped) == len(documents)
+    assert json.loads((tmp_path / "organization" / "o-7.json").read_text()) == documents[7]
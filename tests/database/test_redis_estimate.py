@@ -0,0 +1,27 @@
+import json
+
+import pytest
+
+from cosmotech.data_update_quest.core.database.redis import client
+from cosmotech.data_update_quest.core.database.redis.client import get_index_key
+from cosmotech.data_update_quest.core.migration import estimate as estimate_module
+from cosmotech.data_update_quest.core.migration.estimate import estimate
+
+
+@pytest.fixture(autouse=True)
+def fake_estimate_redis(fake_redis, monkeypatch):
+    monkeypatch.setattr(estimate_module, "get_redis_client", client.get_redis_client)
+    monkeypatch.setattr(estimate_module, "get_redis_indexes", client.get_redis_indexes)
+
+
+def test_estimate_redis(tmp_path, fake_redis):
+    template_file = tmp_path / "transform.jq"
+    template_file.write_text("del(.legacy)")
+    fake_redis.add_documents(get_index_key("runner"), [{"id": f"r-{i}", "legacy": "x" * 100} for i in range(30)])
+
+    estimates = estimate(template_file, "localhost", 6379, "password", ["runner"], sample_size=10, workers=2)
+
+    assert estimates["runner"]["sampled"] == 10
+    assert estimates["runner"]["documents"] == 30
+    assert estimates["runner"]["size_ratio"] < 1
+    assert json.loads(json.dumps(estimates))
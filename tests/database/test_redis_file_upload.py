@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from cosmotech.data_update_quest.core.database.redis import client
+from cosmotech.data_update_quest.core.database.redis.client import batched
+from cosmotech.data_update_quest.core.database.redis.client import file_upload
+
+
+def write_documents(path, documents):
+    path.mkdir(parents=True)
+    for document in documents:
+        (path / f"{document['id']}.json").write_text(json.dumps(document))
+
+
+@pytest.mark.parametrize("size,expected", [(2, [[0, 1], [2, 3], [4]]), (5, [[0, 1, 2, 3, 4]]), (10, [[0, 1, 2, 3, 4]])])
+def test_batched(size, expected):
+    assert list(batched(range(5), size)) == expected
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_file_upload_batches(tmp_path, fake_redis, workers):
+    write_documents(tmp_path / "organization", [{"id": f"o-{i}"} for i in range(7)])
+    write_documents(tmp_path / "workspace", [{"id": f"w-{i}"} for i in range(2)])
+
+    failed_keys = file_upload(tmp_path, "localhost", 6379, "password", batch_size=3, workers=workers)
+
+    assert failed_keys == []
+    assert len(fake_redis.pipelines) == 4
+    assert fake_redis.store["com.cosmotech.organization.domain.OrganizationIdx:o-4"] == {"id": "o-4"}
+    assert fake_redis.store["com.cosmotech.workspace.domain.WorkspaceIdx:w-1"] == {"id": "w-1"}
+    assert len(fake_redis.store) == 9
+
+
+def test_file_upload_bad_documents_do_not_abort_batch(tmp_path, fake_redis):
+    write_documents(tmp_path / "workspace", [{"id": "w-1"}, {"id": "w-2", "refused": True}, {"id": "w-3"}])
+    (tmp_path / "workspace" / "w-4.json").write_text("{not json")
+
+    failed_keys = file_upload(tmp_path, "localhost", 6379, "password", batch_size=10)
+
+    prefix = "com.cosmotech.workspace.domain.WorkspaceIdx"
+    assert sorted(failed_keys) == [f"{prefix}:w-2", f"{prefix}:w-4"]
+    assert sorted(fake_redis.store) == [f"{prefix}:w-1", f"{prefix}:w-3"]
+
+
+@pytest.mark.parametrize("mmap_threshold", [0, client.MMAP_THRESHOLD])
+@pytest.mark.parametrize("engine", ["sync", "async"])
+def test_file_upload_sends_files_as_they_are(tmp_path, fake_async_redis, monkeypatch, mmap_threshold, engine):
+    monkeypatch.setattr(client, "MMAP_THRESHOLD", mmap_threshold)
+    write_documents(tmp_path / "workspace", [{"id": "w-1"}])
+    (tmp_path / "workspace" / "w-2.json").write_text('{\n  "id": "w-2",\n  "tags": ["a"]\n}')
+    (tmp_path / "workspace" / "w-3.json").write_text("")
+
+    failed_keys = file_upload(tmp_path, "localhost", 6379, "password", engine=engine)
+
+    prefix = "com.cosmotech.workspace.domain.WorkspaceIdx"
+    fake_redis = fake_async_redis.redis_client
+    assert failed_keys == [f"{prefix}:w-3"]
+    assert fake_redis.payloads[f"{prefix}:w-2"] == b'{\n  "id": "w-2",\n  "tags": ["a"]\n}'
+    assert fake_redis.store[f"{prefix}:w-2"] == {"id": "w-2", "tags": ["a"]}
+
+
+def test_file_upload_validate_parses_documents(tmp_path, fake_redis):
+    write_documents(tmp_path / "workspace", [{"id": "w-1"}])
+    (tmp_path / "workspace" / "w-2.json").write_text("{not json")
+
+    failed_keys = file_upload(tmp_path, "localhost", 6379, "password", validate=True)
+
+    prefix = "com.cosmotech.workspace.domain.WorkspaceIdx"
+    assert failed_keys == [f"{prefix}:w-2"]
+    # Parsed documents are serialized again by the JSON codec
+    assert fake_redis.payloads == {f"{prefix}:w-1": b'{"id":"w-1"}'}
+    assert fake_redis.store == {f"{prefix}:w-1": {"id": "w-1"}}
@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from cosmotech.data_update_quest.core.database.redis.client import file_upload
+from cosmotech.data_update_quest.core.database.redis.client import get_index_key
+from cosmotech.data_update_quest.core.database.redis.client import redis_dump
+from cosmotech.data_update_quest.core.database.redis.storage import CONTENT_MANIFEST_FILE
+
+
+def dump(path, **kwargs):
+    redis_dump(path, "localhost", 6379, "password", ["organization"], page_size=3, **kwargs)
+
+
+@pytest.fixture
+def organizations(fake_redis):
+    fake_redis.add_documents(get_index_key("organization"), [{"id": f"o-{i}", "name": f"O {i}"} for i in range(7)])
+    return fake_redis
+
+
+def test_dump_writes_content_manifest(tmp_path, organizations):
+    dump(tmp_path)
+
+    manifest = json.loads((tmp_path / CONTENT_MANIFEST_FILE).read_text())
+    assert sorted(manifest["indexes"]["organization"]) == [f"o-{i}" for i in range(7)]
+    assert manifest["delta"]["organization"] == {"changed": [f"o-{i}" for i in range(7)], "deleted": []}
+
+
+@pytest.mark.parametrize("engine", ["sync", "async"])
+def test_incremental_dump_only_writes_changes(tmp_path, organizations, fake_async_redis, engine):
+    dump(tmp_path)
+    untouched = tmp_path / "organization" / "o-1.json"
+    untouched.write_text("unchanged file, not to be rewritten")
+
+    prefix = get_index_key("organization")
+    organizations.store[f"{prefix}:o-2"] = {"id": "o-2", "name": "renamed"}
+    organizations.store[f"{prefix}:o-9"] = {"id": "o-9", "name": "O 9"}
+    del organizations.store[f"{prefix}:o-4"]
+    dump(tmp_path, incremental=True, engine=engine)
+
+    manifest = json.loads((tmp_path / CONTENT_MANIFEST_FILE).read_text())
+    assert manifest["delta"]["organization"] == {"changed": ["o-2", "o-9"], "deleted": ["o-4"]}
+    assert "o-4" not in manifest["indexes"]["organization"]
+    assert untouched.read_text() == "unchanged file, not to be rewritten"
+    assert json.loads((tmp_path / "organization" / "o-2.json").read_text())["name"] == "renamed"
+    assert not (tmp_path / "organization" / "o-4.json").exists()
+
+
+def test_incremental_upload_restores_the_delta(tmp_path, organizations):
+    dump(tmp_path)
+    prefix = get_index_key("organization")
+    target = dict(organizations.store)
+    organizations.store[f"{prefix}:o-2"] = {"id": "o-2", "name": "renamed"}
+    del organizations.store[f"{prefix}:o-4"]
+    dump(tmp_path, incremental=True)
+    source = dict(organizations.store)
+
+    # The target holds the documents of the first dump, and a document the second dump does not know about
+    organizations.store = target | {f"{prefix}:o-5": {"id": "o-5", "name": "not in the delta"}}
+    failed_keys = file_upload(tmp_path, "localhost", 6379, "password", incremental=True)
+
+    assert failed_keys == []
+    assert organizations.store == source | {f"{prefix}:o-5": {"id": "o-5", "name": "not in the delta"}}
+
+
+def test_incremental_modes_are_refused_without_directory_dump(tmp_path, organizations):
+    with pytest.raises(ValueError):
+        dump(tmp_path, incremental=True, dump_format="ndjson")
+    with pytest.raises(ValueError):
+        dump(tmp_path, incremental=True, resume=True)
+    with pytest.raises(ValueError):
+        file_upload(tmp_path, "localhost", 6379, "password", incremental=True)
+
+
+def test_resumed_dump_drops_content_manifest(tmp_path, organizations):
+    dump(tmp_path)
+
+    dump(tmp_path, resume=True)
+
+    assert not (tmp_path / CONTENT_MANIFEST_FILE).exists()
@@ -0,0 +1,111 @@
+import pytest
+
+from cosmotech.data_update_quest.core.database.redis import client
+from cosmotech.data_update_quest.core.database.redis.client import get_index_key
+from cosmotech.data_update_quest.core.migration import redis_migration
+from cosmotech.data_update_quest.core.migration.apply_template import get_chain_program
+from cosmotech.data_update_quest.core.migration.native_transform import NativeProgram
+from cosmotech.data_update_quest.core.migration.redis_migration import MIGRATE_JOURNAL
+from cosmotech.data_update_quest.core.migration.redis_migration import redis_migrate
+
+
+@pytest.fixture(autouse=True)
+def fake_migration_redis(fake_redis, monkeypatch, tmp_path):
+    # A resumed run without a journal path writes its journal in the working directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(redis_migration, "get_redis_client", client.get_redis_client)
+    monkeypatch.setattr(redis_migration, "get_redis_indexes", client.get_redis_indexes)
+
+
+@pytest.fixture
+def template(tmp_path):
+    template_file = tmp_path / "transform.jq"
+    template_file.write_text('del(.legacy) | .security = {"default": "none"} | .key = (.key | ascii_downcase)')
+    return template_file
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_redis_migrate(tmp_path, template, fake_redis, workers):
+    index_key = get_index_key("workspace")
+    fake_redis.add_documents(index_key, [{"id": f"w-{i}", "key": f"W{i}", "legacy": True} for i in range(10)])
+
+    summary = redis_migrate(template, "localhost", 6379, "password", ["workspace"], batch_size=3, workers=workers)
+
+    assert summary["documents"] == 10
+    assert summary["failed"] == []
+    assert not (tmp_path / MIGRATE_JOURNAL).exists()
+    assert fake_redis.store[f"{index_key}:w-4"] == {"id": "w-4", "key": "w4", "security": {"default": "none"}}
+
+
+def test_redis_migrate_dry_run(template, fake_redis):
+    index_key = get_index_key("workspace")
+    documents = [{"id": f"w-{i}", "key": f"W{i}", "legacy": True} for i in range(4)]
+    fake_redis.add_documents(index_key, documents)
+
+    summary = redis_migrate(template, "localhost", 6379, "password", ["workspace"], dry_run=True)
+
+    assert summary["documents"] == 4
+    assert fake_redis.pipelines == []
+    assert fake_redis.store[f"{index_key}:w-2"] == documents[2]
+
+
+def test_redis_migrate_reports_failed_documents(template, fake_redis):
+    index_key = get_index_key("workspace")
+    fake_redis.add_documents(index_key, [{"id": "w-1", "key": "W1"}, {"id": "w-2", "key": 2}])
+
+    summary = redis_migrate(template, "localhost", 6379, "password", ["workspace"])
+
+    assert summary["failed"] == [f"{index_key}:w-2"]
+    assert fake_redis.store[f"{index_key}:w-1"]["key"] == "w1"
+    assert fake_redis.store[f"{index_key}:w-2"] == {"id": "w-2", "key": 2}
+
+
+def test_redis_migrate_invalid_template(tmp_path, fake_redis):
+    template_file = tmp_path / "transform.jq"
+    template_file.write_text("del(.")
+
+    with pytest.raises(ValueError):
+        redis_migrate(template_file, "localhost", 6379, "password", ["workspace"])
+
+
+def test_redis_migrate_with_a_generated_script(tmp_path, fake_redis):
+    index_key = get_index_key("workspace")
+    fake_redis.add_documents(index_key, [{"id": f"w-{i}", "old": i} for i in range(4)])
+    template_file = tmp_path / "transform.jq"
+    template_file.write_text("# Field removals\ndel(.old)\n\n# Field additions\n| .new = null")
+    assert isinstance(get_chain_program([template_file]), NativeProgram)
+
+    summary = redis_migrate(template_file, "localhost", 6379, "password", ["workspace"], batch_size=3, resume=True)
+    resumed = redis_migrate(template_file, "localhost", 6379, "password", ["workspace"], batch_size=3, resume=True)
+
+    assert summary["failed"] == []
+    assert resumed["documents"] == 0
+    assert fake_redis.store[f"{index_key}:w-2"] == {"id": "w-2", "new": None}
+
+
+def test_redis_migrate_resume_retries_failed_documents(tmp_path, template, fake_redis):
+    index_key = get_index_key("workspace")
+    fake_redis.add_documents(index_key, [{"id": f"w-{i}", "key": f"W{i}"} for i in range(5)])
+    fake_redis.store[f"{index_key}:w-3"]["key"] = 3
+    journal_path = tmp_path / "migrate.jsonl"
+
+    summary = redis_migrate(
+        template, "localhost", 6379, "password", ["workspace"], batch_size=2, journal_path=journal_path
+    )
+    fake_redis.store[f"{index_key}:w-3"]["key"] = "W3"
+    resumed = redis_migrate(
+        template, "localhost", 6379, "password", ["workspace"], batch_size=2, resume=True, journal_path=journal_path
+    )
+
+    assert summary["failed"] == [f"{index_key}:w-3"]
+    assert resumed["documents"] == 2
+    assert resumed["failed"] == []
+    assert fake_redis.store[f"{index_key}:w-3"]["key"] == "w3"
+
+
+def test_redis_migrate_journal_in_the_working_directory_when_resuming(tmp_path, template, fake_redis):
+    fake_redis.add_documents(get_index_key("workspace"), [{"id": f"w-{i}", "key": f"W{i}"} for i in range(4)])
+
+    redis_migrate(template, "localhost", 6379, "password", ["workspace"], batch_size=3, resume=True)
+
+    assert len((tmp_path / MIGRATE_JOURNAL).read_text().splitlines()) == 3
@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from cosmotech.data_update_quest.core.checkpoint import CheckpointJournal
+from cosmotech.data_update_quest.core.database.redis.client import ASYNC_ENGINE
+from cosmotech.data_update_quest.core.database.redis.client import DUMP_JOURNAL
+from cosmotech.data_update_quest.core.database.redis.client import UPLOAD_JOURNAL
+from cosmotech.data_update_quest.core.database.redis.client import file_upload
+from cosmotech.data_update_quest.core.database.redis.client import get_index_key
+from cosmotech.data_update_quest.core.database.redis.client import SYNC_ENGINE
+from cosmotech.data_update_quest.core.database.redis.client import redis_dump
+
+
+def test_redis_dump_resume_skips_done_pages(tmp_path, fake_redis):
+    fake_redis.add_documents(get_index_key("organization"), [{"id": f"o-{i:02}"} for i in range(12)])
+    # A previous run dumped the first two pages before dying
+    with CheckpointJournal(tmp_path / DUMP_JOURNAL, "redis-dump", {"page_size": 5, "format": "directory"}) as journal:
+        journal.record("organization", 0, count=5)
+        journal.record("organization", 5, count=5)
+
+    redis_dump(tmp_path, "localhost", 6379, "password", ["organization"], page_size=5, resume=True)
+
+    assert sorted(file.name for file in (tmp_path / "organization").glob("*.json")) == ["o-10.json", "o-11.json"]
+
+
+def test_redis_dump_journal_records_every_page(tmp_path, fake_redis):
+    fake_redis.add_documents(get_index_key("organization"), [{"id": f"o-{i:02}"} for i in range(12)])
+
+    redis_dump(tmp_path, "localhost", 6379, "password", ["organization"], page_size=5, workers=2)
+
+    records = [json.loads(line) for line in (tmp_path / DUMP_JOURNAL).read_text().splitlines()[1:]]
+    assert sorted(record["unit"] for record in records) == [0, 5, 10]
+    assert sum(record["count"] for record in records) == 12
+
+
+def test_redis_dump_resume_ndjson(tmp_path, fake_redis):
+    with pytest.raises(ValueError):
+        redis_dump(tmp_path, "localhost", 6379, "password", ["organization"], dump_format="ndjson", resume=True)
+
+
+def test_file_upload_resume_skips_done_batches(tmp_path, fake_redis):
+    (tmp_path / "workspace").mkdir()
+    for i in range(7):
+        (tmp_path / "workspace" / f"w-{i}.json").write_text(json.dumps({"id": f"w-{i}"}))
+    with CheckpointJournal(tmp_path / UPLOAD_JOURNAL, "redis-file-upload", {"batch_size": 3}) as journal:
+        journal.record("workspace", 0, count=3)
+
+    failed_keys = file_upload(tmp_path, "localhost", 6379, "password", batch_size=3, resume=True)
+
+    prefix = get_index_key("workspace")
+    assert failed_keys == []
+    assert sorted(fake_redis.store) == [f"{prefix}:w-{i}" for i in range(3, 7)]
+
+
+@pytest.mark.parametrize("engine", [SYNC_ENGINE, ASYNC_ENGINE])
+def test_file_upload_resume_retries_failed_documents(tmp_path, fake_redis, fake_async_redis, engine):
+    store = fake_redis.store if engine == SYNC_ENGINE else fake_async_redis.redis_client.store
+    (tmp_path / "workspace").mkdir()
+    for i in range(7):
+        (tmp_path / "workspace" / f"w-{i}.json").write_text(json.dumps({"id": f"w-{i}"}))
+    (tmp_path / "workspace" / "w-4.json").write_text("{not json")
+
+    prefix = get_index_key("workspace")
+    assert file_upload(tmp_path, "localhost", 6379, "password", batch_size=3, engine=engine) == [f"{prefix}:w-4"]
+
+    (tmp_path / "workspace" / "w-4.json").write_text(json.dumps({"id": "w-4"}))
+    store.clear()
+    failed_keys = file_upload(tmp_path, "localhost", 6379, "password", batch_size=3, resume=True, engine=engine)
+
+    assert failed_keys == []
+    assert sorted(store) == [f"{prefix}:w-{i}" for i in range(3, 6)]
+
+
+def test_file_upload_resume_other_batch_size(tmp_path, fake_redis):
+    (tmp_path / "workspace").mkdir()
+    CheckpointJournal(tmp_path / UPLOAD_JOURNAL, "redis-file-upload", {"batch_size": 3}).close()
+
+    with pytest.raises(ValueError):
+        file_upload(tmp_path, "localhost", 6379, "password", batch_size=5, resume=True)
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from cosmotech.data_update_quest.core.database.redis import client
+from cosmotech.data_update_quest.core.database.redis import verify
+from cosmotech.data_update_quest.core.database.redis.client import get_index_key
+from cosmotech.data_update_quest.core.database.redis.client import redis_dump
+from cosmotech.data_update_quest.core.database.redis.verify import canonical_hash
+from cosmotech.data_update_quest.core.database.redis.verify import redis_verify
+from cosmotech.data_update_quest_cli.database.redis_verify import redis_verify_command
+
+
+@pytest.fixture
+def dumped(tmp_path, fake_redis, monkeypatch, request):
+    monkeypatch.setattr(verify, "get_redis_client", client.get_redis_client)
+    fake_redis.add_documents(get_index_key("workspace"), [{"id": f"w-{i}", "key": f"W{i}"} for i in range(8)])
+    redis_dump(tmp_path / "dump", "localhost", 6379, "password", ["workspace"], dump_format=request.param)
+    return tmp_path / "dump"
+
+
+def test_canonical_hash_ignores_key_order_and_formatting():
+    assert canonical_hash(json.loads('{"b": [1, 2], "a": "é"}')) == canonical_hash({"a": "é", "b": [1, 2]})
+    assert canonical_hash({"a": 1}) != canonical_hash({"a": "1"})
+
+
+@pytest.mark.parametrize("dumped", ["directory", "ndjson"], indirect=True)
+@pytest.mark.parametrize("workers", [1, 3])
+def test_redis_verify_reports_mismatches(dumped, fake_redis, workers):
+    prefix = get_index_key("workspace")
+    assert redis_verify(dumped, "localhost", 6379, "password", batch_size=3, workers=workers)["mismatches"] == 0
+
+    del fake_redis.store[f"{prefix}:w-1"]
+    fake_redis.store[f"{prefix}:w-2"] = {"id": "w-2", "key": "changed"}
+    fake_redis.store[f"{prefix}:w-9"] = {"id": "w-9"}
+    report = redis_verify(dumped, "localhost", 6379, "password", batch_size=3, workers=workers)
+
+    assert report["documents"] == 8
+    assert report["mismatches"] == 3
+    assert report["indexes"]["workspace"] == {
+        "documents": 8,
+        "missing": [f"{prefix}:w-1"],
+        "extra": [f"{prefix}:w-9"],
+        "different": [f"{prefix}:w-2"],
+        "invalid": [],
+    }
+
+
+@pytest.mark.parametrize("dumped", ["directory"], indirect=True)
+def test_redis_verify_against_template_output(dumped, fake_redis, tmp_path):
+    template_file = tmp_path / "transform.jq"
+    template_file.write_text(".key = (.key | ascii_downcase)")
+    assert redis_verify(dumped, "localhost", 6379, "password", template_files=[template_file])["mismatches"] == 8
+
+    for key, data in fake_redis.store.items():
+        fake_redis.store[key] = data | {"key": data["key"].lower()}
+
+    assert redis_verify(dumped, "localhost", 6379, "password", template_files=[template_file])["mismatches"] == 0
+
+
+@pytest.mark.parametrize("dumped", ["directory"], indirect=True)
+def test_redis_verify_command(dumped, fake_redis, tmp_path):
+    (dumped / "workspace" / "w-3.json").write_text("{not json")
+    report_path = tmp_path / "report.json"
+
+    result = CliRunner().invoke(redis_verify_command, ["-f", str(dumped), "-p", "secret", "--report", str(report_path)])
+
+    assert result.exit_code == 1
+    assert json.loads(report_path.read_text())["indexes"]["workspace"]["invalid"] == [
+        f"{get_index_key('workspace')}:w-3"
+    ]
@@ -0,0 +1,122 @@
+import gzip
+import json
+
+import pytest
+
+from cosmotech.data_update_quest.core.database.redis.storage import CONTENT_MANIFEST_FILE
+from cosmotech.data_update_quest.core.database.redis.storage import MANIFEST_FILE
+from cosmotech.data_update_quest.core.migration.apply_batch import apply_template_batch
+
+
+@pytest.fixture
+def template(tmp_path):
+    template_file = tmp_path / "transform.jq"
+    template_file.write_text('del(.legacy) | .version = "3.2"')
+    return template_file
+
+
+@pytest.mark.parametrize("workers,chunk_size", [(1, 100), (2, 3)])
+def test_apply_template_batch_directory(tmp_path, template, workers, chunk_size):
+    input_dir = tmp_path / "input"
+    for index in ("organization", "workspace"):
+        (input_dir / index).mkdir(parents=True)
+        for i in range(5):
+            (input_dir / index / f"{index}-{i}.json").write_text(json.dumps({"id": f"{index}-{i}", "legacy": 1}))
+    (input_dir / "workspace" / "broken.json").write_text("{")
+
+    summary = apply_template_batch(template, input_dir, tmp_path / "output", workers=workers, chunk_size=chunk_size)
+
+    assert summary["succeeded"] == 10
+    assert [failure["source"] for failure in summary["failed"]] == [str(input_dir / "workspace" / "broken.json")]
+    output = json.loads((tmp_path / "output" / "workspace" / "workspace-3.json").read_text())
+    assert output == {"id": "workspace-3", "version": "3.2"}
+
+
+def test_apply_template_batch_skips_dump_manifests(tmp_path, template):
+    input_dir = tmp_path / "input"
+    (input_dir / "workspace").mkdir(parents=True)
+    (input_dir / "workspace" / "manifest.json").write_text(json.dumps({"id": "manifest", "legacy": 1}))
+    (input_dir / MANIFEST_FILE).write_text(json.dumps({"format": "directory"}))
+    (input_dir / CONTENT_MANIFEST_FILE).write_text(json.dumps({"indexes": {}}))
+
+    summary = apply_template_batch(template, input_dir, tmp_path / "output", workers=1)
+
+    assert summary["succeeded"] == 1
+    assert summary["failed"] == []
+    assert sorted(path.name for path in (tmp_path / "output").rglob("*.json")) == ["manifest.json"]
+    assert (tmp_path / "output" / "workspace" / "manifest.json").is_file()
+
+
+@pytest.mark.parametrize("input_name,output_name", [("in.ndjson", "out.ndjson"), ("in.ndjson.gz", "out.ndjson.gz")])
+def test_apply_template_batch_ndjson(tmp_path, template, input_name, output_name):
+    lines = [json.dumps({"id": f"r-{i}", "legacy": True}) for i in range(20)]
+    lines.insert(7, "not json")
+    content = "\n".join(lines) + "\n"
+    input_file = tmp_path / input_name
+    if input_name.endswith(".gz"):
+        input_file.write_bytes(gzip.compress(content.encode()))
+    else:
+        input_file.write_text(content)
+
+    summary = apply_template_batch(template, input_file, tmp_path / output_name, workers=2, chunk_size=4)
+
+    assert summary["succeeded"] == 20
+    assert summary["failed"][0]["source"] == f"{input_file}:8"
+    output_file = tmp_path / output_name
+    output = (
+        gzip.decompress(output_file.read_bytes()).decode() if output_name.endswith(".gz") else output_file.read_text()
+    )
+    assert [json.loads(line)["id"] for line in output.splitlines()] == [f"r-{i}" for i in range(20)]
+
+
+def test_apply_template_batch_invalid_template(tmp_path):
+    template_file = tmp_path / "transform.jq"
+    template_file.write_text("del(.")
+
+    with pytest.raises(ValueError):
+        apply_template_batch(template_file, tmp_path, tmp_path / "output")
+
+
+def test_apply_template_batch_resume(tmp_path, template):
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    for i in range(6):
+        (input_dir / f"r-{i}.json").write_text(json.dumps({"id": f"r-{i}", "legacy": 1}))
+    output_dir = tmp_path / "output"
+    apply_template_batch(template, input_dir, output_dir, workers=1, chunk_size=2)
+    (output_dir / "r-4.json").unlink()
+    (output_dir / "r-5.json").unlink()
+    # Forget the last chunk, as if the run had died while processing it
+    journal_file = output_dir / ".duq-apply-checkpoint.jsonl"
+    journal_file.write_text("".join(journal_file.read_text().splitlines(keepends=True)[:-1]))
+
+    summary = apply_template_batch(template, input_dir, output_dir, workers=1, chunk_size=2, resume=True)
+
+    assert summary["succeeded"] == 2
+    assert json.loads((output_dir / "r-5.json").read_text()) == {"id": "r-5", "version": "3.2"}
+
+
+def test_apply_template_batch_resume_retries_failed_documents(tmp_path, template):
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    for i in range(6):
+        (input_dir / f"r-{i}.json").write_text(json.dumps({"id": f"r-{i}", "legacy": 1}))
+    (input_dir / "r-3.json").write_text("{")
+    output_dir = tmp_path / "output"
+
+    summary = apply_template_batch(template, input_dir, output_dir, workers=1, chunk_size=2)
+    (input_dir / "r-3.json").write_text(json.dumps({"id": "r-3", "legacy": 1}))
+    resumed = apply_template_batch(template, input_dir, output_dir, workers=1, chunk_size=2, resume=True)
+
+    assert [failure["source"] for failure in summary["failed"]] == [str(input_dir / "r-3.json")]
+    assert resumed["succeeded"] == 2
+    assert resumed["failed"] == []
+    assert json.loads((output_dir / "r-3.json").read_text()) == {"id": "r-3", "version": "3.2"}
+
+
+def test_apply_template_batch_resume_ndjson(tmp_path, template):
+    input_file = tmp_path / "in.ndjson"
+    input_file.write_text("{}\n")
+
+    with pytest.raises(ValueError):
+        apply_template_batch(template, input_file, tmp_path / "out.ndjson", resume=True)
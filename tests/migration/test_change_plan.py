@@ -0,0 +1,96 @@
+import dataclasses
+import json
+
+import pytest
+
+from cosmotech.data_update_quest.core.migration.apply_template import apply_template
+from cosmotech.data_update_quest.core.migration.change_plan import ChangePlan
+from cosmotech.data_update_quest.core.migration.template_generator import MigrationTemplateGenerator
+
+
+@pytest.fixture
+def generator():
+    source = {
+        "components": {"schemas": {"Runner": {"properties": {"id": {"type": "string"}, "legacy": {"type": "string"}}}}}
+    }
+    target = {
+        "components": {
+            "schemas": {
+                "Runner": {
+                    "properties": {
+                        "id": {"type": "string"},
+                        "tags": {"type": "array", "default": ["a"]},
+                        "size": {"type": "integer"},
+                    }
+                }
+            }
+        }
+    }
+    return MigrationTemplateGenerator(source, target, "Runner", "Runner")
+
+
+def test_change_plan_is_computed_once(generator, monkeypatch):
+    calls = []
+    extract = generator._extract_nested_properties
+    monkeypatch.setattr(generator, "_extract_nested_properties", lambda *args: calls.append(args) or extract(*args))
+
+    generator.generate_jq_script()
+    generator._generate_readme()
+    generator.generate_json_plan()
+    generator.analyze_changes()
+
+    assert len(calls) == 3
+
+
+def test_change_plan_is_immutable(generator):
+    plan = generator.change_plan
+
+    changes = generator.analyze_changes()
+    changes["additions"][0]["default"].append("b")
+    changes["removals"].clear()
+
+    assert generator.analyze_changes() == plan.to_dict()
+    assert plan.additions[0].default == ["a"]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        plan.removals = ()
+
+
+def test_json_plan_round_trip(generator):
+    content = generator.generate_json_plan()
+
+    assert json.loads(content)["source_model"] == "Runner"
+    assert ChangePlan.from_json(content) == generator.change_plan
+
+
+def test_json_plan_version():
+    with pytest.raises(ValueError):
+        ChangePlan.from_json('{"version": 0}')
+
+
+def test_save_all_templates(generator, tmp_path):
+    generator.save_all_templates(str(tmp_path))
+
+    plan = json.loads((tmp_path / "plan.json").read_text())
+    assert plan["removals"] == [{"field": "legacy"}]
+    assert plan["additions"] == [{"field": "tags", "default": ["a"]}, {"field": "size", "default": None}]
+    assert "del(.legacy)" in (tmp_path / "transform.jq").read_text()
+    assert "`tags` (default: `['a']`)" in (tmp_path / "README.md").read_text()
+
+
+def test_jq_script_pipes_removals_into_additions(generator):
+    script = generator.generate_jq_script()
+
+    assert apply_template(script, '{"id": "r1", "legacy": "x"}') == json.dumps(
+        {"id": "r1", "tags": ["a"], "size": None}, indent=2
+    )
+
+
+def test_jq_script_pipes_across_sections(generator):
+    script = generator.generate_jq_script()
+
+    assert "\n# Field removals\ndel(.legacy)\n\n# Field additions\n| .tags = " in script
+    assert [line for line in script.splitlines() if line and not line.startswith("#")] == [
+        "del(.legacy)",
+        '| .tags = ["a"]',
+        "| .size = null",
+    ]
@@ -0,0 +1,101 @@
+import json
+import time
+
+import jq
+import pytest
+from click.testing import CliRunner
+
+from cosmotech.data_update_quest.core.database.redis.storage import BundleWriter
+from cosmotech.data_update_quest.core.database.redis.storage import write_manifest
+from cosmotech.data_update_quest.core.migration.estimate import estimate
+from cosmotech.data_update_quest.core.migration.estimate import estimate_index
+from cosmotech.data_update_quest.core.migration.estimate import percentile
+from cosmotech.data_update_quest_cli.migration.estimate import estimate_command
+
+
+@pytest.fixture
+def template(tmp_path):
+    template_file = tmp_path / "transform.jq"
+    template_file.write_text('del(.legacy) | .version = "3.2"')
+    return template_file
+
+
+@pytest.mark.parametrize(
+    "values,rank,expected",
+    [([], 50, 0.0), ([3.0], 99, 3.0), ([4.0, 1.0, 3.0, 2.0], 50, 2.0), (list(range(1, 101)), 90, 90), ([1, 2], 0, 1)],
+)
+def test_percentile(values, rank, expected):
+    assert percentile(values, rank) == expected
+
+
+def test_estimate_index():
+    documents = [json.dumps({"id": f"o-{i}", "legacy": True}) for i in range(10)] + ["{broken"]
+
+    result = estimate_index('del(.legacy) | .version = "3.2"', documents, count=1000, workers=4)
+
+    assert result["sampled"] == 11
+    assert result["failed"] == 1
+    assert result["documents"] == 1000
+    assert result["latency"]["p50"] <= result["latency"]["p99"] <= result["latency"]["max"]
+    assert result["size_ratio"] > 0
+    assert result["projected_duration"] == pytest.approx(result["latency"]["mean"] * 1000 / 1000 / 4)
+
+
+def test_estimate_index_does_not_time_the_compile(monkeypatch):
+    compile_program = jq.compile
+
+    def slow_compile(template):
+        time.sleep(0.2)
+        return compile_program(template)
+
+    monkeypatch.setattr(jq, "compile", slow_compile)
+
+    result = estimate_index(".slow_compile |= . + 1", [json.dumps({"slow_compile": i}) for i in range(3)], count=3)
+
+    assert result["failed"] == 0
+    assert result["latency"]["max"] < 100
+
+
+def test_estimate_index_refuses_an_invalid_template():
+    with pytest.raises(ValueError):
+        estimate_index("del(", [json.dumps({"id": 1})], count=1)
+
+
+def test_estimate_dump_directory(tmp_path, template):
+    for index, count in (("organization", 5), ("workspace", 3)):
+        (tmp_path / "dump" / index).mkdir(parents=True)
+        for i in range(count):
+            (tmp_path / "dump" / index / f"{i}.json").write_text(json.dumps({"id": i, "legacy": 1}))
+
+    estimates = estimate(template, None, None, None, ["Organization"], sample_size=2, dump_path=tmp_path / "dump")
+
+    assert list(estimates) == ["organization"]
+    assert estimates["organization"]["sampled"] == 2
+    assert estimates["organization"]["documents"] == 5
+
+
+def test_estimate_dump_bundle(tmp_path, template):
+    writer = BundleWriter(tmp_path, "workspace", "gzip")
+    writer.write([(str(i), json.dumps({"id": i, "legacy": 1})) for i in range(6)])
+    write_manifest(tmp_path, "gzip", {"workspace": writer.close()})
+
+    estimates = estimate(template, None, None, None, None, sample_size=4, dump_path=tmp_path)
+    selected = estimate(template, None, None, None, ["WORKSPACE", "runner"], sample_size=4, dump_path=tmp_path)
+
+    assert list(selected) == ["workspace"]
+    assert estimates["workspace"]["sampled"] == 4
+    assert estimates["workspace"]["documents"] == 6
+    assert estimates["workspace"]["failed"] == 0
+
+
+def test_estimate_command_only_needs_a_password_for_redis(tmp_path, template, monkeypatch):
+    monkeypatch.delenv("REDIS_SECRET", raising=False)
+    (tmp_path / "dump" / "workspace").mkdir(parents=True)
+    (tmp_path / "dump" / "workspace" / "0.json").write_text(json.dumps({"id": 0, "legacy": 1}))
+
+    from_dump = CliRunner().invoke(estimate_command, ["-t", str(template), "--dump-path", str(tmp_path / "dump")])
+    from_redis = CliRunner().invoke(estimate_command, ["-t", str(template)])
+
+    assert from_dump.exit_code == 0, from_dump.output
+    assert from_redis.exit_code == 2
+    assert "--password" in from_redis.output
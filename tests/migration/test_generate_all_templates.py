@@ -0,0 +1,111 @@
+import json
+
+import yaml
+from click.testing import CliRunner
+
+from cosmotech.data_update_quest.core.migration.generate_batch import generate_all_templates
+from cosmotech.data_update_quest.core.migration.generate_batch import get_models
+from cosmotech.data_update_quest.core.migration.generate_batch import match_models
+from cosmotech.data_update_quest.core.migration.spec_cache import SpecCache
+from cosmotech.data_update_quest.core.migration.template_generator import MigrationTemplateGenerator
+from cosmotech.data_update_quest_cli.template_generator.generate import generate_templates
+
+
+def make_spec(version, schemas):
+    return {"openapi": "3.0.0", "info": {"version": version}, "components": {"schemas": schemas}}
+
+
+def write_specs(tmp_path):
+    source = make_spec(
+        "3.1",
+        {
+            "Workspace": {"type": "object", "properties": {"id": {"type": "string"}, "legacy": {"type": "string"}}},
+            "Runner": {"type": "object", "properties": {"id": {"type": "string"}}},
+            "Dataset": {"type": "object", "properties": {"id": {"type": "string"}}},
+            "Scenario": {"type": "object", "properties": {"id": {"type": "string"}}},
+        },
+    )
+    target = make_spec(
+        "3.2",
+        {
+            "Workspace": {"type": "object", "properties": {"id": {"type": "string"}}},
+            "Runner": {"type": "object", "properties": {"id": {"type": "string"}, "state": {"default": "Created"}}},
+            "Dataset": {"type": "object", "properties": {"id": {"type": "string"}}},
+        },
+    )
+    (tmp_path / "source.yaml").write_text(yaml.safe_dump(source))
+    (tmp_path / "target.json").write_text(json.dumps(target))
+    return str(tmp_path / "source.yaml"), str(tmp_path / "target.json")
+
+
+def test_match_models():
+    matches = match_models(["Workspace", "Scenario", "Old"], ["Workspace", "Runner"], {"Scenario": "Runner"})
+
+    assert matches == {"Workspace": "Workspace", "Scenario": "Runner"}
+
+
+def test_get_models_swagger():
+    assert get_models({"definitions": {"Organization": {}}}) == ["Organization"]
+
+
+def test_generate_all_templates(tmp_path):
+    source_path, target_path = write_specs(tmp_path)
+    mapping = tmp_path / "mapping.yaml"
+    mapping.write_text("Scenario: Runner\n")
+
+    summary = generate_all_templates(source_path, target_path, str(tmp_path / "templates"), str(mapping), workers=2)
+
+    version_dir = tmp_path / "templates" / "3.1_to_3.2"
+    assert summary["output_dir"] == str(version_dir)
+    assert sorted(summary["generated"]) == ["Dataset", "Runner", "Scenario", "Workspace"]
+    assert summary["failed"] == []
+    assert "del(.legacy)" in (version_dir / "Workspace" / "transform.jq").read_text()
+    assert '.state = "Created"' in (version_dir / "Scenario" / "transform.jq").read_text()
+    assert (version_dir / "Runner" / "README.md").is_file()
+
+
+def test_generate_all_templates_caches_the_models_resolved_by_the_workers(tmp_path, monkeypatch):
+    source_path, target_path = write_specs(tmp_path)
+    parent_calls = []
+    extract_schema = MigrationTemplateGenerator._extract_schema
+
+    def spy(openapi, model_name, resolver=None):
+        # Calls made by the worker processes are not seen here
+        parent_calls.append(model_name)
+        return extract_schema(openapi, model_name, resolver)
+
+    monkeypatch.setattr(MigrationTemplateGenerator, "_extract_schema", staticmethod(spy))
+
+    summary = generate_all_templates(
+        source_path, target_path, str(tmp_path / "out"), workers=2, cache_dir=tmp_path / "cache"
+    )
+
+    assert summary["failed"] == []
+    assert parent_calls == []
+    assert sorted(SpecCache(tmp_path / "cache").load(source_path).models) == ["Dataset", "Runner", "Workspace"]
+    assert sorted(SpecCache(tmp_path / "cache").load(target_path).models) == ["Dataset", "Runner", "Workspace"]
+
+
+def test_generate_templates_command_all_models(tmp_path, monkeypatch):
+    monkeypatch.setenv("CSM_DUQ_CACHE_DIR", str(tmp_path / "cache"))
+    source_path, target_path = write_specs(tmp_path)
+
+    result = CliRunner().invoke(
+        generate_templates,
+        [source_path, target_path, "--all-models", "--workers", "1", "--output-dir", str(tmp_path / "out")],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert sorted(path.name for path in (tmp_path / "out" / "3.1_to_3.2").iterdir()) == [
+        "Dataset",
+        "Runner",
+        "Workspace",
+    ]
+
+
+def test_generate_templates_command_requires_models(tmp_path):
+    source_path, target_path = write_specs(tmp_path)
+
+    result = CliRunner().invoke(generate_templates, [source_path, target_path])
+
+    assert result.exit_code == 2
@@ -0,0 +1,175 @@
+import json
+import random
+
+import jq
+import pytest
+
+from cosmotech.data_update_quest.core.migration.apply_template import TemplateCache
+from cosmotech.data_update_quest.core.migration.apply_template import compose_templates
+from cosmotech.data_update_quest.core.migration.change_plan import ChangePlan
+from cosmotech.data_update_quest.core.migration.change_plan import FieldAddition
+from cosmotech.data_update_quest.core.migration.change_plan import FieldRemoval
+from cosmotech.data_update_quest.core.migration.native_transform import NativeProgram
+from cosmotech.data_update_quest.core.migration.native_transform import compile_plan
+from cosmotech.data_update_quest.core.migration.native_transform import compile_template
+from cosmotech.data_update_quest.core.migration.template_generator import MigrationTemplateGenerator
+
+SOURCE = {
+    "components": {
+        "schemas": {
+            "Runner": {
+                "properties": {
+                    "id": {"type": "string"},
+                    "legacy": {"type": "string"},
+                    "security": {
+                        "type": "object",
+                        "properties": {"default": {"type": "string"}, "acl": {"type": "array"}},
+                    },
+                    "parameters": {"type": "object", "properties": {"old": {"type": "string"}}},
+                }
+            }
+        }
+    }
+}
+TARGET = {
+    "components": {
+        "schemas": {
+            "Runner": {
+                "properties": {
+                    "id": {"type": "string"},
+                    "tags": {"type": "array", "default": ["a"]},
+                    "state": {"type": "string", "default": "Créé"},
+                    "ratio": {"type": "number", "default": 0.5},
+                    "parameters": {
+                        "type": "object",
+                        "properties": {"new": {"type": "object", "default": {"values": [1, 2]}}},
+                    },
+                    "options": {"type": "object", "properties": {"size": {"type": "integer"}}},
+                }
+            }
+        }
+    }
+}
+
+DOCUMENTS = [
+    {"id": "r1", "legacy": "x", "security": {"default": "none", "acl": []}, "parameters": {"old": "o"}},
+    {"id": "r2"},
+    {"id": "r3", "security": None, "parameters": None, "options": None},
+    {"id": "r4", "parameters": {"old": "o", "new": "kept"}, "tags": ["b"], "zz": [{"a": 1}, "é", 0.25, True]},
+    {"id": "r5", "security": 3},
+    {"id": "r6", "options": "small"},
+    {"id": "r7", "count": 1.0, "parameters": {"old": 2.0}},
+    {"id": "r8", "count": 2**60, "nested": [[-(2**53)]]},
+    {"id": "r9", "name": "\ud800"},
+    None,
+    [1, 2],
+    "runner",
+    {},
+]
+
+
+def jq_output(template, document):
+    try:
+        return json.dumps(jq.compile(template).input(document).first())
+    except ValueError as e:
+        return f"error: {e}"
+
+
+def native_output(program, document):
+    try:
+        return json.dumps(program.input(document).first())
+    except ValueError as e:
+        return f"error: {e}"
+
+
+@pytest.fixture
+def script():
+    return MigrationTemplateGenerator(SOURCE, TARGET, "Runner", "Runner").generate_jq_script()
+
+
+def test_generated_script_is_compiled_natively(script):
+    program = compile_template(script)
+
+    assert isinstance(program, NativeProgram)
+    assert isinstance(TemplateCache().get_program(script), NativeProgram)
+    assert [step.to_jq() for step in program.steps] == [
+        line.removeprefix("| ") for line in script.splitlines() if line and not line.startswith("#")
+    ]
+
+
+@pytest.mark.parametrize("document", DOCUMENTS, ids=lambda document: json.dumps(document)[:40])
+def test_native_program_matches_jq(script, document):
+    copy = json.loads(json.dumps(document))
+
+    assert native_output(compile_template(script), document) == jq_output(script, document)
+    assert json.dumps(document) == json.dumps(copy)
+
+
+def test_chained_scripts_match_jq(script):
+    second = "# Second step\n\ndel(.tags)\n| .tags = {}\n| .parameters.new.values = null"
+    template = compose_templates([script, second, "."])
+
+    program = compile_template(template)
+
+    assert len(program.steps) == len(compile_template(script).steps) + 3
+    for document in DOCUMENTS:
+        assert native_output(program, document) == jq_output(template, document)
+
+
+def test_compile_plan_matches_generated_script():
+    generator = MigrationTemplateGenerator(SOURCE, TARGET, "Runner", "Runner")
+    program = compile_plan(generator.change_plan)
+
+    for document in DOCUMENTS:
+        assert native_output(program, document) == jq_output(generator.generate_jq_script(), document)
+
+
+def test_additions_get_their_own_default():
+    program = compile_plan(ChangePlan("Runner", "Runner", additions=(FieldAddition("tags", ["a"]),)))
+
+    first = program.input({}).first()
+    first["tags"].append("b")
+
+    assert program.input({}).first() == {"tags": ["a"]}
+
+
+@pytest.mark.parametrize(
+    "template",
+    [
+        ".tags |= . + [1]",
+        ".tags = .legacy",
+        'del(.["my-field"])',
+        ".my-field = 1",
+        ".size = 1.0",
+        ".size = 9007199254740993",
+        ".size = 1 # inline comment",
+        "del(.legacy) | .size = 1",
+        "del(.legacy)\n.size = 1",
+        "# only comments",
+        "(\n.size = 1\n)\n| (\n.size += 1\n)",
+    ],
+)
+def test_other_templates_are_compiled_by_jq(template):
+    assert compile_template(template) is None
+
+
+def test_random_documents_match_jq(script):
+    generator = random.Random(42)
+    values = [None, True, 0, -7, 2**53, 2**53 + 1, 0.1, 3.0, "", "a", "é", [], {}, [1, "b"], {"old": "o"}]
+    fields = ["id", "legacy", "security", "parameters", "options", "tags", "default", "acl", "old", "new", "size"]
+
+    def random_value(depth):
+        if depth and generator.random() < 0.4:
+            return {generator.choice(fields): random_value(depth - 1) for _ in range(generator.randint(0, 4))}
+        return generator.choice(values)
+
+    program = compile_template(script)
+    for _ in range(500):
+        document = random_value(3)
+        assert native_output(program, document) == jq_output(script, document)
+
+
+def test_removals_and_additions_render_as_the_generator_does():
+    assert FieldRemoval("security.acl").to_jq() == "del(.security.acl)"
+    assert FieldAddition("state").to_jq() == ".state = null"
+    assert FieldAddition("state", "Créé").to_jq() == '.state = "Cr\\u00e9\\u00e9"'
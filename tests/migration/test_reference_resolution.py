@@ -0,0 +1,83 @@
+import pytest
+
+from cosmotech.data_update_quest.core.migration.template_generator import MigrationTemplateGenerator
+from cosmotech.data_update_quest.core.migration.template_generator import ReferenceResolver
+
+
+def ref(name):
+    return {"$ref": f"#/components/schemas/{name}"}
+
+
+@pytest.fixture
+def openapi():
+    return {
+        "components": {
+            "schemas": {
+                "Security": {
+                    "type": "object",
+                    "description": "Security of the object",
+                    "properties": {"default": {"type": "string"}, "accessControlList": {"items": ref("Access")}},
+                },
+                "Access": {"type": "object", "properties": {"id": {"type": "string"}, "role": {"type": "string"}}},
+                "Node": {
+                    "type": "object",
+                    "properties": {"name": {"type": "string"}, "children": {"items": ref("Node")}},
+                },
+                "Base": {"type": "object", "required": ["id"], "properties": {"id": {"type": "string"}}},
+                "Workspace": {
+                    "allOf": [ref("Base")],
+                    "properties": {
+                        "security": ref("Security"),
+                        "previousSecurity": ref("Security"),
+                        "tree": ref("Node"),
+                    },
+                },
+            }
+        }
+    }
+
+
+def test_shared_reference_is_resolved_everywhere(openapi):
+    schema = MigrationTemplateGenerator._extract_schema(openapi, "Workspace")
+
+    assert schema["properties"]["security"] == schema["properties"]["previousSecurity"]
+    access = schema["properties"]["security"]["properties"]["accessControlList"]["items"]
+    assert access["properties"]["role"] == {"type": "string"}
+    assert schema["properties"]["id"] == {"type": "string"}
+    assert schema["required"] == ["id"]
+    assert "description" not in schema["properties"]["security"]
+
+
+def test_cycle_is_not_expanded_again(openapi):
+    schema = MigrationTemplateGenerator._extract_schema(openapi, "Workspace")
+
+    tree = schema["properties"]["tree"]
+    assert tree["properties"]["children"]["items"] == {}
+
+
+def test_references_are_resolved_once(openapi):
+    resolver = ReferenceResolver(openapi)
+
+    MigrationTemplateGenerator._extract_schema(openapi, "Workspace", resolver)
+    misses = resolver.misses
+    MigrationTemplateGenerator._extract_schema(openapi, "Workspace", resolver)
+
+    # Security, Access, Node and Base are each resolved once, the second Security is a hit
+    assert misses == 4
+    assert resolver.hits == 1
+    # The resolved model itself is kept for the second run
+    assert resolver.misses == misses
+    assert resolver.hits == 1
+
+
+def test_resolution_does_not_modify_the_spec(openapi):
+    MigrationTemplateGenerator._extract_schema(openapi, "Workspace")
+
+    assert list(openapi["components"]["schemas"]["Workspace"]["properties"]) == ["security", "previousSecurity", "tree"]
+
+
+def test_reachable_refs(openapi):
+    resolver = ReferenceResolver(openapi)
+
+    assert resolver.reachable_refs("#/components/schemas/Security") == {"#/components/schemas/Access"}
+    assert resolver.reachable_refs("#/components/schemas/Node") == {"#/components/schemas/Node"}
@@ -0,0 +1,94 @@
+import pytest
+
+from cosmotech.data_update_quest.core.migration.schema_diff import PROPERTY_ADDED
+from cosmotech.data_update_quest.core.migration.schema_diff import PROPERTY_REMOVED
+from cosmotech.data_update_quest.core.migration.schema_diff import TYPE_CHANGED
+from cosmotech.data_update_quest.core.migration.schema_diff import diff_schemas
+from cosmotech.data_update_quest.core.migration.template_generator import MigrationTemplateGenerator
+
+SOURCE = {
+    "type": "object",
+    "properties": {
+        "id": {"type": "string"},
+        "legacy": {"type": "object", "properties": {"flag": {"type": "boolean"}, "note": {"type": "string"}}},
+        "size": {"type": "string"},
+        "tags": {"type": ["string", "null"]},
+        "security": {
+            "type": "object",
+            "properties": {"default": {"type": "string"}, "owner": {"type": "string"}},
+        },
+    },
+}
+
+TARGET = {
+    "type": "object",
+    "properties": {
+        "id": {"type": "string", "format": "uuid"},
+        "size": {"type": "integer"},
+        "tags": {"type": ["null", "string"]},
+        "security": {
+            "type": "object",
+            "properties": {
+                "default": {"type": "string"},
+                "accessControlList": {
+                    "type": "object",
+                    "default": {},
+                    "properties": {"role": {"type": "string", "default": "viewer"}},
+                },
+            },
+        },
+        "state": {"type": "string", "default": "Created"},
+    },
+}
+
+
+def test_diff_schemas():
+    changes = diff_schemas(SOURCE, TARGET)
+
+    assert [(change.kind, change.path) for change in changes] == [
+        (PROPERTY_REMOVED, "legacy"),
+        (PROPERTY_REMOVED, "security.owner"),
+        (PROPERTY_ADDED, "state"),
+        (PROPERTY_ADDED, "security.accessControlList"),
+        (TYPE_CHANGED, "size"),
+    ]
+    assert changes[-1].old_type == "string"
+    assert changes[-1].new_type == "integer"
+
+
+@pytest.mark.parametrize("source,target", [({}, {}), (SOURCE, SOURCE), ({"properties": None}, {"type": "object"})])
+def test_diff_schemas_no_change(source, target):
+    assert diff_schemas(source, target) == []
+
+
+def test_diff_schemas_is_linear():
+    # A deep chain of nested objects is walked without recursion
+    source = target = {}
+    for depth in range(5000):
+        source = {"type": "object", "properties": {f"p{depth}": source}}
+        target = {"type": "object", "properties": {f"p{depth}": target}}
+
+    assert diff_schemas(source, target) == []
+
+
+def test_analyze_changes():
+    openapi_source = {"components": {"schemas": {"Workspace": SOURCE}}}
+    openapi_target = {"components": {"schemas": {"Workspace": TARGET}}}
+
+    changes = MigrationTemplateGenerator(openapi_source, openapi_target, "Workspace", "Workspace").analyze_changes()
+
+    assert changes == {
+        "removals": [
+            {"field": "legacy"},
+            {"field": "legacy.flag"},
+            {"field": "legacy.note"},
+            {"field": "security.owner"},
+        ],
+        "additions": [
+            {"field": "state", "default": "Created"},
+            {"field": "security.accessControlList", "default": {}},
+            {"field": "security.accessControlList.role", "default": "viewer"},
+        ],
+        "type_changes": [{"field": "size", "old_type": "string", "new_type": "integer"}],
+        "moves": [],
+    }
@@ -0,0 +1,119 @@
+import json
+import pickle
+
+import pytest
+import yaml
+
+from cosmotech.data_update_quest.core.migration import spec_cache
+from cosmotech.data_update_quest.core.migration.spec_cache import SpecCache
+from cosmotech.data_update_quest.core.migration.template_generator import MigrationTemplateGenerator
+
+SPEC = {
+    "openapi": "3.0.0",
+    "components": {
+        "schemas": {
+            "Security": {"type": "object", "properties": {"default": {"type": "string"}}},
+            "Workspace": {"type": "object", "properties": {"security": {"$ref": "#/components/schemas/Security"}}},
+        }
+    },
+}
+
+
+def test_spec_cache_round_trip(tmp_path, monkeypatch):
+    spec_file = tmp_path / "api.yaml"
+    spec_file.write_text(yaml.safe_dump(SPEC))
+    MigrationTemplateGenerator.from_openapi_files(
+        str(spec_file), str(spec_file), "Workspace", "Workspace", cache_dir=tmp_path / "cache"
+    )
+    assert len(list((tmp_path / "cache").glob("*.pickle"))) == 1
+
+    # The cached spec is neither parsed nor resolved again
+    monkeypatch.setattr(MigrationTemplateGenerator, "_parse_content", None)
+    monkeypatch.setattr(MigrationTemplateGenerator, "_resolve_references", None)
+    resolver = SpecCache(tmp_path / "cache").load(str(spec_file))
+
+    assert resolver.openapi == SPEC
+    assert resolver.models["Workspace"]["properties"]["security"]["properties"] == {"default": {"type": "string"}}
+
+
+def test_spec_cache_keyed_by_content(tmp_path):
+    cache = SpecCache(tmp_path / "cache")
+    spec_file = tmp_path / "api.json"
+    spec_file.write_text(json.dumps(SPEC))
+    cache.save(cache.load(str(spec_file)))
+
+    spec_file.write_text(json.dumps({"openapi": "3.1.0"}))
+
+    assert SpecCache(tmp_path / "cache").load(str(spec_file)).openapi == {"openapi": "3.1.0"}
+    assert len(list((tmp_path / "cache").glob("*.pickle"))) == 1
+
+
+def test_spec_cache_invalid_entry(tmp_path):
+    cache = SpecCache(tmp_path / "cache")
+    spec_file = tmp_path / "api.json"
+    spec_file.write_text(json.dumps(SPEC))
+    cache.save(cache.load(str(spec_file)))
+    for entry in (tmp_path / "cache").glob("*.pickle"):
+        entry.write_bytes(b"not a pickle")
+
+    assert SpecCache(tmp_path / "cache").load(str(spec_file)).openapi == SPEC
+
+
+def test_default_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+    assert spec_cache.get_default_cache_dir() == tmp_path / "csm-duq" / "specs"
+
+
+def test_unwritable_cache_dir_disables_the_cache(tmp_path):
+    # A cache directory under a file can not be created, as on a read-only home
+    (tmp_path / "home").write_text("")
+    spec_file = tmp_path / "api.yaml"
+    spec_file.write_text(yaml.safe_dump(SPEC))
+
+    generator = MigrationTemplateGenerator.from_openapi_files(
+        str(spec_file), str(spec_file), "Workspace", "Workspace", cache_dir=tmp_path / "home" / "cache"
+    )
+
+    assert generator.change_plan.is_empty()
+    assert SpecCache(tmp_path / "home" / "cache").enabled is False
+
+
+def test_shared_cache_dir_disables_the_cache(tmp_path, monkeypatch):
+    spec_file = tmp_path / "api.json"
+    spec_file.write_text(json.dumps(SPEC))
+    cache = SpecCache(tmp_path / "cache")
+    cache.save(cache.load(str(spec_file)))
+    # Anyone could replace the entries of a cache directory writable by others
+    (tmp_path / "cache").chmod(0o777)
+    monkeypatch.setattr(spec_cache.pickle, "load", None)
+
+    assert SpecCache(tmp_path / "cache").enabled is False
+    assert SpecCache(tmp_path / "cache").load(str(spec_file)).openapi == SPEC
+
+    (tmp_path / "cache").chmod(0o700)
+    monkeypatch.setattr(spec_cache.os, "getuid", lambda: 12345)
+
+    assert SpecCache(tmp_path / "cache").enabled is False
+
+
+@pytest.mark.parametrize("error", [OSError("disk full"), pickle.PicklingError("unpicklable")])
+def test_failed_save_removes_the_temporary_file(tmp_path, monkeypatch, error):
+    spec_file = tmp_path / "api.json"
+    spec_file.write_text(json.dumps(SPEC))
+    cache = SpecCache(tmp_path / "cache")
+
+    def failing_dump(*args, **kwargs):
+        raise error
+
+    monkeypatch.setattr(spec_cache.pickle, "dump", failing_dump)
+    resolver = cache.load(str(spec_file))
+    if isinstance(error, OSError):
+        # An unwritable cache is disabled
+        cache.save(resolver)
+        assert cache.enabled is False
+    else:
+        with pytest.raises(pickle.PicklingError):
+            cache.save(resolver)
+
+    assert list((tmp_path / "cache").iterdir()) == []
@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+from cosmotech.data_update_quest.core.migration.apply_template import TEMPLATE_CACHE
+from cosmotech.data_update_quest.core.migration.apply_template import TemplateCache
+from cosmotech.data_update_quest.core.migration.apply_template import apply_template
+from cosmotech.data_update_quest.core.migration.apply_template import apply_template_from_file
+from cosmotech.data_update_quest.core.migration.apply_template import get_template_cache_stats
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    TEMPLATE_CACHE.clear()
+    yield
+    TEMPLATE_CACHE.clear()
+
+
+def test_apply_template_compiles_once():
+    for i in range(10):
+        assert apply_template(".[0]", f"[{i}, 2]") == str(i)
+
+    stats = get_template_cache_stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 9
+    assert stats["size"] == 1
+
+
+def test_cache_eviction():
+    cache = TemplateCache(max_size=2)
+    cache.get_program(".a")
+    cache.get_program(".b")
+    cache.get_program(".a")
+    cache.get_program(".c")
+    cache.get_program(".b")
+
+    assert cache.stats() == {"hits": 1, "misses": 4, "evictions": 2, "size": 2, "max_size": 2}
+
+
+def test_apply_template_from_file_reloads_modified_file(tmp_path):
+    template_file = tmp_path / "transform.jq"
+    template_file.write_text(".a")
+
+    assert apply_template_from_file(template_file, '{"a": 1, "b": 2}') == "1"
+    assert apply_template_from_file(template_file, '{"a": 3, "b": 4}') == "3"
+    assert get_template_cache_stats()["hits"] == 1
+
+    template_file.write_text(".b")
+    stat = template_file.stat()
+    os.utime(template_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert apply_template_from_file(template_file, '{"a": 1, "b": 2}') == "2"
+    assert get_template_cache_stats()["misses"] == 2
+
+
+def test_invalid_template_is_not_cached():
+    with pytest.raises(ValueError):
+        apply_template("del(.", "{}")
+
+    assert get_template_cache_stats()["size"] == 0
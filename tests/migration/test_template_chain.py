@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from cosmotech.data_update_quest.core.migration.apply_batch import apply_template_batch
+from cosmotech.data_update_quest.core.migration.apply_template import apply_template
+from cosmotech.data_update_quest.core.migration.apply_template import compose_templates
+from cosmotech.data_update_quest.core.migration.apply_template import read_template_chain
+
+STEPS = [
+    "# JQ transformation script\n# 3.0 to 3.1\n\n# Field removals\ndel(.legacy)\n| .tags = []",
+    "def bump: . + 1;\n.revision |= bump  # trailing comment",
+    '.security = {"default": "none"}\n| del(.tags)',
+]
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        {"id": "w-1", "legacy": True, "revision": 1},
+        {"id": "w-2", "revision": 41, "tags": ["a"]},
+    ],
+)
+def test_chain_matches_sequential_steps(document):
+    sequential = json.dumps(document)
+    for step in STEPS:
+        sequential = apply_template(step, sequential)
+
+    assert apply_template(compose_templates(STEPS), json.dumps(document)) == sequential
+
+
+def test_single_template_chain_is_unchanged():
+    assert compose_templates([".a"]) == ".a"
+
+
+def test_empty_chain():
+    with pytest.raises(ValueError):
+        compose_templates([])
+
+
+def test_apply_template_batch_chain(tmp_path):
+    template_files = []
+    for position, step in enumerate(STEPS):
+        template_files.append(tmp_path / f"step_{position}.jq")
+        template_files[-1].write_text(step)
+    (tmp_path / "input").mkdir()
+    (tmp_path / "input" / "w-1.json").write_text(json.dumps({"id": "w-1", "legacy": True, "revision": 1}))
+
+    summary = apply_template_batch(template_files, tmp_path / "input", tmp_path / "output", workers=1)
+
+    assert summary["succeeded"] == 1
+    assert json.loads((tmp_path / "output" / "w-1.json").read_text()) == {
+        "id": "w-1",
+        "revision": 2,
+        "security": {"default": "none"},
+    }
+
+
+def test_read_template_chain_missing_file(tmp_path):
+    with pytest.raises(ValueError):
+        read_template_chain([tmp_path / "missing.jq"])
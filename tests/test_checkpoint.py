@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from cosmotech.data_update_quest.core.checkpoint import CheckpointJournal
+
+
+def test_journal_round_trip(tmp_path):
+    journal_path = tmp_path / "journal.jsonl"
+    with CheckpointJournal(journal_path, "redis-dump", {"page_size": 10}) as journal:
+        journal.record("organization", 0, count=10, last="o-9")
+        journal.record("organization", 10, count=3, failed=1, last="o-12")
+
+    with CheckpointJournal(journal_path, "redis-dump", {"page_size": 10}, resume=True) as journal:
+        assert journal.is_done("organization", 0)
+        assert journal.is_done("organization", 10)
+        assert not journal.is_done("organization", 20)
+        assert not journal.is_done("workspace", 0)
+        assert journal.counts["organization"] == {"count": 13, "failed": 1}
+
+
+def test_journal_without_resume_starts_over(tmp_path):
+    journal_path = tmp_path / "journal.jsonl"
+    with CheckpointJournal(journal_path, "redis-dump", {"page_size": 10}) as journal:
+        journal.record("organization", 0, count=10)
+
+    with CheckpointJournal(journal_path, "redis-dump", {"page_size": 10}) as journal:
+        assert not journal.is_done("organization", 0)
+    assert len(journal_path.read_text().splitlines()) == 1
+
+
+def test_journal_ignores_interrupted_record(tmp_path):
+    journal_path = tmp_path / "journal.jsonl"
+    with CheckpointJournal(journal_path, "redis-dump", {"page_size": 10}) as journal:
+        journal.record("organization", 0, count=10)
+    with open(journal_path, "a") as file:
+        file.write('{"index": "organization", "unit": 1')
+
+    with CheckpointJournal(journal_path, "redis-dump", {"page_size": 10}, resume=True) as journal:
+        assert journal.completed == {"organization": {0}}
+
+
+@pytest.mark.parametrize(
+    "command,settings", [("redis-file-upload", {"page_size": 10}), ("redis-dump", {"page_size": 5})]
+)
+def test_journal_settings_mismatch(tmp_path, command, settings):
+    journal_path = tmp_path / "journal.jsonl"
+    CheckpointJournal(journal_path, "redis-dump", {"page_size": 10}).close()
+
+    with pytest.raises(ValueError):
+        CheckpointJournal(journal_path, command, settings, resume=True)
+
+
+def test_journal_header(tmp_path):
+    journal_path = tmp_path / "journal.jsonl"
+    CheckpointJournal(journal_path, "redis-dump", {"page_size": 10}).close()
+
+    assert json.loads(journal_path.read_text()) == {"command": "redis-dump", "settings": {"page_size": 10}}
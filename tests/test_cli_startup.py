@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from click.testing import CliRunner
+
+from cosmotech.data_update_quest_cli.__main__ import SUBCOMMANDS
+from cosmotech.data_update_quest_cli.__main__ import main
+
+# Import time allowed for the CLI entry point, in milliseconds, can be raised on slow machines
+IMPORT_BUDGET_MS = int(os.environ.get("CSM_DUQ_IMPORT_BUDGET_MS", "600"))
+
+HEAVY_MODULES = ["redis", "jq", "cosmotech.csm_data", "cosmotech.data_update_quest.core"]
+
+
+def run_python(code):
+    return subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True)
+
+
+def test_cli_import_loads_no_subcommand():
+    modules = [*HEAVY_MODULES, *(import_path.split(":")[0] for import_path, _ in SUBCOMMANDS.values())]
+
+    result = run_python(
+        "import sys\n"
+        "import cosmotech.data_update_quest_cli.__main__\n"
+        f"print([module for module in {modules!r} if module in sys.modules])"
+    )
+
+    assert result.stdout.strip() == "[]"
+
+
+def test_cli_import_time_budget():
+    result = run_python("import cosmotech.data_update_quest_cli.__main__")
+
+    # The last line of -X importtime is the entry point, with its cumulative time in microseconds
+    cumulative = int(result.stderr.strip().splitlines()[-1].split("|")[1])
+    assert cumulative / 1000 < IMPORT_BUDGET_MS
+
+
+@pytest.mark.parametrize("name", SUBCOMMANDS)
+def test_lazy_subcommands_load(name):
+    command = main.load_command(name)
+
+    assert main.get_command(None, name) is command
+
+
+def test_lazy_subcommand_runs():
+    result = CliRunner().invoke(main, ["apply-template", "--help"])
+
+    assert result.exit_code == 0
+    assert "--chunk-size" in result.output
@@ -0,0 +1,77 @@
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+from click.testing import CliRunner
+
+from cosmotech.data_update_quest.core import codec
+from cosmotech.data_update_quest.core.database.redis.client import ID_FIELD
+from cosmotech.data_update_quest.core.database.redis.client import document_id
+from cosmotech.data_update_quest.core.database.redis.verify import canonical_hash
+from cosmotech.data_update_quest_cli.__main__ import main
+
+DOCUMENT = {"id": "w-1", "name": "Éole", "tags": ["a", "b"], "empty": {}, "size": 3, "ratio": 0.5, "none": None}
+
+available_codecs = [codec.STDLIB_CODEC] + ([codec.ORJSON_CODEC] if codec.orjson is not None else [])
+
+
+@pytest.fixture(autouse=True)
+def restore_codec(monkeypatch):
+    monkeypatch.setattr(codec, "CODEC", codec.CODEC)
+    monkeypatch.setenv(codec.CODEC_ENVVAR, os.environ.get(codec.CODEC_ENVVAR, codec.AUTO_CODEC))
+
+
+@pytest.mark.parametrize("name", available_codecs)
+def test_codecs_produce_the_same_output(name):
+    json_codec = codec.get_codec(name)
+
+    assert json_codec.dumps(DOCUMENT) == json.dumps(DOCUMENT, separators=(",", ":"), ensure_ascii=False)
+    assert json_codec.dumps(DOCUMENT, pretty=True) == json.dumps(DOCUMENT, indent=2, ensure_ascii=False)
+    assert json_codec.dumps_bytes({"b": 1, "a": 2}, sort_keys=True) == b'{"a":2,"b":1}'
+    assert json_codec.loads(json.dumps(DOCUMENT)) == DOCUMENT
+    assert json_codec.loads(memoryview(json.dumps(DOCUMENT).encode())) == DOCUMENT
+
+
+@pytest.mark.parametrize("name", available_codecs)
+def test_codecs_handle_values_orjson_refuses(name):
+    json_codec = codec.get_codec(name)
+
+    assert json_codec.dumps({"big": 2**70}) == '{"big":1180591620717411303424}'
+    assert json_codec.dumps({"ratio": float("nan"), "none": None}) == '{"ratio":NaN,"none":null}'
+    assert json_codec.dumps_bytes([float("inf")], pretty=True) == b"[\n  Infinity\n]"
+    assert json_codec.loads('{"ratio": NaN}')["ratio"] != json_codec.loads('{"ratio": NaN}')["ratio"]
+    assert json_codec.loads(b'{"big": 18446744073709551616, "small": -2}') == {"big": 2**64, "small": -2}
+    assert json_codec.loads('{"big": 1180591620717411303424}')["big"] == 2**70
+    with pytest.raises(ValueError):
+        json_codec.loads("{not json")
+
+
+@pytest.mark.parametrize("name", available_codecs)
+def test_canonical_hash_matches_the_values_read_by_redis(name, monkeypatch):
+    monkeypatch.setattr(codec, "CODEC", codec.get_codec(name))
+    content = '{"big": 1180591620717411303424, "ratio": 0.5}'
+
+    # redis-py reads documents with the standard library
+    assert canonical_hash(codec.loads(content)) == canonical_hash(json.loads(content))
+
+
+def test_set_codec_is_inherited_by_workers():
+    codec.set_codec(codec.STDLIB_CODEC)
+
+    assert codec.CODEC.name == codec.STDLIB_CODEC
+    assert os.environ[codec.CODEC_ENVVAR] == codec.STDLIB_CODEC
+    with pytest.raises(ValueError):
+        codec.set_codec("ujson")
+
+
+def test_document_id_is_only_parsed_when_not_returned():
+    assert document_id(SimpleNamespace(json="not parsed", **{ID_FIELD: "w-1"})) == "w-1"
+    assert document_id(SimpleNamespace(json='{"name": "W", "id": "w-2"}')) == "w-2"
+
+
+def test_json_codec_option_sets_the_codec():
+    result = CliRunner().invoke(main, ["--json-codec", "stdlib", "redis-list-index", "--help"])
+
+    assert result.exit_code == 0
+    assert codec.CODEC.name == codec.STDLIB_CODEC
@@ -0,0 +1,126 @@
+import json
+import pstats
+
+import pytest
+from click.testing import CliRunner
+
+from cosmotech.data_update_quest.core.metrics import METRICS
+from cosmotech.data_update_quest.core.metrics import MetricsRegistry
+from cosmotech.data_update_quest.core.migration.apply_batch import apply_template_batch
+from cosmotech.data_update_quest_cli.__main__ import main
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    METRICS.reset()
+    METRICS.enabled = True
+    yield
+    METRICS.reset()
+    METRICS.enabled = False
+
+
+@pytest.fixture
+def dump(tmp_path):
+    template = tmp_path / "transform.jq"
+    template.write_text("del(.legacy)")
+    for index in ("organization", "workspace"):
+        (tmp_path / "input" / index).mkdir(parents=True)
+        for i in range(3):
+            (tmp_path / "input" / index / f"{i}.json").write_text(json.dumps({"id": str(i), "legacy": 1}))
+    (tmp_path / "input" / "workspace" / "broken.json").write_text("{")
+    return template, tmp_path / "input"
+
+
+def test_registry_counts_stages_per_index():
+    registry = MetricsRegistry()
+    registry.observe("fetch", "runner", 0.002, items=10, nbytes=500)
+    registry.observe("fetch", "runner", 0.2, items=5, nbytes=100)
+    registry.observe("write", None, 0.01, errors=1)
+
+    summary = registry.to_dict()
+
+    fetch = summary["stages"]["fetch"]["runner"]
+    assert (fetch["calls"], fetch["items"], fetch["bytes"]) == (2, 15, 600)
+    assert fetch["latency"]["max"] == 0.2
+    assert fetch["latency"]["buckets"]["0.0025"] == 1 and fetch["latency"]["buckets"]["0.25"] == 1
+    assert summary["stages"]["write"]["unknown"]["errors"] == 1
+
+
+def test_measure_records_errors():
+    registry = MetricsRegistry()
+
+    with pytest.raises(ValueError):
+        with registry.measure("decode", "runner", items=4):
+            raise ValueError("broken")
+
+    assert registry.to_dict()["stages"]["decode"]["runner"]["errors"] == 4
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry(enabled=False)
+
+    with registry.measure("decode", "runner", items=4) as sample:
+        sample.bytes = 10
+    with pytest.raises(ValueError):
+        with registry.measure("decode", "runner"):
+            raise ValueError("broken")
+
+    assert registry.to_dict()["stages"] == {}
+
+
+def test_prometheus_export():
+    registry = MetricsRegistry()
+    registry.observe("transform", "workspace", 0.003, items=2)
+
+    content = registry.to_prometheus()
+
+    assert "# TYPE csm_duq_stage_duration_seconds histogram" in content
+    assert 'csm_duq_stage_documents_total{stage="transform",index="workspace"} 2' in content
+    assert 'csm_duq_stage_duration_seconds_bucket{stage="transform",index="workspace",le="0.0025"} 0' in content
+    assert 'csm_duq_stage_duration_seconds_bucket{stage="transform",index="workspace",le="+Inf"} 1' in content
+    assert 'csm_duq_stage_duration_seconds_count{stage="transform",index="workspace"} 1' in content
+
+
+def test_apply_template_batch_collects_worker_metrics(tmp_path, dump):
+    template, input_dir = dump
+
+    apply_template_batch(template, input_dir, tmp_path / "output", workers=2, chunk_size=2)
+
+    stages = METRICS.to_dict()["stages"]
+    assert stages["fetch"]["workspace"]["items"] == 4
+    assert stages["decode"]["workspace"]["errors"] == 1
+    assert stages["transform"]["organization"]["items"] == 3
+    assert stages["write"]["workspace"]["items"] == 3
+
+
+@pytest.mark.parametrize("metrics_format", ["json", "prometheus"])
+def test_cli_writes_metrics_and_profile(tmp_path, dump, metrics_format):
+    template, input_dir = dump
+    metrics_file = tmp_path / "metrics.out"
+    profile_file = tmp_path / "profile.out"
+
+    result = CliRunner().invoke(
+        main,
+        [
+            "--metrics",
+            str(metrics_file),
+            "--metrics-format",
+            metrics_format,
+            "--profile",
+            str(profile_file),
+            "apply-template",
+            str(template),
+            str(input_dir),
+            str(tmp_path / "output"),
+            "--workers",
+            "1",
+        ],
+    )
+
+    # The broken document makes the command fail, the metrics and the profile are still written
+    assert result.exit_code == 1, result.output
+    if metrics_format == "json":
+        assert json.loads(metrics_file.read_text())["stages"]["encode"]["organization"]["items"] == 3
+    else:
+        assert 'csm_duq_stage_documents_total{stage="encode",index="organization"} 3' in metrics_file.read_text()
+    assert pstats.Stats(str(profile_file)).total_calls > 0